@@ -1,10 +1,12 @@
 import os
-import h5py
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
 from scipy.stats import ranksums, kruskal
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from jevo_analysis import load_series, generation_matrix, mean_ci95
 plt.figure(figsize=(5, 4))
 matplotlib.rcParams['pdf.fonttype'] = 42
 matplotlib.rcParams['ps.fonttype'] = 42
@@ -13,39 +15,15 @@ exp_names = {"01-gravitar-nofa-01-25-25": "No Factorization",
              "02-gravitar-lora-01-25-25": "Low-Rank Factorization",
              "03-gravitar-nofa-small-01-25-25": "No Factorization (Small)"}
 
+series = load_series(exp_names.keys(), "InteractionDist", "max", n_jobs=os.cpu_count(), cache=True)
 exp_dfs = dict()
 
 for exp in exp_names.keys():
-    data_list = []
-    subdirs = [d for d in os.listdir(exp) if os.path.isdir(os.path.join(exp, d))]
-
-    for subdir in subdirs:
-        h5_path = os.path.join(exp, subdir, "statistics.h5")
-        if not os.path.isfile(h5_path):
-            continue
-
-        with h5py.File(h5_path, "r") as f:
-            if "iter" not in f:
-                continue
-            generations = sorted(f["iter"].keys(), key=lambda x: int(x))#[0:99]
-            values = []
-            for gen in generations:
-                # if gen == "100":
-                #     break
-                vals = f[f"iter/{gen}/InteractionDist/max"][()]  # read dataset
-                values.append(vals)
-            # Store each subdir's series with numeric index
-            data_list.append(pd.Series(values, index=[int(g) for g in generations]))
-
-    if not data_list:
+    data_df = generation_matrix(series, exp)
+    if data_df.empty:
         continue
-
-    # Combine all subdirectory series into one DataFrame
-    data_df = pd.concat(data_list, axis=1)
     exp_dfs[exp] = data_df
-    mean_vals = data_df.mean(axis=1)
-    sem_vals  = data_df.sem(axis=1)
-    ci95      = 1.96 * sem_vals
+    mean_vals, ci95 = mean_ci95(data_df)
 
     x = mean_vals.index  # generation numbers
     plt.plot(x, mean_vals, label=exp_names[exp])
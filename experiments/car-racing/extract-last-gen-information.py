@@ -1,44 +1,39 @@
+import os
 import sys
-import re
 import json
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from jevo_analysis import trial_paths, pmap
+from jevo_analysis.logparse import parse_log
 
-experiment_name = sys.argv[1]
-trial_number = sys.argv[2]
+# usage: python extract-last-gen-information.py <generation> <experiment>...
+last_gen = int(sys.argv[1])
+experiments = sys.argv[2:]
 
-performer_pattern = re.compile(
-    r'^(\d{2}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) Operator Performer took ([\d.]+) seconds$'
-)
-wave_pattern = re.compile(
-    r'^(\d{2}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) gen=40 (\S+Wave): '
-    r'\|([\d.]+), ([\d.]+) ± ([\d.]+), ([\d.]+)\|, (\d+) samples$'
-)
 
-def parse_log_from_stdin():
+def last_gen_information(experiment_name, trial, path):
+    """Wave scores at `last_gen`, each paired with the Performer timing logged right before it."""
+    parsed = parse_log(path)
+    timings = parsed.timings.set_index("line")
     result = []
-    current_performer = None
-
-    for line in sys.stdin:
-        line = line.strip()
-        perf_match = performer_pattern.match(line)
-        if perf_match:
-            _, time_taken = perf_match.groups()
-            current_performer = {"time_taken": float(time_taken), "experiment_name": experiment_name, "trial_number": trial_number}
+    for m in parsed.measurements.itertuples():
+        if m.generation != last_gen or not m.metric.endswith("Wave"):
+            continue
+        if m.line - 1 not in timings.index or timings.loc[m.line - 1, "operator"] != "Performer":
             continue
+        result.append({
+            "time_taken": float(timings.loc[m.line - 1, "seconds"]),
+            "experiment_name": experiment_name,
+            "trial_number": os.path.join(experiment_name, trial),
+            "wave_name": m.metric,
+            "low": m.min,
+            "mean": m.mean,
+            "std": m.std,
+            "high": m.max,
+            "samples": int(m.n_samples),
+        })
+    return result
 
-        wave_match = wave_pattern.match(line)
-        if wave_match and current_performer is not None:
-            _, wave_name, low, mean, std, high, samples = wave_match.groups()
-            current_performer.update({
-                "wave_name": wave_name,
-                "low": float(low),
-                "mean": float(mean),
-                "std": float(std),
-                "high": float(high),
-                "samples": int(samples),
-            })
-            result.append(current_performer)
-            current_performer = None
 
-    json_result = json.dumps(result)
-    print(json_result)
-parse_log_from_stdin()
+paths = trial_paths(experiments, filename="run.log")
+for result in pmap(last_gen_information, paths, n_jobs=0):
+    print(json.dumps(result))
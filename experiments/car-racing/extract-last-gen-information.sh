@@ -1,10 +1,3 @@
 #!/bin/bash
 
-for dir in 0{1,2,3}*; do
-    for i in $dir/*; do
-        if [ -f $i/run.log ]; then
-            trial=$(basename $i)
-            grep -B 1 "gen=40" $i/run.log | python extract-last-gen-information.py $dir $i
-        fi
-    done
-done > last-gen-information.json
+python extract-last-gen-information.py 40 0{1,2,3}* > last-gen-information.json
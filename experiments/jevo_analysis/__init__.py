@@ -0,0 +1,14 @@
+"""Shared helpers for analysing Jevo experiment output (statistics.h5, run.log).
+
+Scripts under ``experiments/`` put this directory on ``sys.path`` and import
+``jevo_analysis`` instead of re-implementing the file walking themselves.
+"""
+from .h5 import (read_trial, trial_dirs, trial_paths, load_experiments, load_series,
+                 generation_matrix, mean_ci95)
+from .dist import read_dist, load_dist
+from .parallel import pmap
+from .cache import cached_call
+from .logparse import LogParser, parse_log, log_series
+from .follow import LogFollower, H5Follower, follow
+from .timing import load_timings, hotspots
+from .phylo import Phylogeny, read_phylogeny
@@ -0,0 +1,93 @@
+"""On-disk cache of parsed trial files.
+
+Every parsed trial is stored as one ``.npz`` keyed by the source path and the
+reader arguments, and stamped with the source's size and mtime. Finished runs
+are read from the cache on every later invocation; runs that are still growing
+change their stamp and get re-ingested.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.environ.get("JEVO_ANALYSIS_CACHE", ".jevo-cache")
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+
+def _key(fn, path, args):
+    ident = repr((fn.__module__, fn.__qualname__, os.path.abspath(path), args))
+    return hashlib.sha1(ident.encode()).hexdigest()
+
+
+def _typed(a):
+    """``a`` as a numeric array that loads without pickling, or ``None`` if it isn't numeric.
+
+    Empty frames (e.g. a trial without any of the requested metrics) come back
+    from pandas with object dtype, which ``np.savez`` would pickle.
+    """
+    if a.dtype != object:
+        return a
+    try:
+        return a.astype(np.float64)
+    except (TypeError, ValueError):
+        return None
+
+
+def _save(file, stamp, obj):
+    """Store ``obj``, unless its values or index would have to be pickled."""
+    is_series = isinstance(obj, pd.Series)
+    df = obj.to_frame() if is_series else obj
+    values, index = _typed(df.to_numpy()), _typed(df.index.to_numpy())
+    if values is None or index is None:
+        return False
+    tmp = file + ".tmp.npz"
+    np.savez(tmp, stamp=stamp, values=values,
+             index=index, index_name=np.array(str(df.index.name)),
+             columns=np.array([str(c) for c in df.columns], dtype=str), is_series=is_series)
+    os.replace(tmp, file)
+    return True
+
+
+def _load(file):
+    with np.load(file, allow_pickle=False) as z:
+        index_name = str(z["index_name"])
+        index = pd.Index(z["index"], name=None if index_name == "None" else index_name)
+        df = pd.DataFrame(z["values"], index=index, columns=list(z["columns"]))
+        return z["stamp"], (df.iloc[:, 0] if bool(z["is_series"]) else df)
+
+
+def cached_call(fn, path, *args, cache_dir=None):
+    """``fn(path, *args)``, memoized on disk until ``path`` changes size or mtime.
+
+    ``fn`` must return a DataFrame or Series with a flat index and numeric values.
+    Results with non-numeric values or index are returned but not cached.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    file = os.path.join(cache_dir, _key(fn, path, args) + ".npz")
+    stamp = _stamp(path)
+    if os.path.isfile(file):
+        try:
+            cached_stamp, obj = _load(file)
+            if np.array_equal(cached_stamp, stamp):
+                return obj
+        except (OSError, ValueError, KeyError):
+            pass  # unreadable cache entry, re-ingest
+    obj = fn(path, *args)
+    _save(file, stamp, obj)
+    return obj
+
+
+def clear(cache_dir=None):
+    """Remove every cached entry."""
+    cache_dir = cache_dir or CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return
+    for name in os.listdir(cache_dir):
+        if name.endswith(".npz"):
+            os.remove(os.path.join(cache_dir, name))
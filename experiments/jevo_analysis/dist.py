@@ -0,0 +1,33 @@
+"""Loading of the per-trial ``dist.csv`` files produced by ``make-dist.sh``.
+
+Each row of ``dist.csv`` is one ``StatisticalMeasurement`` scraped from
+``run.log``, so row ``i`` is generation ``i``.
+"""
+import pandas as pd
+
+from .cache import cached_call
+from .h5 import trial_paths
+from .parallel import pmap
+
+
+def read_dist(path, column=4):
+    """Positional column ``column`` of a ``dist.csv`` (the scripts use ``iloc[:, 4]``)."""
+    df = pd.read_csv(path, header=None)
+    return df.iloc[:, column]
+
+
+def load_dist(experiments, column=4, root=".", n_jobs=1, cache=False):
+    """``{experiment: generation x trial DataFrame}`` from every trial's ``dist.csv``.
+
+    Matches the frame the scripts built with ``pd.concat(data_list, axis=1)``,
+    with trial names as column labels.
+    """
+    paths = trial_paths(experiments, root, "dist.csv")
+    if cache:
+        series = pmap(cached_call, [(read_dist, path, column) for _, _, path in paths], n_jobs)
+    else:
+        series = pmap(read_dist, [(path, column) for _, _, path in paths], n_jobs)
+    exp_dfs = dict()
+    for (exp, trial, _), s in zip(paths, series):
+        exp_dfs.setdefault(exp, []).append(s.rename(trial))
+    return {exp: pd.concat(data_list, axis=1) for exp, data_list in exp_dfs.items()}
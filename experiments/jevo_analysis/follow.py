@@ -0,0 +1,148 @@
+"""Tail-follow live runs instead of re-reading whole files.
+
+``LogFollower`` remembers the byte offset it has parsed ``run.log`` up to and
+``H5Follower`` the last generation it ingested from ``statistics.h5``; each
+``poll`` only reads what was appended since. ``follow`` ties them together and
+refreshes a mean ± 95% CI plot like the ``plot-series.py`` scripts::
+
+    python -m jevo_analysis.follow --metric SecondWave --out media/live.png <exp>...
+"""
+import argparse
+import os
+import sys
+import time
+
+# The Julia side keeps statistics.h5 open for writing; don't fail on its lock.
+os.environ.setdefault("HDF5_USE_FILE_LOCKING", "FALSE")
+
+import pandas as pd
+
+from .h5 import INDEX, read_trial, trial_paths, mean_ci95
+from .logparse import LogParser
+
+
+class LogFollower:
+    """Incrementally parses a growing ``run.log``."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.partial = b""
+        self.parser = LogParser()
+        self.values = dict()  # (metric, stat) -> ({generation: value}, rows consumed)
+
+    def poll(self):
+        """Parse complete lines appended since the last poll; returns how many were read."""
+        if not os.path.isfile(self.path):
+            return 0
+        if os.path.getsize(self.path) < self.offset:  # truncated/rotated: start over
+            self.__init__(self.path)
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read()
+        if not chunk:
+            return 0
+        self.offset += len(chunk)
+        lines = (self.partial + chunk).split(b"\n")
+        self.partial = lines.pop()  # last line may still be being written
+        for line in lines:
+            self.parser.feed(line.decode("utf-8", errors="replace"))
+        return len(lines)
+
+    def series(self, metric, stat="max"):
+        """``stat`` of ``metric`` by generation, updated from the rows parsed since the last call."""
+        values, seen = self.values.get((metric, stat), (dict(), 0))
+        meas = self.parser.measurements
+        for i in range(seen, len(meas["metric"])):
+            if meas["metric"][i] == metric:
+                values[meas["generation"][i]] = meas[stat][i]
+        self.values[metric, stat] = (values, len(meas["metric"]))
+        return pd.Series(values, dtype=float).sort_index()
+
+
+class H5Follower:
+    """Incrementally reads generations appended to a ``statistics.h5``.
+
+    The newest generation may still be receiving measurements, so it is only
+    committed once a later generation shows up.
+    """
+
+    def __init__(self, path, metrics, stats=("max",)):
+        self.path = path
+        self.metrics, self.stats = metrics, stats
+        self.frame = None
+        self.last = None  # last committed generation
+
+    def poll(self):
+        """Read generations newer than the last committed one; returns how many were added."""
+        # HDF5Logger holds <path>.pid while writing; retry on the next poll
+        if not os.path.isfile(self.path) or os.path.exists(self.path + ".pid"):
+            return 0
+        try:
+            new = read_trial(self.path, self.metrics, self.stats, after=self.last)
+        except OSError:
+            return 0
+        if len(new) < 2:
+            return 0
+        new = new.iloc[:-1]
+        self.frame = new if self.frame is None else pd.concat([self.frame, new])
+        self.last = int(new.index[-1])
+        return len(new)
+
+
+def follow(experiments, metric, stat="max", source="h5", interval=60.0, out="live.png", once=False):
+    """Poll every trial of ``experiments`` and redraw ``out`` whenever data arrives."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    column = f"{metric}/{stat}"
+    followers = dict()
+    fig, ax = plt.subplots(figsize=(5, 4))
+    while True:
+        filename = "statistics.h5" if source == "h5" else "run.log"
+        for exp, trial, path in trial_paths(experiments, filename=filename):
+            if (exp, trial) not in followers:
+                followers[exp, trial] = H5Follower(path, [metric], [stat]) if source == "h5" else LogFollower(path)
+        added = sum(f.poll() for f in followers.values())
+        if added:
+            ax.clear()
+            for exp in experiments:
+                trials = {t: f for (e, t), f in followers.items() if e == exp}
+                if source == "h5":
+                    cols = {t: f.frame[column] for t, f in trials.items() if f.frame is not None}
+                else:
+                    cols = {t: f.series(metric, stat) for t, f in trials.items()}
+                cols = {t: s for t, s in cols.items() if len(s)}
+                if not cols:
+                    continue
+                matrix = pd.concat(cols, axis=1, names=INDEX[1:2]).sort_index()
+                mean_vals, ci95 = mean_ci95(matrix)
+                ax.plot(mean_vals.index, mean_vals, label=exp)
+                ax.fill_between(mean_vals.index, mean_vals - ci95, mean_vals + ci95, alpha=0.2)
+            ax.set_xlabel("Generation")
+            ax.set_ylabel(column)
+            ax.legend()
+            fig.tight_layout()
+            fig.savefig(out)
+            print(f"{time.strftime('%H:%M:%S')} +{added} records -> {out}", flush=True)
+        if once:
+            return followers
+        time.sleep(interval)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("experiments", nargs="+")
+    ap.add_argument("--metric", required=True)
+    ap.add_argument("--stat", default="max")
+    ap.add_argument("--source", choices=("h5", "log"), default="h5")
+    ap.add_argument("--interval", type=float, default=60.0, help="seconds between polls")
+    ap.add_argument("--out", default="live.png")
+    ap.add_argument("--once", action="store_true", help="poll a single time and exit")
+    args = ap.parse_args(argv)
+    follow(args.experiments, args.metric, args.stat, args.source, args.interval, args.out, args.once)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
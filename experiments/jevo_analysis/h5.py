@@ -0,0 +1,132 @@
+"""Columnar loading of the ``statistics.h5`` files written by ``JevoLogger``.
+
+The HDF5Logger in ``src/logger.jl`` stores every measurement under
+``iter/<gen>/<Metric>/<stat>`` (``StatisticalMeasurement``) or
+``iter/<gen>/<Metric>`` (``Measurement``). Instead of indexing one dataset per
+generation per trial from each plotting script, open every trial once, walk the
+``iter`` group a single time and return all generations/trials/experiments as
+one long frame indexed by ``(experiment, trial, generation)``.
+"""
+import os
+
+import h5py
+import numpy as np
+import pandas as pd
+
+from .cache import cached_call
+from .parallel import pmap
+
+STATS = ("min", "mean", "std", "max", "n_samples")
+# column name used for plain `Measurement`s, which have no stat subgroup
+VALUE = "value"
+INDEX = ["experiment", "trial", "generation"]
+
+
+def trial_dirs(exp):
+    """Sorted trial subdirectories of an experiment directory."""
+    return sorted(d for d in os.listdir(exp) if os.path.isdir(os.path.join(exp, d)))
+
+
+def _as_list(x):
+    return [x] if isinstance(x, str) else list(x)
+
+
+def read_trial(h5_path, metrics, stats=("max",), after=None):
+    """Read ``metrics`` x ``stats`` for every generation of one ``statistics.h5``.
+
+    Returns a DataFrame indexed by generation with one column per
+    ``"<metric>/<stat>"``. Generations missing a metric are NaN; generations
+    missing every requested metric are dropped. ``after`` skips generations
+    ``<= after`` without touching their datasets.
+    """
+    metrics, stats = _as_list(metrics), _as_list(stats)
+    columns = [f"{m}/{s}" for m in metrics for s in stats]
+    with h5py.File(h5_path, "r") as f:
+        if "iter" not in f:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name="generation"))
+        it = f["iter"]
+        gens = sorted(int(g) for g in it.keys())
+        if after is not None:
+            gens = [g for g in gens if g > after]
+        gens = np.array(gens, dtype=np.int64)
+        data = np.full((len(gens), len(columns)), np.nan)
+        for i, gen in enumerate(gens):
+            group = it[str(gen)]
+            for j, metric in enumerate(metrics):
+                node = group.get(metric)
+                if node is None:
+                    continue
+                if isinstance(node, h5py.Dataset):
+                    # Measurement: the metric itself is the dataset
+                    if VALUE in stats:
+                        data[i, j * len(stats) + stats.index(VALUE)] = node[()]
+                    continue
+                for k, stat in enumerate(stats):
+                    ds = node.get(stat)
+                    if ds is not None:
+                        data[i, j * len(stats) + k] = ds[()]
+    df = pd.DataFrame(data, index=pd.Index(gens, name="generation"), columns=columns)
+    return df.dropna(how="all")
+
+
+def trial_paths(experiments, root=".", filename="statistics.h5"):
+    """``(experiment, trial, path)`` for every existing trial file."""
+    paths = []
+    for exp in _as_list(experiments):
+        exp_dir = os.path.join(root, exp)
+        if not os.path.isdir(exp_dir):
+            continue
+        for trial in trial_dirs(exp_dir):
+            path = os.path.join(exp_dir, trial, filename)
+            if os.path.isfile(path):
+                paths.append((exp, trial, path))
+    return paths
+
+
+def concat_trials(frames):
+    """Stack ``{(experiment, trial): frame}`` into one long frame indexed by INDEX."""
+    frames = {k: v for k, v in frames.items() if len(v)}
+    if not frames:
+        return pd.DataFrame(index=pd.MultiIndex.from_arrays([[], [], []], names=INDEX))
+    df = pd.concat(frames, names=INDEX[:2])
+    return df.sort_index()
+
+
+def load_experiments(experiments, metrics, stats=("max",), root=".", filename="statistics.h5", n_jobs=1, cache=False):
+    """Load ``metrics`` x ``stats`` for all trials of all ``experiments``.
+
+    Returns a long DataFrame with a ``(experiment, trial, generation)`` index and
+    one column per ``"<metric>/<stat>"``. With ``n_jobs != 1`` trial files are
+    read in a process pool, see :func:`jevo_analysis.parallel.pmap`. With
+    ``cache=True`` unchanged trials are served from :mod:`jevo_analysis.cache`.
+    """
+    paths = trial_paths(experiments, root, filename)
+    metrics, stats = _as_list(metrics), _as_list(stats)
+    if cache:
+        results = pmap(cached_call, [(read_trial, path, metrics, stats) for _, _, path in paths], n_jobs)
+    else:
+        results = pmap(read_trial, [(path, metrics, stats) for _, _, path in paths], n_jobs)
+    frames = {(exp, trial): df for (exp, trial, _), df in zip(paths, results)}
+    return concat_trials(frames)
+
+
+def load_series(experiments, metric, stat="max", **kwargs):
+    """Single ``metric/stat`` column of :func:`load_experiments` as a Series."""
+    df = load_experiments(experiments, metric, stat, **kwargs)
+    column = f"{metric}/{stat}"
+    if column not in df:
+        return pd.Series(dtype=float, index=df.index, name=column)
+    return df[column]
+
+
+def generation_matrix(series, experiment):
+    """generation x trial DataFrame of one experiment, as the plot scripts use."""
+    if experiment not in series.index.get_level_values("experiment"):
+        return pd.DataFrame()
+    return series.xs(experiment, level="experiment").unstack("trial").sort_index()
+
+
+def mean_ci95(matrix):
+    """Mean and 1.96 * SEM across trials for every generation."""
+    mean = matrix.mean(axis=1)
+    return mean, 1.96 * matrix.sem(axis=1)
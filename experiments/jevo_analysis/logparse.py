@@ -0,0 +1,180 @@
+"""Single-pass parser for the ``run.log`` files written by ``JevoLogger``.
+
+One streaming read of a log extracts everything the old shell pipelines grepped
+for separately:
+
+- ``Operator X took N seconds`` timings (``operate!`` with ``time=true``)
+- every ``StatisticalMeasurement`` line,
+  ``gen=G Metric: |min, mean ± std, max|, n samples``
+- the first and last timestamps, i.e. the wall-clock span of the run
+
+A timing line has no generation of its own; it is attributed to the next
+measurement logged after it, which is how ``grep -B 1 "gen=40"`` paired
+Performer timings with wave scores.
+
+Usage::
+
+    python -m jevo_analysis.logparse [--jobs N] [--dist] [--times] <run.log>...
+
+writes a columnar ``run.npz`` next to every log (``--dist`` also writes the
+legacy ``dist.csv``, ``--times`` prints the run span of every log).
+"""
+import argparse
+import os
+import re
+import sys
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .parallel import pmap
+
+DATEFMT = "%y-%m-%d %H:%M:%S"  # `datefmt` in src/logger.jl
+TIMESTAMP = re.compile(r"^(\d{2}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) ")
+TIMING = re.compile(r"^\S+ \S+ Operator (.+) took ([-+\d.eE]+) seconds$")
+MEASUREMENT = re.compile(
+    r"^\S+ \S+ gen=(-?\d+) (.+?): \|([^,|]+), ([^,|]+) ± ([^,|]+), ([^,|]+)\|, (\d+) samples$")
+MEASUREMENT_COLUMNS = ["min", "mean", "std", "max"]
+
+ParsedLog = namedtuple("ParsedLog", ["timings", "measurements", "first", "last"])
+
+
+class LogParser:
+    """Incremental parser; ``feed`` lines in order, read the tables with ``result``."""
+
+    def __init__(self):
+        self.lineno = 0
+        self.first = None
+        self.last = None
+        self.timings = {"generation": [], "operator": [], "seconds": [], "line": []}
+        self.measurements = {"generation": [], "metric": [], **{c: [] for c in MEASUREMENT_COLUMNS},
+                             "n_samples": [], "line": []}
+        self.pending = 0  # timings still waiting for a generation
+
+    def feed(self, line):
+        line = line.rstrip("\n")
+        lineno = self.lineno
+        self.lineno += 1
+        ts = TIMESTAMP.match(line)
+        if ts is None:
+            return
+        if self.first is None:
+            self.first = ts.group(1)
+        self.last = ts.group(1)
+        if line.endswith(" seconds"):
+            m = TIMING.match(line)
+            if m is not None:
+                self.timings["generation"].append(-1)
+                self.timings["operator"].append(m.group(1))
+                self.timings["seconds"].append(float(m.group(2)))
+                self.timings["line"].append(lineno)
+                self.pending += 1
+        elif line.endswith(" samples"):
+            m = MEASUREMENT.match(line)
+            if m is not None:
+                gen = int(m.group(1))
+                meas = self.measurements
+                meas["generation"].append(gen)
+                meas["metric"].append(m.group(2))
+                for c, v in zip(MEASUREMENT_COLUMNS, m.groups()[2:6]):
+                    meas[c].append(float(v))
+                meas["n_samples"].append(int(m.group(7)))
+                meas["line"].append(lineno)
+                if self.pending:
+                    gens = self.timings["generation"]
+                    gens[len(gens) - self.pending:] = [gen] * self.pending
+                    self.pending = 0
+
+    def result(self):
+        timings = pd.DataFrame(self.timings).astype(
+            {"generation": np.int64, "seconds": np.float64, "line": np.int64})
+        measurements = pd.DataFrame(self.measurements).astype(
+            {"generation": np.int64, "n_samples": np.int64, "line": np.int64,
+             **{c: np.float64 for c in MEASUREMENT_COLUMNS}})
+        return ParsedLog(timings, measurements, self.first, self.last)
+
+
+def parse_log(path):
+    """Parse a whole ``run.log`` in one pass."""
+    parser = LogParser()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            parser.feed(line)
+    return parser.result()
+
+
+def duration(parsed):
+    """Wall-clock span between the first and last timestamped line."""
+    if parsed.first is None:
+        return None
+    return datetime.strptime(parsed.last, DATEFMT) - datetime.strptime(parsed.first, DATEFMT)
+
+
+def save_npz(path, parsed):
+    """Write a parsed log as one compact columnar ``.npz``."""
+    columns = {f"timings/{c}": parsed.timings[c].to_numpy() for c in parsed.timings}
+    columns.update({f"measurements/{c}": parsed.measurements[c].to_numpy() for c in parsed.measurements})
+    for c in ("timings/operator", "measurements/metric"):
+        columns[c] = columns[c].astype(str)
+    np.savez_compressed(path, first=np.array(parsed.first or ""), last=np.array(parsed.last or ""), **columns)
+
+
+def load_npz(path):
+    """Inverse of :func:`save_npz`."""
+    with np.load(path, allow_pickle=False) as z:
+        tables = {"timings": {}, "measurements": {}}
+        for key in z.files:
+            if "/" in key:
+                table, column = key.split("/", 1)
+                tables[table][column] = z[key]
+        first, last = str(z["first"]) or None, str(z["last"]) or None
+    return ParsedLog(pd.DataFrame(tables["timings"]), pd.DataFrame(tables["measurements"]), first, last)
+
+
+def write_dist(path, parsed):
+    """Write ``dist.csv`` in the layout of the old ``grep | tr`` pipeline.
+
+    ``tr '±' ','`` replaced both bytes of the UTF-8 ``±`` with commas, so the
+    legacy file has an empty third column and the scripts read ``max`` with
+    ``iloc[:, 4]``. The layout is kept so existing dist.csv files stay comparable.
+    """
+    m = parsed.measurements
+    with open(path, "w") as f:
+        for row in zip(m["min"], m["mean"], m["std"], m["max"]):
+            f.write("%s, %s ,, %s, %s\n" % tuple(repr(float(v)) for v in row))
+
+
+def log_series(parsed, metric, stat="max"):
+    """``stat`` of ``metric`` indexed by generation, last entry wins on repeats."""
+    m = parsed.measurements
+    m = m[m["metric"] == metric]
+    return m.groupby("generation")[stat].last()
+
+
+def _process(path, dist, times):
+    parsed = parse_log(path)
+    root = os.path.dirname(path)
+    save_npz(os.path.join(root, "run.npz"), parsed)
+    if dist:
+        write_dist(os.path.join(root, "dist.csv"), parsed)
+    return duration(parsed) if times else None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("logs", nargs="+")
+    ap.add_argument("--jobs", type=int, default=0, help="worker processes, 0 for every core")
+    ap.add_argument("--dist", action="store_true", help="also write dist.csv next to each log")
+    ap.add_argument("--times", action="store_true", help="print '<log> <duration>' for each log")
+    args = ap.parse_args(argv)
+    logs = [p for p in args.logs if os.path.isfile(p)]  # unmatched shell globs
+    spans = pmap(_process, [(p, args.dist, args.times) for p in logs], args.jobs)
+    if args.times:
+        for path, span in zip(logs, spans):
+            print(path, span)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Process-pool fan-out for per-trial ingestion.
+
+Trial files usually sit on network storage, so reading them one after another
+is latency bound. ``pmap`` spreads the per-file readers over worker processes.
+HDF5 handles are not fork-safe: the parent never holds an open file while the
+pool is forked and every worker opens its own handle inside the reader.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _apply(job):
+    fn, args = job
+    return fn(*args)
+
+
+def pmap(fn, args, n_jobs=1):
+    """``[fn(*a) for a in args]``, over ``n_jobs`` processes when ``n_jobs > 1``.
+
+    ``n_jobs <= 0`` uses every core. Results keep the order of ``args``.
+    """
+    args = [tuple(a) for a in args]
+    if n_jobs <= 0:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(args))
+    if n_jobs <= 1:
+        return [fn(*a) for a in args]
+    # fork instead of spawn so scripts without a __main__ guard are not re-run
+    ctx = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=n_jobs, mp_context=ctx) as pool:
+        return list(pool.map(_apply, [(fn, a) for a in args]))
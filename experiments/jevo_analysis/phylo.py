@@ -0,0 +1,177 @@
+"""Lineage queries on the binary phylogeny logs written by ``LogPhylogeny``.
+
+``<pop>-phylo.bin`` is a flat sequence of little-endian int64
+``(id, parent, generation)`` records, appended every generation, with parent
+``-1`` for the genesis individuals. The file is memory-mapped, and every query
+walks all requested lineages at once with NumPy instead of one node at a time::
+
+    python -m jevo_analysis.phylo p1-phylo.bin --alife p1-phylo.csv
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+RECORD = np.dtype([("id", "<i8"), ("parent", "<i8"), ("generation", "<i8")])
+
+
+def read_phylogeny(path):
+    """Memory-mapped record array of ``path``, ignoring a partially written trailing record."""
+    n = os.path.getsize(path) // RECORD.itemsize
+    if n == 0:
+        return np.zeros(0, dtype=RECORD)
+    return np.memmap(path, dtype=RECORD, mode="r", shape=(n,))
+
+
+class Phylogeny:
+    """Parent pointers of a phylogeny log as row indices, for vectorized walks.
+
+    Rows keep the file order. ``parent_row[i]`` is the row of the parent of row
+    ``i``, or ``-1`` for roots and parents missing from the log.
+    """
+
+    def __init__(self, records):
+        self.ids = np.asarray(records["id"])
+        self.parents = np.asarray(records["parent"])
+        self.generations = np.asarray(records["generation"])
+        self._order = np.argsort(self.ids, kind="stable")
+        self.parent_row = self.rows(self.parents, missing=-1)
+        self._depths = None
+
+    @classmethod
+    def read(cls, path):
+        return cls(read_phylogeny(path))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def rows(self, ids, missing=None):
+        """Row of each id in ``ids``. Unknown ids raise ``KeyError``, or map to ``missing`` if given."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(self) == 0:
+            found, rows = np.zeros(ids.shape, dtype=bool), np.zeros(ids.shape, dtype=np.int64)
+        else:
+            sorted_ids = self.ids[self._order]
+            pos = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+            found, rows = sorted_ids[pos] == ids, self._order[pos]
+        if not found.all():
+            if missing is None:
+                raise KeyError(f"ids not in phylogeny: {ids[~found][:10].tolist()}")
+            rows = np.where(found, rows, missing)
+        return rows
+
+    def depths(self):
+        """Number of ancestors of every row, by pointer jumping (``O(log depth)`` passes)."""
+        if self._depths is None:
+            jump = self.parent_row.copy()
+            depth = (jump >= 0).astype(np.int64)
+            while (jump >= 0).any():
+                valid = jump >= 0
+                target = np.where(valid, jump, 0)
+                depth = depth + np.where(valid, depth[target], 0)
+                jump = np.where(valid, jump[target], -1)
+            self._depths = depth
+        return self._depths
+
+    def depth(self, ids):
+        """Depth of each id in ``ids``; genesis individuals have depth 0."""
+        return self.depths()[self.rows(ids)]
+
+    def lineage(self, id):
+        """Ids from ``id`` back to its root."""
+        row, path = self.rows([id])[0], []
+        while row >= 0:
+            path.append(int(self.ids[row]))
+            row = self.parent_row[row]
+        return path
+
+    def final_ids(self):
+        """Ids of the individuals of the last logged generation."""
+        return self.ids[self.generations == self.generations.max()] if len(self) else self.ids
+
+    def mrca(self, ids=None):
+        """Most recent common ancestor of ``ids`` (default the final generation), or ``None`` if their lineages never meet."""
+        rows = np.unique(self.rows(self.final_ids() if ids is None else ids))
+        depth = self.depths()
+        # lift every lineage to the shallowest depth, then step them together
+        target = depth[rows].min()
+        while (depth[rows] > target).any():
+            rows = np.unique(np.where(depth[rows] > target, self.parent_row[rows], rows))
+        while len(rows) > 1:
+            rows = np.unique(self.parent_row[rows])
+            if (rows < 0).any():
+                return None
+        return int(self.ids[rows[0]])
+
+    def coalescence(self, ids=None):
+        """Number of distinct ancestors of ``ids`` (default the final generation) alive at each generation.
+
+        The ancestor of a lineage at generation ``g`` is its most recent member
+        born at or before ``g``. Reading from the final generation back, the
+        series drops to 1 at the MRCA's generation.
+        """
+        rows = np.unique(self.rows(self.final_ids() if ids is None else ids))
+        gens = self.generations
+        first, last = gens.min(), gens[rows].max()
+        counts = np.zeros(last - first + 1, dtype=np.int64)
+        for g in range(last, first - 1, -1):
+            while True:
+                newer = (gens[rows] > g) & (self.parent_row[rows] >= 0)
+                if not newer.any():
+                    break
+                rows = np.unique(np.where(newer, self.parent_row[rows], rows))
+            counts[g - first] = len(rows)
+        return pd.Series(counts, index=pd.RangeIndex(first, last + 1, name="generation"),
+                         name="lineages")
+
+    def surviving_lineages(self, ids=None):
+        """Number of genesis lineages that have descendants among ``ids`` (default the final generation)."""
+        rows = np.unique(self.rows(self.final_ids() if ids is None else ids))
+        parent = self.parent_row
+        while (parent[rows] >= 0).any():
+            rows = np.unique(np.where(parent[rows] >= 0, parent[rows], rows))
+        return len(rows)
+
+    def to_alife(self):
+        """ALIFE Data Standard frame with ``id``, ``ancestor_list`` and ``origin_time`` columns."""
+        ancestors = np.where(self.parents < 0, "[none]",
+                             np.char.add(np.char.add("[", self.parents.astype(str)), "]"))
+        return pd.DataFrame({"id": self.ids, "ancestor_list": ancestors,
+                             "origin_time": self.generations})
+
+    def to_alife_csv(self, path):
+        self.to_alife().to_csv(path, index=False)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("log", help="<pop>-phylo.bin written by LogPhylogeny")
+    ap.add_argument("--alife", help="also write the phylogeny as an ALIFE standard CSV")
+    ap.add_argument("--coalescence", help="write lineages per generation of the final population to this CSV")
+    args = ap.parse_args(argv)
+
+    phylo = Phylogeny.read(args.log)
+    if len(phylo) == 0:
+        print(f"{args.log} has no records")
+        return 1
+    final = phylo.final_ids()
+    mrca = phylo.mrca(final)
+    print(f"individuals: {len(phylo)}")
+    print(f"generations: {phylo.generations.min()}-{phylo.generations.max()}")
+    print(f"final population: {len(final)}, mean depth {phylo.depth(final).mean():.1f}")
+    print(f"surviving lineages: {phylo.surviving_lineages(final)}")
+    if mrca is None:
+        print("MRCA: none")
+    else:
+        print(f"MRCA: {mrca} (generation {phylo.generations[phylo.rows([mrca])[0]]})")
+    if args.coalescence:
+        phylo.coalescence(final).to_csv(args.coalescence)
+    if args.alife:
+        phylo.to_alife_csv(args.alife)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
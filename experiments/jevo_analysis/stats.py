@@ -0,0 +1,115 @@
+"""Vectorized significance testing over every generation at once.
+
+The p-value scripts used to pick one generation and call ``scipy.stats``
+once per comparison. Here every test takes generation x trial matrices (as
+returned by :func:`jevo_analysis.generation_matrix`) and evaluates all
+generations in one numpy pass. Missing trials are NaN and are ignored per
+generation. Results match ``scipy.stats.ranksums`` / ``scipy.stats.kruskal``
+on the non-NaN values of each row.
+"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+from scipy.stats import chi2
+
+
+def align(matrices):
+    """Reindex ``{name: generation x trial DataFrame}`` to the generations all share."""
+    gens = None
+    for m in matrices.values():
+        gens = m.index if gens is None else gens.intersection(m.index)
+    gens = gens.sort_values()
+    return gens, {k: m.loc[gens].to_numpy(dtype=float) for k, m in matrices.items()}
+
+
+def _ranks(values):
+    """Row-wise average ranks (ties averaged, NaN stays NaN)."""
+    return pd.DataFrame(values).rank(axis=1).to_numpy()
+
+
+def _tie_term(values):
+    """Row-wise sum of t^3 - t over tie groups of size t."""
+    eq = values[:, :, None] == values[:, None, :]  # NaN never equals anything
+    t = eq.sum(axis=2).astype(float)
+    # every member of a tie group contributes (t^2 - 1), t of them make t^3 - t
+    return np.where(np.isnan(values), 0.0, t ** 2 - 1).sum(axis=1)
+
+
+def ranksums(a, b):
+    """Wilcoxon rank-sum z statistic and two-sided p-value for every row."""
+    na = np.sum(~np.isnan(a), axis=1)
+    nb = np.sum(~np.isnan(b), axis=1)
+    ranks = _ranks(np.hstack([a, b]))
+    s = np.nansum(ranks[:, :a.shape[1]], axis=1)
+    expected = na * (na + nb + 1) / 2.0
+    z = (s - expected) / np.sqrt(na * nb * (na + nb + 1) / 12.0)
+    return z, 2 * ndtr(-np.abs(z))
+
+
+def kruskal(*groups):
+    """Kruskal-Wallis H statistic (tie corrected) and p-value for every row."""
+    values = np.hstack(groups)
+    ranks = _ranks(values)
+    n = np.sum(~np.isnan(values), axis=1).astype(float)
+    h = np.zeros(values.shape[0])
+    start = 0
+    for g in groups:
+        r = ranks[:, start:start + g.shape[1]]
+        ni = np.sum(~np.isnan(g), axis=1)
+        h += np.nansum(r, axis=1) ** 2 / ni
+        start += g.shape[1]
+    h = 12.0 / (n * (n + 1)) * h - 3 * (n + 1)
+    h /= 1 - _tie_term(values) / (n ** 3 - n)
+    return h, chi2.sf(h, len(groups) - 1)
+
+
+def glass_delta(control, treatment):
+    """(mean(treatment) - mean(control)) / std(control) for every row, std with ddof=0."""
+    return (np.nanmean(treatment, axis=1) - np.nanmean(control, axis=1)) / np.nanstd(control, axis=1)
+
+
+def bootstrap_ci(values, n_boot=1000, ci=0.95, rng=None):
+    """Percentile bootstrap CI of the mean across trials for every row.
+
+    The same trial resamples are used for every generation, so all rows are
+    drawn in a single ``(rows, n_boot, trials)`` gather.
+    """
+    rng = np.random.default_rng(rng)
+    idx = rng.integers(0, values.shape[1], size=(n_boot, values.shape[1]))
+    means = np.nanmean(values[:, idx], axis=2)
+    alpha = (1 - ci) / 2
+    lo, hi = np.nanquantile(means, [alpha, 1 - alpha], axis=1)
+    return lo, hi
+
+
+def significance_table(matrices, pairs=None, n_boot=1000, ci=0.95, rng=None):
+    """Per-generation table of every statistic the p-value scripts print.
+
+    Columns: ``mean``/``ci_lo``/``ci_hi`` per experiment, ``kruskal_p`` over all
+    experiments, and ``p`` plus ``glass_delta`` under ``"<treatment> vs <control>"``
+    for each ``(control, treatment)`` in ``pairs`` (default: every pair in order).
+    """
+    gens, values = align(matrices)
+    names = list(values)
+    table = {}
+    for name in names:
+        table[name, "mean"] = np.nanmean(values[name], axis=1)
+        table[name, "ci_lo"], table[name, "ci_hi"] = bootstrap_ci(values[name], n_boot, ci, rng)
+    if len(names) > 1:
+        table["all", "kruskal_p"] = kruskal(*values.values())[1]
+    for control, treatment in pairs or combinations(names, 2):
+        key = f"{treatment} vs {control}"
+        table[key, "p"] = ranksums(values[control], values[treatment])[1]
+        table[key, "glass_delta"] = glass_delta(values[control], values[treatment])
+    return pd.DataFrame(table, index=gens)
+
+
+def plot_significance(ax, table, pair, alpha=0.05, color="grey", shade=0.15):
+    """Shade the generations where ``pair`` (a ``"<treatment> vs <control>"`` key) has p < alpha."""
+    significant = table[pair, "p"] < alpha
+    lo, hi = ax.get_ylim()
+    ax.fill_between(table.index, lo, hi, where=significant.to_numpy(), step="mid",
+                    color=color, alpha=shade, linewidth=0)
+    ax.set_ylim(lo, hi)
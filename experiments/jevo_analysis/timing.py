@@ -0,0 +1,119 @@
+"""Per-operator wall-clock report from ``iter/<gen>/OperatorTime``.
+
+``operate!`` writes a ``TimingMeasurement`` every generation with one dataset
+per operator, named ``<index>-<operator type>``. This module loads them for all
+trials and produces a stacked time-per-generation chart and a hotspot table::
+
+    python -m jevo_analysis.timing --out media/timing <exp>...
+"""
+import argparse
+import sys
+
+import h5py
+import numpy as np
+import pandas as pd
+
+from .cache import cached_call
+from .h5 import concat_trials, trial_paths
+from .parallel import pmap
+
+GROUP = "OperatorTime"
+
+
+def read_timings(h5_path):
+    """generation x ``<index>-<operator>`` DataFrame of seconds for one trial."""
+    rows = dict()
+    with h5py.File(h5_path, "r") as f:
+        if "iter" not in f:
+            return pd.DataFrame(index=pd.Index([], name="generation"))
+        for gen, group in f["iter"].items():
+            timing = group.get(GROUP)
+            if timing is None:
+                continue
+            rows[int(gen)] = {op: float(ds[()]) for op, ds in timing.items()}
+    df = pd.DataFrame.from_dict(rows, orient="index").sort_index()
+    df.index.name = "generation"
+    return df[sorted(df.columns)]
+
+
+def load_timings(experiments, root=".", n_jobs=1, cache=False):
+    """Long frame indexed by ``(experiment, trial, generation)``, one column per operator slot."""
+    paths = trial_paths(experiments, root)
+    if cache:
+        results = pmap(cached_call, [(read_timings, path) for _, _, path in paths], n_jobs)
+    else:
+        results = pmap(read_timings, [(path,) for _, _, path in paths], n_jobs)
+    return concat_trials({(exp, trial): df for (exp, trial, _), df in zip(paths, results)})
+
+
+def operator_name(slot):
+    """``"007-Performer"`` -> ``"Performer"``."""
+    return slot.split("-", 1)[1]
+
+
+def by_operator(timings):
+    """Sum slots of the same operator type (e.g. several Performers per generation)."""
+    return timings.T.groupby(operator_name).sum(min_count=1).T
+
+
+def hotspots(timings):
+    """Per experiment and operator type: mean seconds per generation, total hours and share of runtime."""
+    per_gen = by_operator(timings)
+    rows = []
+    for exp, df in per_gen.groupby(level="experiment"):
+        total = df.sum().sum()
+        for op in df.columns:
+            rows.append({"experiment": exp, "operator": op,
+                         "mean_s_per_gen": df[op].mean(),
+                         "max_s_per_gen": df[op].max(),
+                         "total_h": df[op].sum() / 3600,
+                         "share": df[op].sum() / total if total else np.nan})
+    table = pd.DataFrame(rows)
+    return table.sort_values(["experiment", "share"], ascending=[True, False]).reset_index(drop=True)
+
+
+def plot_stacked(ax, timings, experiment, top=6):
+    """Stacked mean seconds per generation for ``experiment``; the smallest operators are lumped together."""
+    per_gen = by_operator(timings.xs(experiment, level="experiment"))
+    mean = per_gen.groupby(level="generation").mean().fillna(0)
+    order = mean.sum().sort_values(ascending=False).index
+    if len(order) > top:
+        mean = pd.concat([mean[order[:top]], mean[order[top:]].sum(axis=1).rename("other")], axis=1)
+    else:
+        mean = mean[order]
+    ax.stackplot(mean.index, mean.T.to_numpy(), labels=mean.columns)
+    ax.set_xlabel("Generation")
+    ax.set_ylabel("Seconds")
+    ax.set_title(experiment)
+    ax.legend(fontsize="small", loc="upper left")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("experiments", nargs="+")
+    ap.add_argument("--out", default="timing", help="prefix of the written .png/.csv")
+    ap.add_argument("--top", type=int, default=6, help="operators drawn individually")
+    args = ap.parse_args(argv)
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    timings = load_timings(args.experiments, n_jobs=0, cache=True)
+    if timings.empty:
+        print("no OperatorTime records found")
+        return 1
+    table = hotspots(timings)
+    print(table.to_string(index=False))
+    table.to_csv(args.out + "-hotspots.csv", index=False)
+    experiments = [e for e in args.experiments if e in timings.index.get_level_values("experiment")]
+    fig, axes = plt.subplots(len(experiments), 1, figsize=(6, 3 * len(experiments)), squeeze=False)
+    for ax, exp in zip(axes[:, 0], experiments):
+        plot_stacked(ax, timings, exp, args.top)
+    fig.tight_layout()
+    fig.savefig(args.out + ".png")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
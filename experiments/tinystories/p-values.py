@@ -1,53 +1,42 @@
 import os
-import h5py
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
-from scipy.stats import ranksums, kruskal
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from jevo_analysis import load_dist
+from jevo_analysis.stats import significance_table, plot_significance
 plt.figure(figsize=(5, 4))
 matplotlib.rcParams['pdf.fonttype'] = 42
 matplotlib.rcParams['ps.fonttype'] = 42
 
 exp_names = {"01-relu-nofa-01-06-25": "No Factorization", "02-relu-lora-01-06-25": "Low-Rank Factorization", "03-relu-nofa-small-01-06-25": "No Factorization (Small)"}
 
-exp_dfs = dict()
-
-for exp in exp_names.keys():
-    data_list = []
-    subdirs = [d for d in os.listdir(exp) if os.path.isdir(os.path.join(exp, d))]
-
-    for subdir in subdirs:
-        csv_path = os.path.join(exp, subdir, "dist.csv")
-        if not os.path.exists(csv_path):
-            continue
-        print(f"Reading {csv_path}")
-        df = pd.read_csv(csv_path, header=None)
-        data_list.append(df.iloc[:, 4])  # 5th column
-
-    if not data_list:
-        continue
-
-    # Combine all subdirectory series into one DataFrame
-    data_df = pd.concat(data_list, axis=1)
-    exp_dfs[exp] = data_df
+exp_dfs = load_dist(exp_names.keys(), n_jobs=os.cpu_count(), cache=True)
 
 print(exp_dfs)
-nofa = exp_dfs["01-relu-nofa-01-06-25"]
-fa = exp_dfs["02-relu-lora-01-06-25"]
-nofa_small = exp_dfs["03-relu-nofa-small-01-06-25"]
-nofa_299 = nofa.loc[299].dropna().values
-fa_299 = fa.loc[299].values
-nofa_small_299 = nofa_small.loc[299].dropna().values
+nofa, fa, nofa_small = exp_names.values()
+table = significance_table({exp_names[e]: exp_dfs[e] for e in exp_names},
+                           pairs=[(nofa, fa), (nofa, nofa_small), (nofa_small, fa)])
+os.makedirs("media", exist_ok=True)
+table.to_csv("media/tfr-significance.csv")
+
+row = table.loc[299]
 print("Computing p value between all three methods at generation 299")
-stat, p = kruskal(nofa_299, fa_299, nofa_small_299)
-print(f"Kruskal-Wallis p={p:.4f}")
-stat, p = ranksums(nofa_299, fa_299)
-glass_delta = (np.mean(fa_299) - np.mean(nofa_299)) / np.std(nofa_299)
-print(f"Factorized vs No Factorization p={p:.4f}, Glass's delta={glass_delta:.4f}")
-stat, p = ranksums(nofa_299, nofa_small_299)
-print(f"No Factorization vs No Factorization (Small) p={p:.4f}")
-stat, p = ranksums(fa_299, nofa_small_299)
-glass_delta = (np.mean(fa_299) - np.mean(nofa_small_299)) / np.std(nofa_small_299)
-print(f"Factorized vs No Factorization (Small) p={p:.4f}", f"Glass's delta={glass_delta:.4f}")
-#
+print(f"Kruskal-Wallis p={row['all', 'kruskal_p']:.4f}")
+print(f"Factorized vs No Factorization p={row[f'{fa} vs {nofa}', 'p']:.4f}, Glass's delta={row[f'{fa} vs {nofa}', 'glass_delta']:.4f}")
+print(f"No Factorization vs No Factorization (Small) p={row[f'{nofa_small} vs {nofa}', 'p']:.4f}")
+print(f"Factorized vs No Factorization (Small) p={row[f'{fa} vs {nofa_small}', 'p']:.4f}", f"Glass's delta={row[f'{fa} vs {nofa_small}', 'glass_delta']:.4f}")
+
+for name in exp_names.values():
+    plt.plot(table.index, table[name, "mean"], label=name)
+    plt.fill_between(table.index, table[name, "ci_lo"], table[name, "ci_hi"], alpha=0.2)
+plot_significance(plt.gca(), table, f"{fa} vs {nofa}")
+plt.xlabel("Generation")
+plt.ylabel("Negative Cross-Entropy Loss")
+plt.title("Factorized vs No Factorization\n(shaded: p < 0.05)")
+plt.legend()
+plt.tight_layout()
+plt.savefig("media/tfr-significance.png")
+plt.savefig("media/tfr-significance.pdf")
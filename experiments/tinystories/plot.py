@@ -1,8 +1,11 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from jevo_analysis import load_dist
 matplotlib.rcParams['pdf.fonttype'] = 42
 matplotlib.rcParams['ps.fonttype'] = 42
 
@@ -14,17 +17,10 @@ exp_names = {"01-relu-nofa-01-06-25": "No Factorization",
              "07-relu-rank1-lora-03-21-25": "Low-Rank Factorization (Smaller Rank)"
              }
 
-for exp in exp_names.keys():
-    data_list = []
-    # Collect all subdirectories
-    subdirs = [d for d in os.listdir(exp) if os.path.isdir(os.path.join(exp, d))]
-    for subdir in subdirs:
-        print(exp, subdir)
-        csv_path = os.path.join(exp, subdir, "dist.csv")
-        df = pd.read_csv(csv_path, header=None)
-        data_list.append(df.iloc[:, 4])  # 5th column
+exp_dfs = load_dist(exp_names.keys(), n_jobs=os.cpu_count(), cache=True)
 
-    data = pd.concat(data_list, axis=1)
+for exp in exp_names.keys():
+    data = exp_dfs[exp]
     mean_vals = data.mean(axis=1)
     sem_vals = data.sem(axis=1)  # standard error of the mean
     ci95 = 1.96 * sem_vals  # ~95% CI
@@ -0,0 +1,37 @@
+# Develop time, memory and forward throughput of rank-1 "lora" networks with
+# FactorWeights materialized (A*B) versus applied factor by factor.
+#
+#   julia --project=. extra/benchmarks/lowrank.jl
+#
+# The network is the car-racing 02-lora architecture.
+using Jevo, Flux, StableRNGs
+
+n_stack, batch, n_forward = 4, 32, 100
+rng = StableRNG(1)
+gene_counter = Counter(AbstractGene)
+net = JevoChain(rng, gene_counter, [
+    (Jevo.Conv, (kernel=(4,4), channels=3*n_stack=>32, stride=(2,2), σ=relu, rank=1)),
+    (Jevo.Conv, (kernel=(4,4), channels=32=>64, stride=(2,2), σ=relu, rank=1)),
+    (Jevo.Conv, (kernel=(4,4), channels=64=>128, stride=(2,2), σ=relu, rank=1)),
+    (Jevo.Conv, (kernel=(4,4), channels=128=>256, stride=(2,2), σ=relu, rank=1)),
+    Flux.flatten,
+    (Jevo.Dense, (dims=(1024,256),σ=relu, rank=1)),
+    (Jevo.Dense, (dims=(256,3),σ=identity))
+])
+creator = Creator(Flux.Chain)
+x = rand(Float32, 64, 64, 3n_stack, batch)
+
+outputs = Dict()
+for mode in (:never, :always)
+    Jevo.factorized_layers = mode
+    model = develop(creator, net); model(x)  # compile
+    develop_bytes = @allocated develop(creator, net)
+    develop_s = @elapsed for _ in 1:10 develop(creator, net) end
+    forward_s = @elapsed for _ in 1:n_forward model(x) end
+    outputs[mode] = model(x)
+    println(rpad(mode == :never ? "materialized" : "factorized", 13),
+            " develop: $(round(develop_s / 10 * 1000, digits=2)) ms, $(develop_bytes) bytes",
+            " | params: $(Base.summarysize(model)) bytes",
+            " | forward: $(round(n_forward * batch / forward_s, digits=1)) samples/s")
+end
+println("max abs difference: ", maximum(abs.(outputs[:never] .- outputs[:always])))
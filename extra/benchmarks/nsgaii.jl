@@ -0,0 +1,71 @@
+# Time and allocations of NSGA-II selection with the bitset dominance matrix
+# versus the previous pairwise implementation, on outcome matrices of the size
+# ComputeOutcomeMatrix produces (one column per opponent/test).
+#
+#   julia --project=. extra/benchmarks/nsgaii.jl
+using Jevo, StableRNGs
+
+# The pairwise implementation nsga2 replaced, kept for comparison
+function nsga2_pairwise(outcomes::Matrix{Float64}, p::Int)
+    N, n_obj = size(outcomes)
+    S = [Int[] for _ in 1:N]
+    n = zeros(Int, N)
+    rank = zeros(Int, N)
+    fronts = [Int[]]
+    for i in 1:N
+        equal = Int[]
+        for j in 1:N
+            i == j && continue
+            if Jevo.dominates(outcomes[i, :], outcomes[j, :])
+                push!(S[i], j)
+            elseif Jevo.dominates(outcomes[j, :], outcomes[i, :])
+                n[i] += 1
+            elseif outcomes[i, :] == outcomes[j, :]
+                push!(equal, j)
+            end
+        end
+        if n[i] == 0 && (isempty(equal) || i < minimum(equal))
+            rank[i] = 1
+            push!(fronts[1], i)
+        end
+    end
+    current = 1
+    while true
+        Q = Int[]
+        for i in fronts[current], j in S[i]
+            n[j] -= 1
+            n[j] == 0 && (rank[j] = current + 1; push!(Q, j))
+        end
+        isempty(Q) && break
+        push!(fronts, Q)
+        current += 1
+    end
+    distances = zeros(Float64, N)
+    for front in fronts, m in 1:n_obj
+        l = length(front)
+        sorted_front = sort(front, by = i -> outcomes[i, m], rev = true)
+        distances[sorted_front[1]] = distances[sorted_front[end]] = Inf
+        range = outcomes[sorted_front[1], m] - outcomes[sorted_front[end], m]
+        range == 0 && continue
+        for k in 2:(l-1)
+            distances[sorted_front[k]] += (outcomes[sorted_front[k-1], m] - outcomes[sorted_front[k+1], m]) / range
+        end
+    end
+    sort(1:N, by = i -> (rank[i], -distances[i]))[1:p]
+end
+
+rng = StableRNG(1)
+for (N, M, kind) in [(200, 2, :continuous), (200, 200, :binary), (500, 500, :binary), (500, 500, :continuous), (1000, 50, :continuous)]
+    outcomes = kind == :binary ? Float64.(rand(rng, Bool, N, M)) : rand(rng, N, M)
+    p = N ÷ 2
+    @assert Jevo.nsga2(outcomes, p) == nsga2_pairwise(outcomes, p) "selections differ for $N×$M $kind"
+    Jevo.nsga2(outcomes, p); nsga2_pairwise(outcomes, p)  # compile
+    t_new = @elapsed Jevo.nsga2(outcomes, p)
+    t_old = @elapsed nsga2_pairwise(outcomes, p)
+    b_new = @allocated Jevo.nsga2(outcomes, p)
+    b_old = @allocated nsga2_pairwise(outcomes, p)
+    println(rpad("$N×$M $kind", 22),
+            " bitset: $(round(t_new * 1000, digits=2)) ms, $(b_new) bytes",
+            " | pairwise: $(round(t_old * 1000, digits=2)) ms, $(b_old) bytes",
+            " | speedup: $(round(t_old / t_new, digits=1))x")
+end
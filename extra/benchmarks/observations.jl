@@ -0,0 +1,31 @@
+# Bytes allocated per step turning a stacked gymnasium observation into a model input.
+#
+#   julia --project=. extra/benchmarks/observations.jl
+#
+# `copied` is the conversion AtariEnv/CarRacingV3 used to do on every step; `observe!`
+# writes into the persistent buffer they now keep. Both start from a plain Julia array
+# with the (n_stack, H, W, C) layout `PyArray` exposes, so the PyArray |> Array copy
+# the old path also made is not even counted here.
+using Jevo
+
+function copied(obs, n_stack, side)
+    obs = obs |> deepcopy
+    frames = [obs[i, :, :, :] for i in 1:n_stack]
+    obs = cat(frames..., dims=3)
+    obs = obs ./ 255f0
+    reshape(obs, side, side, 3*n_stack, 1)
+end
+
+for (name, side) in (("CarRacingV3", 64), ("AtariEnv", 84))
+    n_stack = 4
+    obs = rand(UInt8, n_stack, side, side, 3)
+    input = Jevo.observation_buffer(n_stack, side, side)
+    @assert copied(obs, n_stack, side) == Jevo.observe!(input, obs)
+    copied(obs, n_stack, side); Jevo.observe!(input, obs)  # compile
+    before = @allocated copied(obs, n_stack, side)
+    after = @allocated Jevo.observe!(input, obs)
+    t_before = @elapsed for _ in 1:1000 copied(obs, n_stack, side) end
+    t_after = @elapsed for _ in 1:1000 Jevo.observe!(input, obs) end
+    println(rpad(name, 12), " copied: $(before) bytes/step, $(round(t_before, digits=3)) ms/step",
+            " | observe!: $(after) bytes/step, $(round(t_after, digits=3)) ms/step")
+end
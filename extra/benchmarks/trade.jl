@@ -0,0 +1,69 @@
+# Steps per second of the TradeGridWorld (tradev2) step engine.
+#
+#   julia --project=. extra/benchmarks/trade.jl
+#
+# `legacy obs` is how observations used to be made: the whole map was rendered once
+# more per player and per perspective, inside the per-player loop, and each view cropped
+# from a fresh array. `step!` now renders the map once per step into reused buffers.
+# Policies are random linear maps, so the numbers are the environment's own cost.
+using Jevo
+using Jevo: TradeGridWorld, make_observations, render, done, AbstractPhenotype
+
+struct LinearPolicy <: AbstractPhenotype
+    w::Matrix{Float32}
+end
+LinearPolicy(view_radius::Int) = LinearPolicy(0.01f0 * randn(Float32, 4, 3 * (2view_radius + 1)^2))
+(p::LinearPolicy)(x) = p.w * reshape(x, :, size(x, 4))
+
+function legacy_observations(env::TradeGridWorld)
+    r, v = env.view_radius, 2env.view_radius + 1
+    observations = []
+    for _ in 1:env.p  # observations were remade before every player's action
+        render(env)
+        observations = map(enumerate(env.players)) do (j, player)
+            player_view = render(env, j)
+            obs = fill(0.2f0, v, v, 3)
+            px, py = round.(Int, player.position)
+            xs, ys = max(1, px - r):min(env.n, px + r), max(1, py - r):min(env.n, py + r)
+            obs[xs .- (px - r - 1), ys .- (py - r - 1), :] .= view(player_view, xs, ys, :)
+            reshape(obs, v, v, 3, 1)
+        end
+    end
+    observations
+end
+
+function run_episode(env_args, phenotypes)
+    env = TradeGridWorld(env_args...)
+    ids = collect(1:env.p)
+    while !done(env)
+        step!(env, ids, phenotypes)
+    end
+    env.max_steps
+end
+
+# n, p, max_steps, view_radius, reset_interval, pool_radius
+for env_args in ((100, 2, 100, 30, 25, 5), (50, 2, 100, 15, 25, 5), (20, 2, 100, 30, 25, 3))
+    view_radius = env_args[4]
+    env = TradeGridWorld(env_args...)
+    for _ in 1:10  # spread the players and some food around
+        step!(env, [1, 2], [LinearPolicy(view_radius) for _ in 1:2])
+    end
+    @assert legacy_observations(env) == make_observations(env, [1, 2], [LinearPolicy(view_radius)])
+
+    legacy_obs = @elapsed for _ in 1:100 legacy_observations(env) end
+    obs = @elapsed for _ in 1:100 make_observations(env, [1, 2], [LinearPolicy(view_radius)]) end
+    obs_bytes = @allocated make_observations(env, [1, 2], [LinearPolicy(view_radius)])
+
+    shared = LinearPolicy(view_radius)
+    for (name, phenotypes) in (("separate", [LinearPolicy(view_radius) for _ in 1:2]), ("self-play", [shared, shared]))
+        run_episode(env_args, phenotypes)  # compile
+        n_steps = 0
+        t = @elapsed for _ in 1:20
+            n_steps += run_episode(env_args, phenotypes)
+        end
+        println(rpad("$env_args $name", 36), " $(round(Int, n_steps / t)) steps/s")
+    end
+    println(rpad("$env_args observations", 36),
+            " legacy: $(round(10 * legacy_obs, digits=3)) ms/step",
+            " | make_observations: $(round(10 * obs, digits=3)) ms/step, $obs_bytes bytes/step")
+end
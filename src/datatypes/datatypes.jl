@@ -4,3 +4,4 @@ include("./interaction.jl")
 include("./record.jl")
 include("./measurements.jl")
 include("./timestamp.jl")
+include("./phylogeneticindex.jl")
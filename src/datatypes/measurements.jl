@@ -1,4 +1,4 @@
-export Measurement, StatisticalMeasurement, measure
+export Measurement, StatisticalMeasurement, TimingMeasurement, measure
 struct Measurement <: AbstractMeasurement
     metric::Union{String,Type{<:AbstractMetric}}
     value::Any
@@ -14,6 +14,17 @@ struct StatisticalMeasurement <: AbstractMeasurement
     generation::Int
 end
 
+"""
+    TimingMeasurement(operators::Vector{String}, seconds::Vector{Float64}, generation::Int)
+
+Wall-clock seconds spent in each operator of `state.operators` during one generation. Written to `iter/<gen>/OperatorTime/<index>-<operator>`, the index disambiguates operators of the same type.
+"""
+struct TimingMeasurement <: AbstractMeasurement
+    operators::Vector{String}
+    seconds::Vector{Float64}
+    generation::Int
+end
+
 function StatisticalMeasurement(type::Union{String, Type{<:AbstractMetric}}, data::Vector{<:Real}, generation::Int)
     StatisticalMeasurement(type, minimum(data), mean(data), std(data), maximum(data), length(data), generation)
 end
@@ -23,6 +34,8 @@ measure(metric::AbstractMetric, ::AbstractState) = @error "No measure function d
 Base.show(io::IO, m::Measurement; digits::Int=3) = print(io, "gen=$(m.generation) $(m.metric)=$(round(m.value, digits=digits))")
 Base.show(io::IO, m::StatisticalMeasurement; digits::Int=3) = print(io, 
     "gen=$(m.generation) $(m.metric): |$(round(m.min, digits=digits)), $(round(m.mean, digits=digits)) ± $(round(m.std, digits=digits)), $(round(m.max, digits=digits))|, $(m.n_samples) samples")
+Base.show(io::IO, m::TimingMeasurement; digits::Int=3) = print(io,
+    "gen=$(m.generation) OperatorTime: ", join(("$op=$(round(s, digits=digits))" for (op, s) in zip(m.operators, m.seconds)), ", "))
 
 
 HEAD="iter"
@@ -35,4 +48,9 @@ function write(f, m::StatisticalMeasurement)
     f[joinpath(head, "max")] = m.max
     f[joinpath(head, "n_samples")] = m.n_samples
 end
-
+function write(f, m::TimingMeasurement)
+    head = joinpath(HEAD, "$(m.generation)/OperatorTime")
+    for (i, (op, s)) in enumerate(zip(m.operators, m.seconds))
+        f[joinpath(head, "$(lpad(i, 3, '0'))-$op")] = s
+    end
+end
@@ -0,0 +1,56 @@
+export PhylogeneticIndex
+
+"""
+    PhylogeneticIndex(tree::PhylogeneticTree)
+
+Parent and depth of each node of a phylogenetic tree, so the estimator can walk up lineages without traversing the tree's node objects, see [`tree_distance`](@ref). `parent[id]` is `-1` for genesis individuals.
+
+Created by [InitializePhylogeny](@ref) and kept in sync by [UpdatePhylogeny](@ref) and [PurgePhylogeny](@ref).
+"""
+struct PhylogeneticIndex <: AbstractData
+    depth::Dict{Int, Int}
+    parent::Dict{Int, Int}
+end
+
+function PhylogeneticIndex(tree::PhylogeneticTree)
+    index = PhylogeneticIndex(Dict{Int, Int}(), Dict{Int, Int}())
+    queue = [node for node in values(tree.tree) if isnothing(node.parent)]
+    i = 1
+    while i <= length(queue)
+        node = queue[i]
+        isnothing(node.parent) ? add_root!(index, node.id) : add_node!(index, node.parent.id, node.id)
+        append!(queue, node.children)
+        i += 1
+    end
+    index
+end
+
+function add_root!(index::PhylogeneticIndex, id::Int)
+    index.depth[id] = 0
+    index.parent[id] = -1
+end
+
+function add_node!(index::PhylogeneticIndex, pid::Int, id::Int)
+    index.depth[id] = index.depth[pid] + 1
+    index.parent[id] = pid
+end
+
+"""
+    tree_distance(index::PhylogeneticIndex, a::Int, b::Int)
+
+Number of edges between `a` and `b`, or `typemax(Int)` if they descend from different genesis individuals. Walks both lineages up to their lowest common ancestor.
+"""
+function tree_distance(index::PhylogeneticIndex, a::Int, b::Int)
+    da, db = index.depth[a], index.depth[b]
+    dist = 0
+    while a != b
+        (a == -1 || b == -1) && return typemax(Int)
+        if da >= db
+            a, da = index.parent[a], da - 1
+        else
+            b, db = index.parent[b], db - 1
+        end
+        dist += 1
+    end
+    dist
+end
@@ -1,14 +1,92 @@
-export step!, done, play
+export step!, done, play, phenotype_cache_stats
 using PythonCall
 # Creation should be done as an environment constructor
 done(::AbstractEnvironment)::Bool = true
+
+"""
+    is_deterministic(::Type{<:AbstractEnvironment})
+
+Whether playing the same individuals in an environment always returns the same interactions. Only matches in deterministic environments are memoized by [`ComputeInteractions!`](@ref). Defaults to `false`.
+"""
+is_deterministic(::Type{<:AbstractEnvironment}) = false
+is_deterministic(::Creator{E}) where E <: AbstractEnvironment = is_deterministic(E)
+
+"""
+    remaining_steps(env::AbstractEnvironment)
+
+Upper bound on the number of `step!` calls left before `env` is `done`, or `nothing` if unknown (the default). Lets [`SuccessiveHalvingSelector`](@ref) abort hopeless episodes early.
+"""
+remaining_steps(::AbstractEnvironment) = nothing
+
+global phenotype_cache = nothing
+
+"""
+    get_phenotype_cache()
+
+Per-process LRU of developed phenotypes keyed by individual id, so an individual played in several matches on the same worker is developed once. Phenotypes are cached in host memory and moved to the GPU for each match, so the cache never holds device memory. Holds `JEVO_PHENOTYPE_CACHE_SIZE` bytes of phenotypes (default 2^28, `0` disables the cache), like the weight cache. Emptied on every process by `ClearInteractionsAndRecords` and `ClearCurrentGenWeights`, see [`clear_phenotype_caches!`](@ref).
+"""
+function get_phenotype_cache()
+    if isnothing(Jevo.phenotype_cache)
+        maxsize = parse(Int, get(ENV, "JEVO_PHENOTYPE_CACHE_SIZE", string(2^28)))
+        Jevo.phenotype_cache = LRU{Int, Any}(maxsize=maxsize, by=Base.summarysize)
+    end
+    Jevo.phenotype_cache
+end
+
+mutable struct PhenotypeCacheStats
+    n_hits::Int
+    n_developed::Int
+    develop_time::Float64
+end
+const _phenotype_cache_stats = PhenotypeCacheStats(0, 0, 0.0)
+
+"""
+    phenotype_cache_stats(; reset::Bool=false) -> NamedTuple
+
+Phenotype cache hits, phenotypes developed and seconds spent developing them in `play` on this process since the last reset.
+"""
+function phenotype_cache_stats(; reset::Bool=false)
+    s = _phenotype_cache_stats
+    stats = (n_hits=s.n_hits, n_developed=s.n_developed, develop_time=s.develop_time)
+    if reset
+        s.n_hits, s.n_developed, s.develop_time = 0, 0, 0.0
+    end
+    stats
+end
+
+function develop_cached(ind::AbstractIndividual)
+    cache = get_phenotype_cache()
+    if cache.maxsize > 0
+        phenotype = get(cache, ind.id, nothing)
+        if !isnothing(phenotype)
+            _phenotype_cache_stats.n_hits += 1
+            return phenotype |> gpu
+        end
+    end
+    start = time()
+    phenotype = develop(ind)
+    _phenotype_cache_stats.develop_time += time() - start
+    _phenotype_cache_stats.n_developed += 1
+    cache.maxsize > 0 && (cache[ind.id] = phenotype)
+    phenotype |> gpu
+end
+
+clear_phenotype_cache!() = (empty!(get_phenotype_cache()); nothing)
+
+"""
+    clear_phenotype_caches!()
+
+Empties the phenotype cache of every process, see [`get_phenotype_cache`](@ref). Called whenever individuals may change without changing their id.
+"""
+clear_phenotype_caches!() = foreach(fetch, [remotecall(clear_phenotype_cache!, pid) for pid in procs()])
+
 play(match::Match) = play(match.environment_creator, match.individuals)
 
 
 function play(c::Creator{E}, inds::Vector{I}) where {E<:AbstractEnvironment, I<:AbstractIndividual}
     # isdefined(Jevo, :jevo_device_id) &&  device!(Jevo.jevo_device_id)
     lock(Jevo.get_env_lock()) do
-        phenotypes = develop.(inds) .|> gpu
+        phenotypes = develop_cached.(inds)
         ids = [ind.id for ind in inds]
         play(c(), ids, phenotypes)
     end
@@ -13,18 +13,22 @@ mutable struct AtariEnv <: AbstractEnvironment
     n_stack::Int
     record_prefix::String  
     env
-    prev_obs
+    input::Union{Nothing, Array{Float32,4}} # persistent model input, see observe!
+    dev_input                               # `input` on the device the model runs on
+    needs_reset::Bool
     step::Int
     done::Int
     reward::Float32
     skip_until::Int
     prev_rewards
+    obs_bytes::Int
+    obs_steps::Int
     gym
     np
 end
 
 function AtariEnv(name::String, n_envs::Int, n_steps::Int, n_stack::Int, record_prefix::String="")
-    return AtariEnv(name, n_envs, n_steps, n_stack, record_prefix, nothing, nothing, 1, 0, 0, rand(1:30), Float64[], nothing, nothing)
+    return AtariEnv(name, n_envs, n_steps, n_stack, record_prefix, nothing, nothing, nothing, true, 1, 0, 0, rand(1:30), Float64[], 0, 0, nothing, nothing)
 end
 
 function done(env::AtariEnv)
@@ -33,6 +37,8 @@ function done(env::AtariEnv)
     d
 end
 
+remaining_steps(env::AtariEnv) = env.n_steps > 0 ? (env.n_envs - env.done) * env.n_steps - (env.step - 1) : nothing
+
 
 function get_atari_imports(env::AtariEnv)
     if !isdefined(Jevo, :atari_env)
@@ -63,25 +69,32 @@ function get_atari_imports(env::AtariEnv)
     Jevo.gym, _env, Jevo.np
 end
 
+function observe!(env::AtariEnv, obs)
+    env.obs_bytes += @allocated begin
+        observe!(env.input, PyArray(obs))
+        env.dev_input === env.input || copyto!(env.dev_input, env.input)
+    end
+    env.obs_steps += 1
+end
+
 function step!(env::AtariEnv, ids::Vector{Int}, phenotypes::Vector)
     if isnothing(env.env)
         env.gym, env.env, env.np = get_atari_imports(env)
+        env.input = observation_buffer(env.n_stack, 84, 84)
+        env.dev_input = gpu(env.input)
+    end
+    if env.needs_reset
         obs, info = env.env.reset()
-        env.prev_obs = PyArray(obs) |> Array |> deepcopy
+        observe!(env, obs)
+        env.needs_reset = false
     end
-
-    obs = env.prev_obs
-    frames = [obs[i, :, :, :] for i in 1:env.n_stack]
-    obs = cat(frames..., dims=3) |> gpu
     CUDA.synchronize()
-    obs = obs ./ 255f0
-    obs = reshape(obs, 84, 84, 3*env.n_stack, 1)
 
     if env.step < env.skip_until
         action = 1
     else
         CUDA.synchronize()
-        action = phenotypes[1].chain(obs)
+        action = phenotypes[1].chain(env.dev_input)
         CUDA.synchronize()
         action = cpu(action)
         action = argmax(action[:, 1])
@@ -97,9 +110,9 @@ function step!(env::AtariEnv, ids::Vector{Int}, phenotypes::Vector)
         env.done += 1
         env.step = 1
         env.prev_rewards = Float64[]
-        env.prev_obs = nothing
+        env.needs_reset = true
         return [Interaction(ids[1], [], reward)]
     end
-    env.prev_obs = PyArray(obs) |> Array |> deepcopy
+    observe!(env, obs)
     [Interaction(ids[1], [], reward)]
 end
@@ -4,24 +4,41 @@ using Random
 using PythonCall
 
 global gym, car_racing_env, record_car_racing_env, np
+# vectorized envs per (n_envs, n_steps, n_stack, vectorized), since their wrappers depend on all four
+const vector_car_racing_envs = Dict{Tuple{Int, Int, Int, Symbol}, Any}()
 
+"""
+    CarRacingV3(n_envs::Int, n_steps::Int, n_stack::Int, record_prefix::String="", vectorized::Symbol=:none)
+
+Gymnasium's CarRacing-v3 with 64x64 observations and `n_stack` stacked frames. Each individual plays `n_envs` episodes of at most `n_steps` steps; an episode also ends after 21 consecutive negative rewards.
+
+By default, episodes are played one after another with a batch of size 1 per forward pass. With `vectorized=:sync` or `vectorized=:async`, the `n_envs` episodes run side by side in a gymnasium `SyncVectorEnv`/`AsyncVectorEnv`, and the network is called once per step on a `(64, 64, 3n_stack, n_envs)` batch. The vector envs are created once per process for each combination of `n_envs`, `n_steps`, `n_stack` and `vectorized`. Recording always uses the sequential mode.
+"""
 mutable struct CarRacingV3 <: AbstractEnvironment
     n_envs::Int
     n_steps::Int
     n_stack::Int
-    record_prefix::String  
+    record_prefix::String
+    vectorized::Symbol
     env
-    prev_obs
+    input::Union{Nothing, Array{Float32,4}} # persistent model input, see observe!
+    needs_reset::Bool
     step::Int
     done::Int
     reward::Float32
     prev_rewards
+    active::Vector{Bool}    # vectorized: sub-envs whose first episode is still running
+    neg_streak::Vector{Int} # vectorized: consecutive negative rewards per sub-env
+    obs_bytes::Int
+    obs_steps::Int
     gym
     np
 end
 
-function CarRacingV3(n_envs::Int, n_steps::Int, n_stack::Int, record_prefix::String="")
-    return CarRacingV3(n_envs, n_steps, n_stack, record_prefix, nothing, nothing, 1, 0, 0, Float64[], nothing, nothing)
+function CarRacingV3(n_envs::Int, n_steps::Int, n_stack::Int, record_prefix::String="", vectorized::Symbol=:none)
+    @assert vectorized ∈ (:none, :sync, :async) "vectorized must be :none, :sync or :async"
+    vectorized = isempty(record_prefix) ? vectorized : :none
+    return CarRacingV3(n_envs, n_steps, n_stack, record_prefix, vectorized, nothing, nothing, true, 1, 0, 0, Float64[], Bool[], Int[], 0, 0, nothing, nothing)
 end
 
 function done(env::CarRacingV3)
@@ -30,6 +47,9 @@ function done(env::CarRacingV3)
     d
 end
 
+# episodes last at most n_steps steps; vectorized sub-envs run their episodes side by side
+remaining_steps(env::CarRacingV3) = env.vectorized == :none ?
+    (env.n_envs - env.done) * env.n_steps - (env.step - 1) : env.n_steps - (env.step - 1)
 
 function get_car_racing_imports(env::CarRacingV3)
     if !isdefined(Jevo, :car_racing_env)
@@ -43,7 +63,20 @@ function get_car_racing_imports(env::CarRacingV3)
         Jevo.gym = gym
         Jevo.np = pyimport("numpy")
     end
-    if !isempty(env.record_prefix)
+    if env.vectorized != :none
+        key = (env.n_envs, env.n_steps, env.n_stack, env.vectorized)
+        _env = get!(vector_car_racing_envs, key) do
+            @info "Creating $(env.n_envs) vectorized ($(env.vectorized)) CarRacing environments"
+            gym = Jevo.gym
+            make_env = @pyeval("""lambda gym, n_steps, n_stack: lambda: gym.wrappers.FrameStackObservation(
+                gym.wrappers.TimeLimit(gym.wrappers.ResizeObservation(gym.make("CarRacing-v3"), (64, 64)),
+                                       max_episode_steps=n_steps),
+                stack_size=n_stack)""")
+            env_fns = pylist([make_env(gym, pyint(env.n_steps), pyint(env.n_stack)) for _ in 1:env.n_envs])
+            vector_env = env.vectorized == :async ? gym.vector.AsyncVectorEnv : gym.vector.SyncVectorEnv
+            vector_env(env_fns)
+        end
+    elseif !isempty(env.record_prefix)
         if !isdefined(Jevo, :record_car_racing_env)
             @info "Creating CarRacing environment for recording"
             gym = pyimport("gymnasium")
@@ -62,19 +95,24 @@ function get_car_racing_imports(env::CarRacingV3)
     Jevo.gym, _env, Jevo.np
 end
 
+function observe!(env::CarRacingV3, obs)
+    env.obs_bytes += @allocated observe!(env.input, PyArray(obs))
+    env.obs_steps += 1
+end
+
 function step!(env::CarRacingV3, ids::Vector{Int}, phenotypes::Vector)
+    env.vectorized != :none && return vector_step!(env, ids, phenotypes)
     if isnothing(env.env)
         env.gym, env.env, env.np = get_car_racing_imports(env)
+        env.input = observation_buffer(env.n_stack, 64, 64)
+    end
+    if env.needs_reset
         obs, info = env.env.reset()
-        env.prev_obs = PyArray(obs) |> Array |> deepcopy
+        observe!(env, obs)
+        env.needs_reset = false
     end
 
-    obs = env.prev_obs
-    frames = [obs[i, :, :, :] for i in 1:env.n_stack]
-    obs = cat(frames..., dims=3)
-    obs = obs ./ 255f0
-    obs = reshape(obs, 64, 64, 3*env.n_stack, 1)
-    action = phenotypes[1].chain(obs)
+    action = phenotypes[1].chain(env.input)
     action = action[:,1]
     action = env.np.array(action).T
 
@@ -83,14 +121,53 @@ function step!(env::CarRacingV3, ids::Vector{Int}, phenotypes::Vector)
     reward = pyconvert(Float32, reward)
     push!(env.prev_rewards, reward)
 
-    if Bool(terminated) || Bool(truncated) || 
+    if Bool(terminated) || Bool(truncated) ||
         length(env.prev_rewards) > 20 && all(env.prev_rewards[end-20:end] .< 0)
         env.done += 1
         env.step = 1
         env.prev_rewards = Float64[]
-        env.prev_obs = nothing
+        env.needs_reset = true
         return [Interaction(ids[1], [], reward)]
     end
-    env.prev_obs = PyArray(obs) |> Array |> deepcopy
+    observe!(env, obs)
     [Interaction(ids[1], [], reward)]
 end
+
+# Steps all n_envs sub-environments at once. Each sub-env only counts its first
+# episode; once it ends (terminated, truncated or 21 negative rewards in a row),
+# the sub-env is masked out and its auto-reset episodes are ignored.
+function vector_step!(env::CarRacingV3, ids::Vector{Int}, phenotypes::Vector)
+    if isnothing(env.env)
+        env.gym, env.env, env.np = get_car_racing_imports(env)
+        env.input = observation_buffer(env.n_stack, 64, 64, env.n_envs)
+    end
+    if env.needs_reset
+        obs, info = env.env.reset()
+        observe!(env, obs)
+        env.active = fill(true, env.n_envs)
+        env.neg_streak = zeros(Int, env.n_envs)
+        env.needs_reset = false
+    end
+
+    action = phenotypes[1].chain(env.input)
+    action = env.np.array(permutedims(cpu(action)))
+
+    obs, rewards, terminated, truncated, info = env.env.step(action)
+    env.step += 1
+    rewards = pyconvert(Vector{Float32}, rewards)
+    terminated = pyconvert(Vector{Bool}, terminated)
+    truncated = pyconvert(Vector{Bool}, truncated)
+
+    score = 0f0
+    for i in 1:env.n_envs
+        env.active[i] || continue
+        score += rewards[i]
+        env.neg_streak[i] = rewards[i] < 0 ? env.neg_streak[i] + 1 : 0
+        if terminated[i] || truncated[i] || env.neg_streak[i] > 20
+            env.active[i] = false
+            env.done += 1
+        end
+    end
+    any(env.active) ? observe!(env, obs) : (env.needs_reset = true)
+    [Interaction(ids[1], [], score)]
+end
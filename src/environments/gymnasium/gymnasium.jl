@@ -1,4 +1,6 @@
 using PythonCall
 
+include("observations.jl")
+
 include("atari.jl")
 include("car-racing.jl")
@@ -0,0 +1,44 @@
+# Observation handling shared by the gymnasium environments.
+#
+# Gymnasium's FrameStackObservation returns stacked frames as a
+# (n_stack, H, W, C) UInt8 numpy array, or (n_envs, n_stack, H, W, C) for vector
+# envs. `PyArray` wraps that memory without copying, and `observe!` writes it,
+# normalized to [0, 1], straight into a model input that is allocated once per
+# environment and reused every step.
+
+"""
+    observation_buffer(n_stack::Int, height::Int, width::Int, batch::Int=1)
+
+Allocates the persistent `(height, width, 3n_stack, batch)` Float32 model input used by [`observe!`](@ref).
+"""
+observation_buffer(n_stack::Int, height::Int, width::Int, batch::Int=1) =
+    zeros(Float32, height, width, 3 * n_stack, batch)
+
+"""
+    observe!(input::Array{Float32,4}, obs::AbstractArray{<:Any,4}, b::Int=1)
+    observe!(input::Array{Float32,4}, obs::AbstractArray{<:Any,5})
+
+Writes a `(n_stack, H, W, C)` stack of frames into column `b` of `input` as `(H, W, C*n_stack)` scaled by 1/255, or every sub-env of a `(n_envs, n_stack, H, W, C)` batch into its own column. Frame `s`, channel `c` goes to channel `c + C*(s-1)`, matching `cat(frames..., dims=3)`. Does not allocate.
+"""
+function observe!(input::Array{Float32,4}, obs::AbstractArray{<:Any,4}, b::Int=1)
+    n_stack, H, W, C = size(obs)
+    @inbounds for s in 1:n_stack, c in 1:C, w in 1:W, h in 1:H
+        input[h, w, c + C * (s - 1), b] = obs[s, h, w, c] / 255f0
+    end
+    input
+end
+
+function observe!(input::Array{Float32,4}, obs::AbstractArray{<:Any,5})
+    n_envs, n_stack, H, W, C = size(obs)
+    @inbounds for b in 1:n_envs, s in 1:n_stack, c in 1:C, w in 1:W, h in 1:H
+        input[h, w, c + C * (s - 1), b] = obs[b, s, h, w, c] / 255f0
+    end
+    input
+end
+
+"""
+    obs_bytes_per_step(env)
+
+Average bytes allocated per step while converting gymnasium observations into the model input of `env`, as counted by `@allocated` around [`observe!`](@ref).
+"""
+obs_bytes_per_step(env::AbstractEnvironment) = env.obs_bytes / max(env.obs_steps, 1)
@@ -1,6 +1,7 @@
 export CompareOnOne, AbstractNumbersGame
 abstract type AbstractNumbersGame <: AbstractEnvironment end
 struct CompareOnOne <: AbstractNumbersGame end
+is_deterministic(::Type{CompareOnOne}) = true
 
 function step!(::CompareOnOne, ids::Vector{Int}, phenotypes::Vector{VectorPhenotype})
     @assert length(phenotypes) == length(ids) == 2
@@ -9,6 +9,7 @@ struct AcceptRejectStrings <: AbstractEnvironment
     accept::Vector{String}
     reject::Vector{String}
 end
+is_deterministic(::Type{<:Union{RegularLanguage, AcceptRejectStrings}}) = true
 
 function get_strings(env::RegularLanguage)
     @assert env.n_strings % 2 == 0 "Need an even number of strings"
@@ -8,6 +8,7 @@ Base.@kwdef struct RepeatSequence <: AbstractEnvironment
     seq_len::Int
     n_repeat::Int
 end
+is_deterministic(::Type{RepeatSequence}) = true
 function split_into_strings(n)
     # Convert the input to a string and ensure it's exactly 3 characters long
     n_str = lpad(n, 3, '0')
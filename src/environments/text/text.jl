@@ -6,7 +6,7 @@ struct NegativeLoss <: AbstractMetric end
 struct PercentCorrect <: AbstractMetric end
 
 #global preprocessed_batch = nothing
-function get_preprocessed_batch(env::Union{RepeatSequence, RegularLanguage, AcceptRejectStrings, TinyStoriesDataSet}, tm::TextModel)
+function get_preprocessed_batch(env::Union{RepeatSequence, RegularLanguage, AcceptRejectStrings}, tm::TextModel)
     @info "Preprocessing batch"
     # There appears to be some memory management issue, where GPU OOMs.
     # Allocating a large amount of memory on the CPU appears to alleviate this 
@@ -1,25 +1,121 @@
 using Transformers.Datasets: batched
+using Transformers.TextEncoders: lookup
 using Flux.Losses
-export TinyStoriesDataSet
+using Mmap
+export TinyStoriesDataSet, tokenize_tinystories
 
+const TINYSTORIES_TEXT = joinpath(@__DIR__, "datasets/tinystories/first10kstories.txt")
+const TINYSTORIES_TOKENS = joinpath(@__DIR__, "datasets/tinystories/first10kstories.tok")
+
+"""
+    TinyStoriesDataSet(; n_tokens, n_sequences, max_seq_len, batch_size, corpus=TINYSTORIES_TOKENS)
+
+Scores a [`TextModel`](@ref) by its negative next-token cross-entropy on the first `n_sequences` TinyStories, in batches of `batch_size`.
+
+Stories are read from `corpus`, a file of token ids written by [`tokenize_tinystories`](@ref), which every process memory-maps. The encoded batch is built once per process for each vocabulary and environment configuration, so evaluations do not tokenize. Without a matching `corpus`, the stories are encoded from the text file instead.
+"""
 Base.@kwdef struct TinyStoriesDataSet <: AbstractEnvironment
     n_tokens::Int
     n_sequences::Int
     max_seq_len::Int
     batch_size::Int
+    corpus::String = TINYSTORIES_TOKENS
+end
+is_deterministic(::Type{TinyStoriesDataSet}) = true
+
+# Token ids of each story, memory-mapped from a file written by tokenize_tinystories
+struct TokenizedCorpus
+    vocab_hash::UInt64
+    lengths::Vector{Int32}
+    offsets::Vector{Int}
+    ids::Vector{UInt16}
+end
+
+const tinystories_corpora = Dict{String, TokenizedCorpus}()
+const tinystories_batches = Dict{Tuple{UInt64, TinyStoriesDataSet}, Any}()
+global tinystories_text = nothing
+
+# hashing the vocabulary walks every token, so do it once per encoder rather than per step!
+const tinystories_vocab_hashes = IdDict{Any, UInt64}()
+vocab_hash(textenc) = get!(() -> hash(textenc.vocab.list), tinystories_vocab_hashes, textenc)
+
+function get_tinystories_text()
+    isnothing(tinystories_text) && (global tinystories_text = readlines(TINYSTORIES_TEXT))
+    tinystories_text
+end
+
+"""
+    tokenize_tinystories(textenc; text=TINYSTORIES_TEXT, corpus=TINYSTORIES_TOKENS, chunk_size=1024)
+
+Encodes every line of `text` with `textenc` once, offline, and writes the token ids to `corpus` for [`TinyStoriesDataSet`](@ref). The file holds the number of stories, a hash of the vocabulary, the `Int32` length of each story and the `UInt16` ids of all stories back to back.
+"""
+function tokenize_tinystories(textenc; text::String=TINYSTORIES_TEXT, corpus::String=TINYSTORIES_TOKENS, chunk_size::Int=1024)
+    @assert length(textenc.vocab.list) <= typemax(UInt16) "Vocabulary too large for UInt16 token ids"
+    stories = readlines(text)
+    lengths, ids = Int32[], UInt16[]
+    for chunk in Iterators.partition(stories, chunk_size)
+        encoded = encode(textenc, batched([(story,) for story in chunk])[1])
+        tokens = Flux.onecold(encoded.token)
+        for (i, len) in enumerate(encoded.attention_mask.len)
+            push!(lengths, len)
+            append!(ids, @view tokens[1:len, i])
+        end
+    end
+    tmp = "$corpus.$(getpid()).tmp"
+    open(tmp, "w") do io
+        Base.write(io, length(lengths), vocab_hash(textenc), lengths, ids)
+    end
+    mv(tmp, corpus, force=true)
+    @info "Tokenized $(length(lengths)) stories ($(length(ids)) tokens) into $corpus"
+    corpus
 end
 
-global TINYSTORIES_DATASET = readlines(joinpath(@__DIR__, "datasets/tinystories/first10kstories.txt"))
+function get_tokenized_corpus(path::String)
+    get!(tinystories_corpora, path) do
+        open(path, "r") do io
+            n = Base.read(io, Int)
+            hash = Base.read(io, UInt64)
+            lengths = Mmap.mmap(io, Vector{Int32}, n, 16)
+            offsets = [0; cumsum(lengths)[1:end-1]]
+            ids = Mmap.mmap(io, Vector{UInt16}, sum(lengths; init=0), 16 + 4n)
+            TokenizedCorpus(hash, lengths, offsets, ids)
+        end
+    end
+end
 
 # ==== PERFORMANCE CRITICAL END
 function sample_batch(env::TinyStoriesDataSet)
     # Each string is enclosed in a tuple for the batch
     # If we were using encoder-decoder, we would have a tuple of two strings
-    # read in ./datasets/tinystories/first10kstories.txt
-    seqs = [(TINYSTORIES_DATASET[i],) for i in 1:env.n_sequences]
+    stories = get_tinystories_text()
+    seqs = [(stories[i],) for i in 1:env.n_sequences]
     batched(seqs)[1]
 end
 
+function encode_tinystories(env::TinyStoriesDataSet, textenc)
+    if isfile(env.corpus)
+        corpus = get_tokenized_corpus(env.corpus)
+        if corpus.vocab_hash == vocab_hash(textenc)
+            # map the stored ids back to tokens and only run the lookup stage of the encoder,
+            # padding is masked out
+            lengths = corpus.lengths[1:env.n_sequences]
+            tokens = fill(textenc.vocab.unk, maximum(lengths), env.n_sequences)
+            for i in 1:env.n_sequences, j in 1:lengths[i]
+                tokens[j, i] = textenc.vocab.list[corpus.ids[corpus.offsets[i] + j]]
+            end
+            return lookup(textenc, (token = tokens, attention_mask = Transformers.NeuralAttentionlib.LengthMask(lengths)))
+        end
+        @warn "$(env.corpus) was tokenized with a different vocabulary, encoding stories from text"
+    end
+    encode(textenc, sample_batch(env))
+end
+
+function get_preprocessed_batch(env::TinyStoriesDataSet, tm::TextModel)
+    get!(tinystories_batches, (vocab_hash(tm.textenc), env)) do
+        encode_tinystories(env, tm.textenc) |> gpu
+    end
+end
+
 
 function shift_decode_loss(logits, trg, trg_mask::M) where M <: Transformers.NeuralAttentionlib.LengthMask
     # ignore start
@@ -105,6 +105,10 @@ mutable struct TradeGridWorld <: AbstractGridworld
     render_filename::String # directory
     frames::Vector{Array{Float32,3}}
     perspective_frames::Vector  # each player's obs 
+    pool_image::Array{Float32,3}    # pool layer, drawn once, see render_world!
+    image::Array{Float32,3}         # world rendered once per step
+    observations::Vector{Array{Float32,4}}  # each player's view, reused every step
+    obs_batch::Array{Float32,4}     # all views, for players sharing a phenotype
 end
 
 function TradeGridWorld(n::Int, p::Int, max_steps::Int=100, view_radius::Int=30, reset_interval::Int=25, pool_radius::Int=5, render_filename::String="")
@@ -120,7 +124,10 @@ function TradeGridWorld(n::Int, p::Int, max_steps::Int=100, view_radius::Int=30,
         push!(players, PlayerState(i, position, 0.0, 0.0))
     end
 
-    env = TradeGridWorld(n, p, grid_apples, grid_bananas, players, 1, max_steps, view_radius, reset_interval, pool_radius, render_filename, Array{Float32, 3}[], [Array{Float32, 3}[] for i in 1:p])
+    view_size = 2 * view_radius + 1
+    env = TradeGridWorld(n, p, grid_apples, grid_bananas, players, 1, max_steps, view_radius, reset_interval, pool_radius, render_filename, Array{Float32, 3}[], [Array{Float32, 3}[] for i in 1:p],
+                         pool_image(n, pool_radius), zeros(Float32, n, n, 3),
+                         [zeros(Float32, view_size, view_size, 3, 1) for _ in 1:p], zeros(Float32, view_size, view_size, 3, p))
     reset_map!(env)
     env
 end
@@ -366,17 +373,21 @@ function collect_nearby_resources(grid::Array{Float64, 2}, player::PlayerState,
     x, y = player.position
     x_min = max(1, ceil(Int, x - PLAYER_RADIUS))
     x_max = min(size(grid, 1), floor(Int, x + PLAYER_RADIUS))
-    y_min = max(1, ceil(Int, y - PLAYER_RADIUS))
-    y_max = min(size(grid, 2), floor(Int, y + PLAYER_RADIUS))
 
     total_collected = 0.0
-    for i in x_min:x_max, j in y_min:y_max 
-        if grid[i,j] > 0 && (i - x)^2 + (j - y)^2 <= PLAYER_RADIUS^2
-            amount_to_collect = min(amount - total_collected, grid[i, j]);
-            grid[i, j] -= amount_to_collect;
-            total_collected += amount_to_collect;
-            if total_collected >= amount 
-                return total_collected 
+    for i in x_min:x_max
+        # columns of row i inside the disk, widened by one to absorb rounding at the rim
+        half = sqrt(max(PLAYER_RADIUS^2 - (i - x)^2, 0.0))
+        y_min = max(1, ceil(Int, y - half) - 1)
+        y_max = min(size(grid, 2), floor(Int, y + half) + 1)
+        @inbounds for j in y_min:y_max
+            if grid[i,j] > 0 && (i - x)^2 + (j - y)^2 <= PLAYER_RADIUS^2
+                amount_to_collect = min(amount - total_collected, grid[i, j]);
+                grid[i, j] -= amount_to_collect;
+                total_collected += amount_to_collect;
+                if total_collected >= amount 
+                    return total_collected 
+                end
             end
         end
     end
@@ -397,6 +408,66 @@ function too_close_to_others(pos::Tuple{Float64,Float64}, current_player::Int, p
     return false
 end
 
+"""
+    free_distance(players::Vector{PlayerState}, current_player::Int, pos, ux, uy, dist)
+
+Largest of `dist`, `dist - 0.1`, `dist - 0.2`, ... above zero that `current_player` can move from `pos` along the unit vector `(ux, uy)` without being `too_close_to_others`, or `0.0` if there is none. Each other player blocks the open interval of distances where the player would be within `2PLAYER_RADIUS` of it, which is solved for in closed form instead of testing every step. Assumes the path stays inside the grid.
+"""
+function free_distance(players::Vector{PlayerState}, current_player::Int, pos::Tuple{Float64,Float64}, ux, uy, dist)
+    t = dist
+    while t > 0
+        blocked = false
+        for (i, other) in enumerate(players)
+            i == current_player && continue
+            ox, oy = pos[1] - other.position[1], pos[2] - other.position[2]
+            # |o + t u|^2 < (2R)^2  <=>  t^2 + 2bt + c < 0
+            b = ux * ox + uy * oy
+            disc = b^2 - (ox^2 + oy^2 - (2 * PLAYER_RADIUS)^2)
+            disc <= 0 && continue
+            t_enter, t_exit = -b - sqrt(disc), -b + sqrt(disc)
+            if t_enter < t < t_exit
+                t = dist - 0.1 * ceil((dist - t_enter) / 0.1)
+                blocked = true
+            end
+        end
+        blocked || return t
+    end
+    0.0
+end
+
+# Moves `player` as far as it can along (dx, dy), see free_distance
+function move!(env::TradeGridWorld, i::Int, dx, dy)
+    player = env.players[i]
+    prev_pos = player.position
+    dist = sqrt(dx^2 + dy^2)
+    dist == 0 && return
+    dx_unit, dy_unit = dx / dist, dy / dist
+    target = (prev_pos[1] + dx_unit * dist, prev_pos[2] + dy_unit * dist)
+    if all(1 .<= prev_pos .<= env.n) && all(1 .<= target .<= env.n)
+        t = free_distance(env.players, i, prev_pos, dx_unit, dy_unit, dist)
+        t > 0 && (player.position = (prev_pos[1] + dx_unit * t, prev_pos[2] + dy_unit * t))
+        return
+    end
+    # the path leaves the grid and is clamped, so try full movement first, then gradually reduce until valid
+    test_dist = dist
+    while test_dist > 0
+        test_x = prev_pos[1] + dx_unit * test_dist
+        test_y = prev_pos[2] + dy_unit * test_dist
+        test_pos = (clamp(test_x, 1, env.n), clamp(test_y, 1, env.n))
+        
+        if !too_close_to_others(test_pos, i, env.players)
+            player.position = test_pos
+            break
+        end
+        test_dist -= 0.1
+    end
+end
+
+"""
+    step!(env::TradeGridWorld, ids::Vector{Int}, phenotypes::Vector{P}) where P<:AbstractPhenotype
+
+Renders the world once, crops every player's view into the reused `env.observations` buffers and computes all players' actions from that same state before applying them in player order. Players that share a phenotype (self-play) are evaluated in a single forward pass over `env.obs_batch`.
+"""
 function step!(env::TradeGridWorld, ids::Vector{Int}, phenotypes::Vector{P}) where P<:AbstractPhenotype
 
     @assert length(ids) == length(phenotypes) == env.p
@@ -435,14 +506,15 @@ function step!(env::TradeGridWorld, ids::Vector{Int}, phenotypes::Vector{P}) whe
         end
     end
 
+    observations = make_observations(env, ids, phenotypes)
+    actions = get_actions(env, observations, phenotypes)
     for (i, id) in enumerate(ids)
-        observations = make_observations(env, ids, phenotypes)
         other_id = ids[3-i]
         player = env.players[i]
-        action_values = phenotypes[i](observations[i])
+        action_values = actions[i]
         @assert length(action_values) == 4
         # assert all actions are not nan or inf
-        @assert !any(isnan.(action_values)) && !any(isinf.(action_values))
+        @assert all(isfinite, action_values)
         dx, dy, place_action, pick_action = action_values
         place_action, pick_action = tanh(place_action), tanh(pick_action)
         movement_weight = abs(dx) + abs(dy)
@@ -454,24 +526,7 @@ function step!(env::TradeGridWorld, ids::Vector{Int}, phenotypes::Vector{P}) whe
         pick_action = pick_action * STARTING_RESOURCES
         
         # Find closest valid position along movement vector
-        prev_pos = player.position
-        dx_unit = dx == 0 ? 0 : dx/sqrt(dx^2 + dy^2)
-        dy_unit = dy == 0 ? 0 : dy/sqrt(dx^2 + dy^2)
-        dist = sqrt(dx^2 + dy^2)
-        
-        # Try full movement first, then gradually reduce until valid
-        test_dist = dist
-        while test_dist > 0
-            test_x = prev_pos[1] + dx_unit * test_dist
-            test_y = prev_pos[2] + dy_unit * test_dist
-            test_pos = (clamp(test_x, 1, env.n), clamp(test_y, 1, env.n))
-            
-            if !too_close_to_others(test_pos, i, env.players)
-                player.position = test_pos
-                break
-            end
-            test_dist -= 0.1
-        end
+        move!(env, i, dx, dy)
 
         px = round(Int, player.position[1])
         py = round(Int, player.position[2])
@@ -568,108 +623,129 @@ function make_resource_interactions(env::TradeGridWorld, ids::Vector{Int})
     interactions
 end
 
-# Creates RGB pixel observations for each player in the environment.
+"""
+    make_observations(env::TradeGridWorld, ids::Vector{Int}, phenotypes::Vector{P}) where P<:AbstractPhenotype
+
+Creates the `(2view_radius+1, 2view_radius+1, 3, 1)` RGB observation of each player from a single [`render_world!`](@ref) of the map. Views are cropped into `env.observations`, which are overwritten on the next call, and the players are drawn onto each crop with the viewer on top. Outside of the map is filled with `0.2f0`.
+"""
 function make_observations(env::TradeGridWorld, ids::Vector{Int}, phenotypes::Vector{P}) where P<:AbstractPhenotype
-    base_img = render(env)
+    img = render_world!(env.image, env)
     view_radius = env.view_radius
-    view_size = 2 * view_radius + 1
-    observations = Vector(undef, length(env.players))
-    
     for (i, player) in enumerate(env.players)
-        # Render the world from this player's perspective
-        player_view = render(env, i)
-        obs = fill(0.2f0, view_size, view_size, 3)
+        obs = env.observations[i]
+        fill!(obs, 0.2f0)
         px = round(Int, player.position[1])
         py = round(Int, player.position[2])
-        
-        # Calculate ranges for source and destination
+        # world (x, y) is obs (x - x_off, y - y_off)
+        x_off, y_off = px - view_radius - 1, py - view_radius - 1
         x_src_range = max(1, px - view_radius):min(env.n, px + view_radius)
         y_src_range = max(1, py - view_radius):min(env.n, py + view_radius)
-        x_dst_start = view_radius + 1 - (px - first(x_src_range))
-        y_dst_start = view_radius + 1 - (py - first(y_src_range))
-        x_dst_range = x_dst_start:(x_dst_start + length(x_src_range)-1)
-        y_dst_range = y_dst_start:(y_dst_start + length(y_src_range)-1)
-        
-        # Single array operation instead of nested loops
-        obs[x_dst_range, y_dst_range, :] .= view(player_view, x_src_range, y_src_range, :)
-        # add dim 1 to make it a 4D array for batch size
-        obs = reshape(obs, view_size, view_size, 3, 1)
-        observations[i] = obs
+        @inbounds for c in 1:3, y in y_src_range, x in x_src_range
+            obs[x - x_off, y - y_off, c, 1] = img[x, y, c]
+        end
+        draw_players!(obs, env, i, x_off, y_off)
     end
-    observations
+    env.observations
 end
 
 function get_actions(observations, phenotypes::Vector{P}) where P<:AbstractPhenotype
     [pheno(obs) for (obs, pheno) in zip(observations, phenotypes)]
 end
 
+function get_actions(env::TradeGridWorld, observations, phenotypes::Vector{P}) where P<:AbstractPhenotype
+    length(phenotypes) > 1 && all(pheno -> pheno === phenotypes[1], phenotypes) || return get_actions(observations, phenotypes)
+    for (i, obs) in enumerate(observations)
+        env.obs_batch[:, :, :, i] .= view(obs, :, :, :, 1)
+    end
+    actions = phenotypes[1](env.obs_batch)
+    [view(actions, :, i) for i in eachindex(phenotypes)]
+end
+
 function get_player_color(viewing_player::Int, player_idx::Int, players::Vector{PlayerState})
-    color = viewing_player == player_idx ? copy(SELF_COLOR) : copy(OTHER_COLOR)
-    increments = (1 .- color) ./ STARTING_RESOURCES  # apples increments are [1], banana increments are [2]
-    color[1] += players[player_idx].resource_apples * increments[1]
-    color[2] += players[player_idx].resource_bananas * increments[2]
-    color
+    color = viewing_player == player_idx ? SELF_COLOR : OTHER_COLOR
+    # apples brighten the red channel, bananas the green one
+    apple_increment = (1 - color[1]) / STARTING_RESOURCES
+    banana_increment = (1 - color[2]) / STARTING_RESOURCES
+    (Float32(color[1] + players[player_idx].resource_apples * apple_increment),
+     Float32(color[2] + players[player_idx].resource_bananas * banana_increment),
+     color[3])
 end
 
-function render(env::TradeGridWorld, perspective::Int=1)
-    n = env.n
+function pool_image(n::Int, pool_radius::Int)
     img = zeros(Float32, n, n, 3)
-    
-    # Render water pool in center
     center = n ÷ 2
     for x in 1:n, y in 1:n
         dx = x - center
         dy = y - center
-        if sqrt(dx^2 + dy^2) <= env.pool_radius
+        if sqrt(dx^2 + dy^2) <= pool_radius
             img[x, y, :] .= POOL_COLOR
         end
     end
+    img
+end
+
+has_food(env::TradeGridWorld, x::Int, y::Int) = env.grid_apples[x, y] > 0 || env.grid_bananas[x, y] > 0
+
+"""
+    render_world!(img::Array{Float32,3}, env::TradeGridWorld)
+
+Renders the water pool and the apples and bananas of `env` into the `(n, n, 3)` image `img`, without the players, see [`draw_players!`](@ref).
+"""
+function render_world!(img::Array{Float32,3}, env::TradeGridWorld)
+    copyto!(img, env.pool_image)
+    # Render apples and bananas on the grid, if there is anything, it starts at 0.25
+    @inbounds for y in 1:env.n, x in 1:env.n
+        has_food(env, x, y) || continue
+        apples, bananas = env.grid_apples[x, y], env.grid_bananas[x, y]
+        for c in 1:3
+            value = 0.0
+            apples > 0 && (value += APPLE_COLOR[c] * (0.25f0 + apples/(1.4*STARTING_RESOURCES)))
+            bananas > 0 && (value += BANANA_COLOR[c] * (0.25f0 + bananas/(1.4*STARTING_RESOURCES)))
+            img[x, y, c] = value
+        end
+    end
+    img
+end
 
-    # Iterate through all players and plot them, but do the current player's perspective last
-    # to ensure they are on top of the others
-    player_order = [i for i in 1:env.p if i != perspective]
-    player_order = vcat(player_order, perspective)
+"""
+    draw_players!(img::AbstractArray{Float32}, env::TradeGridWorld, perspective::Int, x_off::Int=0, y_off::Int=0)
 
-    for idx in player_order
+Draws every player of `env` as a disk onto `img`, where world pixel `(x, y)` is `img[x - x_off, y - y_off, :]`. The `perspective` player is drawn last, so it is on top of the others, and pixels holding food are left untouched, as food is drawn over players.
+"""
+function draw_players!(img::AbstractArray{Float32}, env::TradeGridWorld, perspective::Int, x_off::Int=0, y_off::Int=0)
+    for k in 1:env.p
+        # the perspective player is drawn last
+        idx = k < perspective ? k : k == env.p ? perspective : k + 1
         player = env.players[idx]
         x_center = player.position[1]
         y_center = player.position[2]
         radius = PLAYER_RADIUS  # Circle radius
 
-        # Determine the bounding box for the circle
-        x_min = max(ceil(Int, x_center - radius), 1)
-        x_max = min(floor(Int, x_center + radius), n)
-        y_min = max(ceil(Int, y_center - radius), 1)
-        y_max = min(floor(Int, y_center + radius), n)
-
-        player_color = get_player_color(perspective, idx, env.players)
-
-        for x in x_min:x_max
-            for y in y_min:y_max
-                # Compute the distance from the center
-                dx = x - x_center
-                dy = y - y_center
-                distance = sqrt(dx^2 + dy^2)
-                if distance <= radius
-                    img[x, y, :] .= player_color
-                end
+        # Determine the bounding box for the circle, within both the map and img
+        x_min = max(ceil(Int, x_center - radius), 1, 1 + x_off)
+        x_max = min(floor(Int, x_center + radius), env.n, size(img, 1) + x_off)
+        y_min = max(ceil(Int, y_center - radius), 1, 1 + y_off)
+        y_max = min(floor(Int, y_center + radius), env.n, size(img, 2) + y_off)
+
+        r, g, b = get_player_color(perspective, idx, env.players)
+
+        @inbounds for y in y_min:y_max, x in x_min:x_max
+            # Compute the distance from the center
+            dx = x - x_center
+            dy = y - y_center
+            if sqrt(dx^2 + dy^2) <= radius && !has_food(env, x, y)
+                img[x - x_off, y - y_off, 1] = r
+                img[x - x_off, y - y_off, 2] = g
+                img[x - x_off, y - y_off, 3] = b
             end
         end
     end
+    img
+end
 
-    # Render apples and bananas on the grid, if there is anything, it starts at 0.5
-    for x in 1:n, y in 1:n
-        # clear pixels to add food colors
-        if env.grid_apples[x, y] > 0 || env.grid_bananas[x, y] > 0
-            img[x, y, :] .= 0.0f0
-        end
-        if env.grid_apples[x, y] > 0
-            img[x, y, :] += APPLE_COLOR .* (0.25f0 + env.grid_apples[x,y]/(1.4*STARTING_RESOURCES))
-        end
-        if env.grid_bananas[x, y] > 0
-            img[x, y, :] += BANANA_COLOR .* (0.25f0 + env.grid_bananas[x,y]/(1.4*STARTING_RESOURCES))
-        end
-    end
+function render(env::TradeGridWorld, perspective::Int=1)
+    img = render_world!(zeros(Float32, env.n, env.n, 3), env)
+    draw_players!(img, env, perspective)
     @assert all(0.0f0 .<= img .<= 1.0f0)
     img
 end
@@ -1,4 +1,4 @@
-export JevoLogger, @h5
+export JevoLogger, @h5, flush_h5_loggers
 
 const H5_LOG_LEVEL = LogLevel(5)
 const datefmt = "yy-mm-dd HH:MM:SS"
@@ -6,39 +6,109 @@ import Base: log
 # log to the HDF5 file and defaults to the HDF5_LOG_LEVEL
 macro h5(exs...) Base.CoreLogging.logmsg_code((Base.CoreLogging.@_sourceinfo())..., esc(H5_LOG_LEVEL), exs...) end
 
-struct HDF5Logger <: AbstractLogger
+"""
+    HDF5Logger(path::String; buffered=false, max_buffered=1024, flush_interval=60.0)
+
+Writes measurements logged with `@h5` to `path`. By default every measurement takes the pidfile lock, is written, and is flushed to disk. With `buffered=true`, measurements are held in memory and written under a single lock/flush once `max_buffered` measurements or `flush_interval` seconds have accumulated, at the end of every generation (see [`flush_h5_loggers`](@ref)), before checkpointing, on errors and at exit. The file layout is identical in both modes.
+"""
+mutable struct HDF5Logger <: AbstractLogger
     path::AbstractString
     io::HDF5.File
     always_flush::Bool
+    buffer::Vector{AbstractMeasurement}
+    max_buffered::Int
+    flush_interval::Float64
+    last_flush::Float64
+    lock::ReentrantLock
 end
 
-function HDF5Logger(path::String;kwargs...)
+# buffered loggers, flushed by flush_h5_loggers()
+const h5_loggers = HDF5Logger[]
+
+function HDF5Logger(path::String; buffered::Bool=false, max_buffered::Int=1024, flush_interval::Float64=60.0, kwargs...)
     io = h5open(path, "cw")
-    HDF5Logger(path, io, true)
+    logger = HDF5Logger(path, io, !buffered, AbstractMeasurement[], max_buffered, flush_interval, time(), ReentrantLock())
+    if buffered
+        push!(h5_loggers, logger)
+        atexit(()->flush(logger))
+    end
+    logger
 end
 
-function JevoLogger(;hdf5_path::String="statistics.h5", log_path::String="run.log")
+function JevoLogger(;hdf5_path::String="statistics.h5", log_path::String="run.log", kwargs...)
     filelogger = FormatLogger(log_path) do io, args
         println(io, "$(Dates.format(now(), datefmt)) $(args.message)")
     end
     MinLevelLogger(
         TeeLogger(
-            EarlyFilteredLogger(log->log.level == H5_LOG_LEVEL, HDF5Logger(hdf5_path)),
+            EarlyFilteredLogger(log->log.level == H5_LOG_LEVEL, HDF5Logger(hdf5_path; kwargs...)),
             EarlyFilteredLogger(log->log.level ∈ (Info, Warn, Error) , filelogger)),
         Info)
 end
 
 
+function write_measurements(logger::HDF5Logger, ms::Vector{<:AbstractMeasurement})
+    isempty(ms) && return
+    pidpath = logger.path*".pid"
+    monitor = FileWatching.Pidfile.mkpidlock(pidpath, wait=true)
+    try
+        for m in ms
+            write(logger.io, m)
+        end
+        flush(logger.io)
+    finally
+        close(monitor)
+    end
+end
+
+"""
+    flush(logger::HDF5Logger)
+
+Write all buffered measurements of `logger` to disk.
+"""
+function Base.flush(logger::HDF5Logger)
+    lock(logger.lock) do
+        write_measurements(logger, logger.buffer)
+        empty!(logger.buffer)
+        logger.last_flush = time()
+    end
+end
+
+"""
+    flush_h5_loggers()
+
+Flush every buffered [`HDF5Logger`](@ref). Called at the end of each generation, before checkpointing and when an operator throws.
+"""
+flush_h5_loggers() = foreach(flush, h5_loggers)
+
 function Base.CoreLogging.handle_message(logger::HDF5Logger, level, m::AbstractMeasurement, _module, group, id, file, line; kwargs...)
     @assert level.level == H5_LOG_LEVEL.level
     @assert length(kwargs) == 0
-    pidpath = logger.path*".pid"
-    monitor = FileWatching.Pidfile.mkpidlock(pidpath, wait=true)
-    write(logger.io, m)
-    flush(logger.io)
-    close(monitor)
+    if logger.always_flush
+        write_measurements(logger, [m])
+        return
+    end
+    lock(logger.lock) do
+        push!(logger.buffer, m)
+        if length(logger.buffer) >= logger.max_buffered || time() - logger.last_flush >= logger.flush_interval
+            flush(logger)
+        end
+    end
 end
 
+has_h5_logger(::AbstractLogger) = false
+has_h5_logger(::HDF5Logger) = true
+has_h5_logger(logger::TeeLogger) = any(has_h5_logger, logger.loggers)
+has_h5_logger(logger::Union{MinLevelLogger, EarlyFilteredLogger, ActiveFilteredLogger, TransformerLogger}) =
+    has_h5_logger(logger.logger)
+
+"""
+    h5_logging() -> Bool
+
+Whether the current logger writes to an [`HDF5Logger`](@ref), directly or through a `LoggingExtras` composition such as [`JevoLogger`](@ref). Guards measurements that are only meant for `statistics.h5`, which would otherwise be printed by the default console logger.
+"""
+h5_logging() = has_h5_logger(current_logger())
+
 function Base.log(m::AbstractMeasurement, h5::Bool, txt::Bool, console::Bool)
     h5 && @h5 m
     txt && @info m
@@ -1,46 +1,222 @@
 using Printf
 export Checkpoint, LoadCheckpoint
 
+"""
+    LRUIncrement(maxsize::Int, entries::Vector{Pair{Int, Any}}, ids::Vector{Int})
+
+Stands in for an `LRU` cache (a population's [`DeltaCache`](@ref) or the genotype cache) in an incremental checkpoint. `entries` are the key-value pairs added since the previous checkpoint, `ids` all keys held at this checkpoint, most recently used first.
+"""
+struct LRUIncrement <: AbstractData
+    maxsize::Int
+    entries::Vector{Pair{Int, Any}}
+    ids::Vector{Int}
+end
+
+# Per-process bookkeeping of the checkpoint chain written to one checkpoint name
+mutable struct CheckpointChain
+    last_file::String
+    n_increments::Int
+    delta_ids::Dict{String, Set{Int}}  # population id => DeltaCache keys already written
+    genotype_ids::Set{Int}
+    task::Union{Nothing, Task}
+end
+const checkpoint_chains = Dict{String, CheckpointChain}()
+
+compression_ext(compress::Nothing) = ""
+compression_ext(compress::String) = compress == "gzip" ? ".gz" :
+                                    compress == "zstd" ? ".zst" :
+                                    error("compress must be nothing, \"gzip\" or \"zstd\", got $compress")
+function compressor(path::String)
+    endswith(path, ".gz") && return "gzip"
+    endswith(path, ".zst") && return "zstd"
+    nothing
+end
+
+function read_checkpoint(path::String)
+    read_all(io) = (data = Serialization.deserialize(io);
+                    (data, eof(io) ? nothing : Serialization.deserialize(io)))
+    compress = compressor(path)
+    isnothing(compress) && return open(read_all, path)
+    open(read_all, `$compress -dc $path`)
+end
+
+"""
+    wait_for_checkpoints()
+
+Blocks until every checkpoint being written in the background has been written.
+"""
+function wait_for_checkpoints()
+    for chain in values(checkpoint_chains)
+        isnothing(chain.task) || wait(chain.task)
+    end
+end
+
+function lru_increment(lru::LRU, saved::Set{Int})
+    entries, ids = Pair{Int, Any}[], Int[]
+    for (id, value) in lru  # iterating does not change the LRU order
+        push!(ids, id)
+        id ∉ saved && push!(entries, id => value)
+    end
+    LRUIncrement(lru.maxsize, entries, ids)
+end
+
+function rebuild_lru(lru::LRU, inc::LRUIncrement, entries::Dict{Int, Any})
+    for id in reverse(inc.ids)
+        lru[id] = entries[id]
+    end
+    lru
+end
+
+lru_entries(lru::LRU) = Dict{Int, Any}(id => value for (id, value) in lru)
+lru_entries(::Nothing) = Dict{Int, Any}()
+
+# Serializes `data` plus `:state => state`, without the phylogenetic indexes (rebuilt from
+# the trees on restore) and with each DeltaCache swapped for an LRUIncrement if
+# `incremental`, then restores the population data. Returns the bytes and the DeltaCache keys.
+function serialize_checkpoint(state::State, data::Dict, chain::CheckpointChain, incremental::Bool)
+    saved = Tuple{Population, Vector}[]
+    delta_ids = Dict{String, Set{Int}}()
+    for comp_pop in PopulationRetriever()(state), pop in comp_pop
+        push!(saved, (pop, pop.data))
+        pop.data = filter(d -> !(d isa PhylogeneticIndex), pop.data)
+        idx = findfirst(d -> d isa DeltaCache, pop.data)
+        isnothing(idx) && continue
+        dc = pop.data[idx]
+        delta_ids[pop.id] = Set(keys(dc))
+        incremental || continue
+        pop.data[idx] = lru_increment(dc, get(chain.delta_ids, pop.id, Set{Int}()))
+    end
+    io = IOBuffer()
+    try
+        Serialization.serialize(io, merge(data, Dict(:state => state)))
+    finally
+        for (pop, pop_data) in saved
+            pop.data = pop_data
+        end
+    end
+    take!(io), delta_ids
+end
+
+# `checkpointname` is a symlink without the compression extension, so resolve it first
+resolve_checkpoint(path::String) = islink(path) ? joinpath(dirname(path), readlink(path)) : path
+
 function restore_from_checkpoint!(state::State, checkpointname::String)
     !isfile(checkpointname) && return state
-    loaded_data = Serialization.deserialize(checkpointname)
-    loaded_state = loaded_data[:state]
+    # follow increments back to their base checkpoint
+    chain, path, loaded_weight_cache = [], resolve_checkpoint(checkpointname), nothing
+    while true
+        data, loaded_weight_cache = read_checkpoint(path)
+        pushfirst!(chain, data)
+        get(data, :kind, :base) == :base && break
+        path = data[:parent]
+    end
+    base, latest = chain[1], chain[end]
+    loaded_state, loaded_genotype_cache = latest[:state], latest[:genotype_cache]
+    if length(chain) > 1
+        # replay the entries added by each increment on top of the base
+        delta_entries = Dict(pop.id => lru_entries(getonly(d -> d isa DeltaCache, pop.data))
+                             for comp_pop in PopulationRetriever()(base[:state]), pop in comp_pop
+                             if any(d -> d isa DeltaCache, pop.data))
+        genotype_entries = lru_entries(base[:genotype_cache])
+        for inc in chain[2:end]
+            for comp_pop in PopulationRetriever()(inc[:state]), pop in comp_pop, d in pop.data
+                d isa LRUIncrement && merge!(get!(Dict{Int, Any}, delta_entries, pop.id), Dict(d.entries))
+            end
+            isnothing(inc[:genotype_cache]) || merge!(genotype_entries, Dict(inc[:genotype_cache].entries))
+        end
+        for comp_pop in PopulationRetriever()(loaded_state), pop in comp_pop
+            idx = findfirst(d -> d isa LRUIncrement, pop.data)
+            isnothing(idx) && continue
+            inc = pop.data[idx]
+            pop.data[idx] = rebuild_lru(DeltaCache(maxsize=inc.maxsize), inc, delta_entries[pop.id])
+        end
+        inc = loaded_genotype_cache
+        if !isnothing(inc)
+            loaded_genotype_cache = rebuild_lru(GenotypeCache(maxsize=inc.maxsize), inc, genotype_entries)
+        end
+    end
     for field in fieldnames(State)
         setfield!(state, field, getfield(loaded_state, field))
     end
-    if haskey(loaded_data, :weight_cache)
-        global weight_cache = loaded_data[:weight_cache]
+    # the next checkpoint starts a new chain from the restored state
+    delete!(checkpoint_chains, abspath(checkpointname))
+    # older checkpoints store the weight cache in the dict
+    isnothing(loaded_weight_cache) && (loaded_weight_cache = get(base, :weight_cache, nothing))
+    # a shared weight cache belongs to the run that wrote it, keep this run's own
+    if !isnothing(loaded_weight_cache) && !(loaded_weight_cache isa SharedWeightCache)
+        global weight_cache = loaded_weight_cache
     end
-    if haskey(loaded_data, :genotype_cache)
-        global genotype_cache = loaded_data[:genotype_cache]
+    if !isnothing(loaded_genotype_cache)
+        global genotype_cache = loaded_genotype_cache
     end
-    @info "Restored state from $checkpointname at generation $(generation(state))"
+    @info "Restored state from $checkpointname ($(length(chain)) files) at generation $(generation(state))"
 end
 
-function checkpoint(state::State, checkpointname::String)
+function checkpoint(state::State, checkpointname::String;
+        async::Bool=false, incremental::Bool=false, base_interval::Int=10, compress::Union{Nothing,String}=nothing)
     checkroot, ext = splitext(checkpointname)
     dash_gen = @sprintf "%05d" (generation(state)-1)
-    checkname_withgen = checkroot * "-" * dash_gen * ext
+    flush_h5_loggers()
+    chain = get!(checkpoint_chains, abspath(checkpointname)) do
+        atexit(wait_for_checkpoints)
+        CheckpointChain("", 0, Dict{String, Set{Int}}(), Set{Int}(), nothing)
+    end
+    # the previous checkpoint must be on disk before we link to it
+    isnothing(chain.task) || wait(chain.task)
 
-    data_to_save = Dict(
-        :state => state,
-        :weight_cache => fetch(@spawnat workers()[1] weight_cache),
-        :genotype_cache => genotype_cache
-    )
-    Serialization.serialize(checkname_withgen, data_to_save)
-    islink(checkpointname) && rm(checkpointname)
-    symlink(checkname_withgen, checkpointname)
-    @info "Serialized state to $checkpointname at generation $(generation(state))"
+    is_base = !incremental || isempty(chain.last_file) || chain.n_increments >= base_interval - 1
+    checkname_withgen = checkroot * "-" * dash_gen * (is_base ? "" : "-inc") * ext * compression_ext(compress)
+    # snapshot everything that later generations mutate before returning
+    gc = genotype_cache
+    bytes, delta_ids = serialize_checkpoint(state, Dict(
+        :kind => is_base ? :base : :increment,
+        :parent => chain.last_file,
+        :genotype_cache => is_base || isnothing(gc) ? gc : lru_increment(gc, chain.genotype_ids),
+    ), chain, !is_base)
+    chain.last_file = checkname_withgen
+    chain.n_increments = is_base ? 0 : chain.n_increments + 1
+    chain.delta_ids = delta_ids
+    chain.genotype_ids = isnothing(gc) ? Set{Int}() : Set(keys(gc))
+
+    write_checkpoint() = begin
+        tmp = checkname_withgen * ".tmp"
+        open(tmp, "w") do file
+            io = isnothing(compress) ? file : open(pipeline(`$compress -c`, stdout=file), "w")
+            Base.write(io, bytes)
+            # the weight cache is only a cache, any snapshot of it is valid
+            is_base && Serialization.serialize(io, fetch(@spawnat workers()[1] weight_cache))
+            io === file || (close(io); wait(io))
+        end
+        mv(tmp, checkname_withgen, force=true)
+        islink(checkpointname) && rm(checkpointname)
+        symlink(basename(checkname_withgen), checkpointname)  # relative to the link's directory
+        @info "Serialized state to $checkname_withgen at generation $(generation(state))"
+    end
+    if async
+        chain.task = errormonitor(@async write_checkpoint())
+    else
+        write_checkpoint()
+    end
 end
 
+"""
+    Checkpoint(checkpointname::String="./check.jls"; interval::Int, async::Bool=false, incremental::Bool=false, base_interval::Int=10, compress::Union{Nothing,String}=nothing)
+
+Every `interval` generations, writes the state, genotype cache and weight cache to `<checkpointname root>-<generation><ext>` and points a `checkpointname` symlink at it, see [`LoadCheckpoint`](@ref).
+
+With `async`, the state is serialized in memory and written to disk by a background task, so evolution continues while the file (and the weight cache of the first worker) is written. With `incremental`, only every `base_interval`-th checkpoint is a full base. The others (`-inc` files) store the [`DeltaCache`](@ref) and genotype cache entries added since the previous checkpoint in place of the full caches. `compress` pipes files through `"gzip"` or `"zstd"`.
+
+Only the caches are incremental: every checkpoint still serializes the rest of the state, including the phylogenetic trees and all populations, in memory on the main task before the operator returns, and base checkpoints serialize the full caches. `async` only takes the compression and disk write off the hot path. Phylogenetic indexes are not stored; they are rebuilt from the trees when first used after a restore.
+"""
 @define_op "Checkpoint"
-Checkpoint(checkpointname::String="./check.jls"; interval::Int,kwargs...) = create_op("Checkpoint",
+Checkpoint(checkpointname::String="./check.jls"; interval::Int, async::Bool=false, incremental::Bool=false,
+           base_interval::Int=10, compress::Union{Nothing,String}=nothing, kwargs...) = create_op("Checkpoint",
     condition=(state)-> (generation(state)-1) % interval == 0,
-    operator=(state,_)->checkpoint(state, checkpointname))
+    operator=(state,_)->checkpoint(state, checkpointname; async, incremental, base_interval, compress); kwargs...)
 
 
 @define_op "LoadCheckpoint" "AbstractOperator" "checkpointname:String"
-LoadCheckpoint(checkpointname::String="./check.jls"; kwargs...) = 
+LoadCheckpoint(checkpointname::String="./check.jls"; kwargs...) =
     create_op("LoadCheckpoint",checkpointname,
         condition=first_gen,
         updater =(state, _)->restore_from_checkpoint!(state, checkpointname),)
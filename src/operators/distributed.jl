@@ -17,6 +17,11 @@ function create_missing_workers(n::Int; slurm::Bool, c::Int, n_gpus::Int)
         "JULIA_CUDA_HARD_MEMORY_LIMIT"=>ENV["JULIA_CUDA_HARD_MEMORY_LIMIT"],
         "JULIA_CUDA_MEMORY_POOL"=>ENV["JULIA_CUDA_MEMORY_POOL"],
     ]
+    # workers must share the master's run directory, not pick their own
+    haskey(ENV, "JEVO_SHARED_WEIGHT_CACHE") && shared_weight_cache_dir()
+    for key in ("JEVO_SHARED_WEIGHT_CACHE", "JEVO_SHARED_WEIGHT_CACHE_RUN", "JEVO_SHARED_WEIGHT_CACHE_SIZE", "JEVO_SNAPSHOT_INTERVAL", "JEVO_SNAPSHOT_CACHE_SIZE", "JEVO_FACTORIZED_LAYERS", "JEVO_PHENOTYPE_CACHE_SIZE")
+        haskey(ENV, key) && push!(env, key=>ENV[key])
+    end
     if n_workers_to_add > 0
         if slurm 
             @info("adding $n_workers_to_add with $n_gpus")
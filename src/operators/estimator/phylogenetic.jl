@@ -27,14 +27,6 @@ struct RandomlySampledInteractions
     interactions::Vector{Tuple{Int, Int}}
 end
 
-struct QueueElement
-    indA::PhylogeneticNode
-    indB::PhylogeneticNode
-    dist::Int
-    caller::Union{QueueElement, Nothing} # Prevent infinite loops by never returning to the caller
-    add_B::Bool # Whether to add inds from tree B
-end
-
 struct RelatedOutcome
     """A related outcome is an interaction between two individuals, 
     and the distance to a query pair of individuals. Used for computing
@@ -144,33 +136,60 @@ function has_outcome(outcomes::AbstractDict{Int, <:AbstractDict{Int, Float64}},
     return ida ∈ keys(outcomes) && idb ∈ keys(outcomes[ida])
 end
 
+evaluated_ids(individual_outcomes::AbstractDict{Int, <:AbstractDict{Int, Float64}}) =
+    [id for (id, outcomes) in individual_outcomes if !isempty(outcomes)]
+
+function evaluated_by_ancestor(index::PhylogeneticIndex, evaluated::Vector{Int}, max_dist::Int)
+    """Buckets each evaluated individual in the tree of `index` under itself and its
+    ancestors up to `max_dist` generations back, as (id, generations down) sorted
+    by generations down."""
+    buckets = Dict{Int, Vector{Tuple{Int, Int}}}()
+    for id in evaluated
+        haskey(index.depth, id) || continue
+        ancestor = id
+        for down in 0:max_dist
+            push!(get!(Vector{Tuple{Int, Int}}, buckets, ancestor), (id, down))
+            ancestor = index.parent[ancestor]
+            ancestor == -1 && break
+        end
+    end
+    foreach(bucket -> sort!(bucket, by=last), values(buckets))
+    buckets
+end
+
+function nearby_evaluated(index::PhylogeneticIndex, id::Int, buckets::Dict{Int, Vector{Tuple{Int, Int}}}, max_dist::Int)
+    """Returns (id, distance) for each evaluated individual in the tree of `index` that
+    is within `max_dist` of `id`, nearest first, given the `evaluated_by_ancestor` buckets.
+    Only the buckets of the ancestors of `id` up to `max_dist` back are visited, so the
+    cost scales with the neighbourhood rather than the number of evaluated individuals."""
+    near = Dict{Int, Int}()
+    ancestor = id
+    for up in 0:max_dist
+        for (other_id, down) in get(buckets, ancestor, Tuple{Int, Int}[])
+            up + down > max_dist && break
+            # first reached through the lowest common ancestor, the nearest path
+            haskey(near, other_id) || (near[other_id] = up + down)
+        end
+        ancestor = index.parent[ancestor]
+        ancestor == -1 && break
+    end
+    sort!([(other_id, dist) for (other_id, dist) in near], by=last)
+end
+
 function find_k_nearest_interactions(
     ida::Int,
     idb::Int,
-    pta::PhylogeneticTree,
-    ptb::PhylogeneticTree,
+    near_a::Vector{Tuple{Int, Int}},
+    near_b::Dict{Int, Int},
     individual_outcomes::AbstractDict{Int, <:AbstractDict{Int, Float64}},
     k::Int;
     max_dist::Int)
-    """Find the k nearest interactions to `ida,idb` in `individual_outcomes`
-    by searching over the trees in `pta` and `ptb`.
-
-    This algorithm can also be thought of as a "Dual-Breadth-First-Search", in that
-    it traverses two trees, one pair of nodes at a time. To avoid reaching the same
-    pair from two different directions, we only search nodes in tree B when the
-    current pair was added from a search in tree A.
+    """Find the k nearest interactions to `ida,idb` in `individual_outcomes`, given
+    the evaluated individuals near `ida` in tree A (`near_a`, sorted by distance) and
+    near `idb` in tree B (`near_b`, id => distance).
 
-    Arguments:
-    =========
-    id1, id2: Int
-        The ids of the individuals to find the nearest interactions for
-    pta, ptb: PhylogeneticTree
-        The phylogenetic trees to search over. id1 must be in pta and id2 must be in ptb
-    individual_outcomes: Dict{Int, SortedDict{Int, Float64}}
-        A dictionary mapping individual ids to a sorted dictionary of interactions
-        and their outcomes. Contains evaluated interactions.
-    k: Int
-        The number of nearest interactions to find
+    The distance between two pairs is the sum of the tree distances between their
+    A and B individuals. Ties are broken by ids, so results are deterministic.
 
     Returns:
     ========
@@ -179,88 +198,78 @@ function find_k_nearest_interactions(
         for testing purposes and code-reuse. We can compute different types of weighted
         averages from this vector.
     """
-    @assert ida ∈ keys(pta.tree) "id1 $(ida) not in tree A"
-    @assert idb ∈ keys(ptb.tree) "id2 $(idb) not in tree B"
-    k_nearest_interactions = Vector{RelatedOutcome}()
-
-    # Initialize the search at the interaction
-    n1 = pta.tree[ida]
-    n2 = ptb.tree[idb]
-    # Check if the interaction is already in the dictionary
-    if  n2.id in keys(individual_outcomes[n1.id]) && 
-        n1.id in keys(individual_outcomes[n2.id])
-        error("Interaction $(n1.id),$(n2.id) already in dictionary")
+    if has_outcome(individual_outcomes, ida, idb) && has_outcome(individual_outcomes, idb, ida)
+        error("Interaction $(ida),$(idb) already in dictionary")
     end
-    queue = [QueueElement(n1, n2, 0, nothing, true)]
-    iters = 0
-    while length(queue) > 0
-        el = popfirst!(queue)
-        el.dist > max_dist && break
-        iters += 1
-        ids = (el.indA.id, el.indB.id)
-        # If the interaction is in the set of outcomes, add it to the list and break if we have enough
-        # @assert ids[1] in keys(individual_outcomes) "id1 $(ids[1]) not in individual_outcomes"
-        # @assert ids[2] in keys(individual_outcomes) "id2 $(ids[2]) not in individual_outcomes"
-
-        outcomes1 = get(individual_outcomes[ids[1]], ids[2], nothing)
-        if !isnothing(outcomes1)
-            outcomes2 = get(individual_outcomes[ids[2]], ids[1], nothing)
-            if !isnothing(outcomes2)
-                push!(k_nearest_interactions, RelatedOutcome(ids[1], ids[2], el.dist, outcomes1, outcomes2))
-                length(k_nearest_interactions) >= k && break
-            end
-        end
-
-        # Add parent interactions to queue first, as they are more likely to be found:
-        # 1. Results from previous generations can be cached
-        # 2. For "all vs best" or "all vs parents", we expect parent interactions to 
-        #    occur more frequently than child interactions
-
-        # Add Parent of a
-        if (isnothing(el.caller) || el.indA.parent != el.caller.indA) && !isnothing(el.indA.parent)
-            push!(queue, QueueElement(el.indA.parent, el.indB, el.dist+1, el, false))
-        end
-        # Add Parent of b if we are supposed to search on the B tree
-        if (isnothing(el.caller) || el.indB.parent != el.caller.indB) && !isnothing(el.indB.parent) && el.add_B
-            push!(queue, QueueElement(el.indA, el.indB.parent, el.dist+1, el, true))
-        end
-
-        # Add children of A
-        for neiA in el.indA.children
-            !isnothing(el.caller) && neiA == el.caller.indA && continue
-            push!(queue, QueueElement(neiA, el.indB, el.dist+1, el, false))
-        end
-        # Add children of B if we are supposed to search on the B tree
-        el.add_B || continue
-        for neiB in el.indB.children
-            !isnothing(el.caller) &&  neiB == el.caller.indB && continue
-            push!(queue, QueueElement(el.indA, neiB, el.dist+1, el, true))
+    k_nearest_interactions = Vector{RelatedOutcome}()
+    for (a, dist_a) in near_a
+        for (b, outcomea) in individual_outcomes[a]
+            dist_b = get(near_b, b, nothing)
+            (isnothing(dist_b) || dist_a + dist_b > max_dist) && continue
+            outcomeb = get(individual_outcomes[b], a, nothing)
+            isnothing(outcomeb) && continue
+            push!(k_nearest_interactions, RelatedOutcome(a, b, dist_a + dist_b, outcomea, outcomeb))
         end
     end
     0 == length(k_nearest_interactions) && error("Found 0 interactions for $(ida),$(idb)")
-    return k_nearest_interactions
+    sort!(k_nearest_interactions, by=r->(r.dist, r.ida, r.idb))
+    resize!(k_nearest_interactions, min(k, length(k_nearest_interactions)))
+end
+
+function find_k_nearest_interactions(
+    ida::Int,
+    idb::Int,
+    pta::PhylogeneticTree,
+    ptb::PhylogeneticTree,
+    individual_outcomes::AbstractDict{Int, <:AbstractDict{Int, Float64}},
+    k::Int;
+    max_dist::Int)
+    """Find the k nearest interactions to `ida,idb` in `individual_outcomes`
+    by indexing the trees in `pta` and `ptb`. id1 must be in pta and id2 must be in ptb.
+    Use `compute_estimates` to share the index and neighborhoods across many pairs."""
+    @assert ida ∈ keys(pta.tree) "id1 $(ida) not in tree A"
+    @assert idb ∈ keys(ptb.tree) "id2 $(idb) not in tree B"
+    evaluated = evaluated_ids(individual_outcomes)
+    indexa, indexb = PhylogeneticIndex(pta), PhylogeneticIndex(ptb)
+    near_a = nearby_evaluated(indexa, ida, evaluated_by_ancestor(indexa, evaluated, max_dist), max_dist)
+    near_b = Dict(nearby_evaluated(indexb, idb, evaluated_by_ancestor(indexb, evaluated, max_dist), max_dist))
+    find_k_nearest_interactions(ida, idb, near_a, near_b, individual_outcomes, k, max_dist=max_dist)
 end
 
 function compute_estimates(
     pairs::Vector{Tuple{Int, Int}},
-    treeA::PhylogeneticTree,
-    treeB::PhylogeneticTree,
+    indexa::PhylogeneticIndex,
+    indexb::PhylogeneticIndex,
     individual_outcomes::AbstractDict{Int, <:AbstractDict{Int, Float64}};
     k::Int,
     max_dist::Int)
     """For each pair of individuals in `pairs`, find the k nearest interactions
-    in `individual_outcomes` and compute the weighted average outcome. 
+    in `individual_outcomes` and compute the weighted average outcome. The evaluated
+    individuals near each id are found once and shared by all pairs containing it.
 
     Returns:
     ========
     estimates: Vector{EstimatedOutcome}
         A vector of EstimatedOutcome objects for each pair of individuals in `pairs`
     """
-    estimates = Vector{EstimatedOutcome}(undef, length(pairs))
+    evaluated = evaluated_ids(individual_outcomes)
+    buckets_a = evaluated_by_ancestor(indexa, evaluated, max_dist)
+    buckets_b = indexb === indexa ? buckets_a : evaluated_by_ancestor(indexb, evaluated, max_dist)
+    ids_a, ids_b = unique(first.(pairs)), unique(last.(pairs))
+    near_a = Vector{Vector{Tuple{Int, Int}}}(undef, length(ids_a))
+    near_b = Vector{Dict{Int, Int}}(undef, length(ids_b))
+    Threads.@threads for i in eachindex(ids_a)
+        near_a[i] = nearby_evaluated(indexa, ids_a[i], buckets_a, max_dist)
+    end
+    Threads.@threads for i in eachindex(ids_b)
+        near_b[i] = Dict(nearby_evaluated(indexb, ids_b[i], buckets_b, max_dist))
+    end
+    near_a, near_b = Dict(zip(ids_a, near_a)), Dict(zip(ids_b, near_b))
 
+    estimates = Vector{EstimatedOutcome}(undef, length(pairs))
     Threads.@threads for i in eachindex(pairs)
         (ida, idb) = pairs[i]
-        nearest = find_k_nearest_interactions(ida, idb, treeA, treeB, individual_outcomes, k, max_dist=max_dist)
+        nearest = find_k_nearest_interactions(ida, idb, near_a[ida], near_b[idb], individual_outcomes, k, max_dist=max_dist)
         estimates[i] = EstimatedOutcome(ida, idb, nearest)
     end
     return estimates
@@ -290,9 +299,9 @@ function estimate!(state::State, pops::Vector{Population}, k::Int, max_dist::Int
     popb.data = filter(x->!(x isa RandomlySampledInteractions && x.other_pop_id == popa.id), popb.data)
 
 
-    # get trees for each pop
-    treea = getonly(x->x isa PhylogeneticTree, popa.data)
-    treeb = getonly(x->x isa PhylogeneticTree, popb.data)
+    # get phylogenetic indexes for each pop
+    indexa = get_phylogenetic_index(popa)
+    indexb = get_phylogenetic_index(popb)
 
     individual_outcomes = Dict{Int, Dict{Int, Float64}}()
 
@@ -390,8 +399,8 @@ function estimate!(state::State, pops::Vector{Population}, k::Int, max_dist::Int
     # Estimate sampled interactions
     sample_estimates::Vector{EstimatedOutcome} = compute_estimates(
         sampled_interactions,
-        treea,
-        treeb,
+        indexa,
+        indexb,
         nonlocking_cache,
         k=k, max_dist=max_dist)
 
@@ -417,8 +426,8 @@ function estimate!(state::State, pops::Vector{Population}, k::Int, max_dist::Int
     # Compute estimates for all unevaluated interactions
     estimates = compute_estimates(
                             unevaluated_interactions,
-                            treea,
-                            treeb,
+                            indexa,
+                            indexb,
                             nonlocking_cache,
                             k=k, max_dist=max_dist)
     estimated_individual_outcomes = estimates_to_outcomes(estimates)
@@ -113,12 +113,12 @@ create_op(name::String, additional_fields...; kwargs...) = create_op(eval(Symbol
 """
     ClearInteractionsAndRecords(;kwargs...)
 
-Clears all interactions and records from all individuals in the state.
+Clears all interactions and records from all individuals in the state, and empties the phenotype cache of every process (see [`get_phenotype_cache`](@ref)), so individuals are developed at most once per generation on each worker.
 """
 @define_op "ClearInteractionsAndRecords"
 ClearInteractionsAndRecords(;kwargs...) = create_op("ClearInteractionsAndRecords",
           retriever=get_individuals,
-          updater=map((_,ind)->reset_individual!(ind)); kwargs...)
+          updater=(_,inds)->(foreach(reset_individual!, inds); clear_phenotype_caches!()); kwargs...)
 
 @define_op "GenerationIncrementer"
 
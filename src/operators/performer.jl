@@ -1,12 +1,12 @@
 export Performer
 
 """
-            Performer <: AbstractOperator
+            Performer(; chunk_size::Int=1, memoize::Bool=false, memo_size::Int=10_000, kwargs...) <: AbstractOperator
 
-Runs all matches in state.matches, and adds interactions to the individuals in the matches. This operator is intended to be used after a MatchMaker has created matches.
+Runs all matches in state.matches, and adds interactions to the individuals in the matches. This operator is intended to be used after a MatchMaker has created matches. Matches are scheduled on workers in chunks of `chunk_size`. With `memoize`, matches of unchanged individuals in deterministic environments reuse their previous interactions. See [`ComputeInteractions!`](@ref).
 """
 @define_op "Performer"
-Performer(;kwargs...) = create_op("Performer", 
+Performer(; chunk_size::Int=1, memoize::Bool=false, memo_size::Int=10_000, kwargs...) = create_op("Performer", 
             retriever=(state::AbstractState, _) -> state.matches,
             operator=(_, matches)->(@assert !isempty(matches) "No matches to perform"; matches),
-            updater=ComputeInteractions!(); kwargs...)
+            updater=ComputeInteractions!(; chunk_size, memoize, memo_size); kwargs...)
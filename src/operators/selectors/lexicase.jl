@@ -27,27 +27,80 @@ function fast_max_filter!(source_idxs::Vector{Int},
     return n_target_idxs
 end
 
-function lexicase_sample(
+# Selects one index using preallocated buffers. `test_idxs` must hold a permutation
+# of the tests; it is shuffled lazily (Fisher-Yates), so each draw is O(1) and tests
+# are only shuffled as far as the selection gets.
+function lexicase_sample!(
     rng::AbstractRNG,
     outcomes::Matrix{Float64},
-    ϵ::Vector{Float64})
+    ϵ::Vector{Float64},
+    source_idxs::Vector{Int},
+    target_idxs::Vector{Int},
+    test_idxs::Vector{Int})
 
-    source_idxs = collect(1:size(outcomes, 1))
-    target_idxs = Vector{Int}(undef, length(source_idxs))
     n_source_idxs = length(source_idxs)
-    test_idxs = Set(1:size(outcomes, 2))
-
-    while n_source_idxs > 1 && length(test_idxs) > 0
+    for i in 1:n_source_idxs
+        @inbounds source_idxs[i] = i
+    end
+    n_tests = length(test_idxs)
+    k = 0
+    while n_source_idxs > 1 && k < n_tests
         # sample a test case without replacement
-        rand_test_idx = pop!(test_idxs, rand(rng, test_idxs))
+        k += 1
+        j = rand(rng, k:n_tests)
+        @inbounds test_idxs[k], test_idxs[j] = test_idxs[j], test_idxs[k]
+        @inbounds rand_test_idx = test_idxs[k]
         # out of the remaining ids, choose the ones that have the best fitness on the test case
         n_source_idxs = @inline fast_max_filter!(source_idxs, n_source_idxs, target_idxs, outcomes, ϵ[rand_test_idx], rand_test_idx)
         # swap source and target ids
         source_idxs, target_idxs = target_idxs, source_idxs
     end
     # There is either one id left, or no test cases left. For both cases we can choose one at random
-    @assert all(source_idxs[1:n_source_idxs] .<= size(outcomes, 1))
-    rand(rng, source_idxs[1:n_source_idxs])
+    @inbounds source_idxs[rand(rng, 1:n_source_idxs)]
+end
+
+function lexicase_sample(
+    rng::AbstractRNG,
+    outcomes::Matrix{Float64},
+    ϵ::Vector{Float64})
+    n_inds, n_tests = size(outcomes)
+    lexicase_sample!(rng, outcomes, ϵ, Vector{Int}(undef, n_inds), Vector{Int}(undef, n_inds), collect(1:n_tests))
+end
+
+"""
+    lexicase_sample(rng::AbstractRNG, outcomes::Matrix{Float64}, ϵ::Vector{Float64}, n::Int; threaded::Bool=false)
+
+Draws `n` independent (ϵ-)lexicase selections from `outcomes` (individuals × tests) and returns the selected row indices.
+
+Index and test buffers are allocated once per thread and reused across selections. Each selection uses its own `StableRNG` seeded from `rng`, so results are the same with or without `threaded` and for any number of threads. Outcomes are read one test column at a time, which is contiguous in memory.
+"""
+function lexicase_sample(
+    rng::AbstractRNG,
+    outcomes::Matrix{Float64},
+    ϵ::Vector{Float64},
+    n::Int;
+    threaded::Bool=false)
+    n == 0 && return Int[]
+    seeds = [rand(rng, UInt) for _ in 1:n]
+    selected = Vector{Int}(undef, n)
+    n_chunks = threaded ? min(n, Threads.nthreads()) : 1
+    chunks = collect(Iterators.partition(1:n, cld(n, max(n_chunks, 1))))
+    sample_chunk(idxs) = begin
+        n_inds, n_tests = size(outcomes)
+        source_idxs, target_idxs = Vector{Int}(undef, n_inds), Vector{Int}(undef, n_inds)
+        test_idxs = collect(1:n_tests)
+        for i in idxs
+            selected[i] = lexicase_sample!(StableRNG(seeds[i]), outcomes, ϵ, source_idxs, target_idxs, test_idxs)
+        end
+    end
+    if threaded
+        Threads.@threads for chunk in chunks
+            sample_chunk(chunk)
+        end
+    else
+        foreach(sample_chunk, chunks)
+    end
+    selected
 end
 
 """
@@ -56,17 +109,17 @@ end
         ϵ::Bool  # whether to perform epsilon-lexicase selection (for continuous domains)
     end
 
-Updates the population with selected individuals using (ϵ)-lexicase selection[1]
+Updates the population with selected individuals using (ϵ)-lexicase selection[1]. All parents are drawn in one batch, see [`lexicase_sample`](@ref); with `threaded=true` the selections are spread over threads.
 
 [1] A probabilistic and multi-objective analysis of lexicase selection and ε-lexicase selection. La Cava et al (2019)
 """
 @define_op "LexicaseSelectorAndReproducer" "AbstractOperator"
-LexicaseSelectorAndReproducer(pop_size::Int, ids::Vector{String}=String[]; ϵ::Bool=false, elitism::Bool=false, selection_only::Bool=false, keep_all_parents::Bool=false, h5::Bool=false, kwargs...) =
+LexicaseSelectorAndReproducer(pop_size::Int, ids::Vector{String}=String[]; ϵ::Bool=false, elitism::Bool=false, selection_only::Bool=false, keep_all_parents::Bool=false, h5::Bool=false, threaded::Bool=false, kwargs...) =
     create_op("LexicaseSelectorAndReproducer",
                     retriever=PopulationRetriever(ids),
-                    updater=map(map((s,p)->lexicase_select!(s,p,pop_size,ϵ, elitism, selection_only, keep_all_parents, h5))),
+                    updater=map(map((s,p)->lexicase_select!(s,p,pop_size,ϵ, elitism, selection_only, keep_all_parents, h5, threaded))),
                     ;kwargs...)
-function lexicase_select!(state::AbstractState, pop::Population, pop_size::Int, ϵ::Bool, elitism::Bool, selection_only::Bool, keep_all_parents::Bool, h5::Bool)
+function lexicase_select!(state::AbstractState, pop::Population, pop_size::Int, ϵ::Bool, elitism::Bool, selection_only::Bool, keep_all_parents::Bool, h5::Bool, threaded::Bool=false)
     @assert !selection_only || elitism "You probably don't want to use selection_only without elitism"
     @assert !(selection_only && keep_all_parents) "You probably don't want to use selection_only and keep_all_parents"
     @assert pop_size > 0                           "pop_size must be greater than 0"
@@ -87,8 +140,9 @@ function lexicase_select!(state::AbstractState, pop::Population, pop_size::Int,
     end
 
     # now that we have our outcomes, lexicase select
-    for _ in start_ind:pop_size
-        new_ind =  pop.individuals[lexicase_sample(state.rng, outcomes, ϵ)]
+    n_selections = max(pop_size - start_ind + 1, 0)
+    for idx in lexicase_sample(state.rng, outcomes, ϵ, n_selections; threaded)
+        new_ind = pop.individuals[idx]
         if !selection_only || new_ind ∉ new_pop
             @inline push!(new_pop, new_ind)
         end
@@ -21,36 +21,112 @@ function dominates(a::AbstractVector, b::AbstractVector)
     return all(a .>= b) && any(a .> b)
 end
 
-function nsga2(outcomes::Matrix{Float64}, p::Int, gen=nothing)
+"""
+    weak_dominance_bits(outcomes::Matrix{Float64}) -> Matrix{UInt64}
+
+Bitset dominance matrix of the rows of `outcomes`: bit `j` of column `i` is set iff individual `i` is `>=` individual `j` on every objective. For each objective, individuals are visited in increasing order and each column is intersected with the set of individuals visited so far, 64 individuals per word, so the cost is O(M N²/64) with no allocations per comparison.
+"""
+function weak_dominance_bits(outcomes::Matrix{Float64})
     N, n_obj = size(outcomes)
-    
-    # Initialize domination sets and counts.
-    S = [Int[] for _ in 1:N]
+    @assert n_obj > 0 "NSGA-II needs at least one objective"
+    n_words = cld(N, 64)
+    bits = fill(typemax(UInt64), n_words, N)
+    seen = zeros(UInt64, n_words)
+    order = collect(1:N)
+    for m in 1:n_obj
+        col = view(outcomes, :, m)
+        sortperm!(order, col)
+        fill!(seen, 0)
+        k = 1
+        while k <= N
+            # mark every individual tied with order[k] as seen before intersecting
+            last = k
+            while last < N && col[order[last+1]] == col[order[k]]
+                last += 1
+            end
+            for t in k:last
+                j = order[t]
+                @inbounds seen[((j - 1) >> 6) + 1] |= UInt64(1) << ((j - 1) & 63)
+            end
+            for t in k:last
+                i = order[t]
+                for w in 1:n_words
+                    @inbounds bits[w, i] &= seen[w]
+                end
+            end
+            k = last + 1
+        end
+    end
+    bits
+end
+
+# whether i weakly dominates j
+@inline weakly_dominates(bits::Matrix{UInt64}, i::Int, j::Int) =
+    @inbounds (bits[((j - 1) >> 6) + 1, i] >> ((j - 1) & 63)) & 1 == 1
+
+# index of the lowest set bit of `word`, the `w`-th word of a dominance column
+@inline lowest_bit_index(word::UInt64, w::Int) = (w - 1) * 64 + trailing_zeros(word) + 1
+
+"""
+    crowding_distances(outcomes::Matrix{Float64}, fronts::Vector{Vector{Int}})
+
+NSGA-II crowding distance of every individual within its front. The extremes of each objective get `Inf`. Each front and objective is sorted once into reused buffers.
+"""
+function crowding_distances(outcomes::Matrix{Float64}, fronts::Vector{Vector{Int}})
+    distances = zeros(Float64, size(outcomes, 1))
+    vals, perm = Float64[], Int[]
+    for front in fronts
+        l = length(front)
+        l == 0 && continue
+        resize!(vals, l)
+        resize!(perm, l)
+        for m in axes(outcomes, 2)
+            for (t, i) in enumerate(front)
+                @inbounds vals[t] = outcomes[i, m]
+            end
+            # For maximization, sort descending. Stable, so ties keep their order in the front.
+            sortperm!(perm, vals, rev=true)
+            distances[front[perm[1]]] = Inf
+            distances[front[perm[end]]] = Inf
+            range = vals[perm[1]] - vals[perm[end]]
+            range == 0 && continue
+            for k in 2:(l-1)
+                @inbounds distances[front[perm[k]]] += (vals[perm[k-1]] - vals[perm[k+1]]) / range
+            end
+        end
+    end
+    distances
+end
+
+############################
+# PERFORMANCE CRITICAL START (measured)
+function nsga2(outcomes::Matrix{Float64}, p::Int, gen=nothing)
+    N = size(outcomes, 1)
+    @assert !any(isnan, outcomes) "NSGA-II outcomes contain NaN"
+    bits = weak_dominance_bits(outcomes)
+
+    # Count how many individuals dominate each individual. Individuals with equal
+    # outcomes never dominate each other; of those that are non-dominated, only the
+    # lowest index enters the first front.
     n = zeros(Int, N)
+    has_lower_equal = falses(N)
     rank = zeros(Int, N)
-    fronts = Vector{Vector{Int}}()
-    push!(fronts, Int[])
-    
-    # Compute domination relationships.
-    for i in 1:N
-        equal = Vector{Int}()
-        for j in 1:N
-            if i == j
-                continue
-            end
-            if dominates(outcomes[i, :], outcomes[j, :])
-                push!(S[i], j)
-            elseif dominates(outcomes[j, :], outcomes[i, :])
+    for j in 1:N, w in axes(bits, 1)
+        @inbounds word = bits[w, j]
+        while word != 0
+            i = lowest_bit_index(word, w)
+            word &= word - 1
+            i == j && continue
+            if weakly_dominates(bits, i, j)
+                j < i && (has_lower_equal[i] = true)
+            else
                 n[i] += 1
-            elseif outcomes[i, :] == outcomes[j, :]
-                push!(equal, j)
             end
         end
-        if n[i] == 0 && (isempty(equal) || i < minimum(equal))
-            rank[i] = 1
-            push!(fronts[1], i)
-        end
     end
+    fronts = Vector{Vector{Int}}()
+    push!(fronts, [i for i in 1:N if n[i] == 0 && !has_lower_equal[i]])
+    rank[fronts[1]] .= 1
     @assert length(fronts[1]) > 0 "No individuals found in the first front"
     if !isnothing(gen) 
         m = Measurement("n_pareto_front", length(fronts[1]), gen)
@@ -62,8 +138,13 @@ function nsga2(outcomes::Matrix{Float64}, p::Int, gen=nothing)
     currentFront = 1
     while !isempty(fronts[currentFront])
         Q = Int[]
-        for i in fronts[currentFront]
-            for j in S[i]
+        # visit the individuals each one dominates in increasing order
+        for i in fronts[currentFront], w in axes(bits, 1)
+            @inbounds word = bits[w, i]
+            while word != 0
+                j = lowest_bit_index(word, w)
+                word &= word - 1
+                (j == i || weakly_dominates(bits, j, i)) && continue
                 n[j] -= 1
                 if n[j] == 0
                     rank[j] = currentFront + 1
@@ -79,35 +160,12 @@ function nsga2(outcomes::Matrix{Float64}, p::Int, gen=nothing)
         currentFront += 1
     end
     
-    # Crowding distance assignment.
-    distances = zeros(Float64, N)
-    for front in fronts
-        l = length(front)
-        if l == 0
-            continue
-        end
-        for i in front
-            distances[i] = 0.0
-        end
-        for m in 1:n_obj
-            # For maximization, sort descending.
-            sorted_front = sort(front, by = i -> outcomes[i, m], rev = true)
-            distances[sorted_front[1]] = Inf
-            distances[sorted_front[end]] = Inf
-            obj_max = outcomes[sorted_front[1], m]
-            obj_min = outcomes[sorted_front[end], m]
-            range = obj_max - obj_min
-            if range == 0
-                continue
-            end
-            for k in 2:(l-1)
-                distances[sorted_front[k]] += (outcomes[sorted_front[k-1], m] - outcomes[sorted_front[k+1], m]) / range
-            end
-        end
-    end
+    distances = crowding_distances(outcomes, fronts)
 
     # Sort individuals by increasing rank and, within same rank, by descending crowding distance.
     sorted_indices = sort(1:N, by = i -> (rank[i], -distances[i]))
     
     return sorted_indices[1:p]
 end
+# PERFORMANCE CRITICAL END (measured)
+############################
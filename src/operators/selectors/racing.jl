@@ -0,0 +1,153 @@
+export SuccessiveHalvingSelector
+"""
+    SuccessiveHalvingSelector(k::Int, ids::Vector{String}=String[]; eta::Int=2, min_episodes::Int=1, rungs=nothing, early_abort::Bool=false, max_step_reward::Real=Inf, env_creator=nothing, kwargs...)
+
+Races the individuals of a population through solo episodes and keeps the `k` best, allocating more episodes to the individuals that stay in the race. Rung `r` plays `episodes` more episodes of every remaining individual and keeps the `keep` with the highest mean episode return over all of their episodes so far, so scores are comparable across rungs. `rungs` is a vector of `(episodes, keep)` tuples whose last `keep` is `k`, e.g. `[(2, 32), (4, 8)]` plays two episodes of every individual, keeps 32, plays four more of each and keeps 8. By default, each rung keeps `1/eta` of the individuals (and at least `k`) and plays `eta` times as many episodes as the previous one, starting from `min_episodes`. Episodes are solo matches in `env_creator`, or the state's only environment creator.
+
+Survivors keep their interactions and get a single [`Record`](@ref) with their mean episode return, as if truncated by [`TruncationSelector`](@ref) after a [`ScalarFitnessEvaluator`](@ref).
+
+With `early_abort`, which requires a finite `max_step_reward`, an episode stops once its individual provably can't be kept, i.e. when even `max_step_reward` on every remaining `step!` (see [`remaining_steps`](@ref)) and `max_step_reward` times the episode length on each of its unfinished episodes can't lift its mean to the rung's cutoff. The cutoff is the `keep`-th best mean of individuals that already finished the rung, which can only rise as more finish, so aborting never changes who is kept. The other episodes of an aborted individual are skipped.
+
+Logs `Racing.Rung<r>.Score` (mean episode returns of the individuals that finished rung `r`), `Racing.Rung<r>.Cutoff`, `Racing.Rung<r>.Steps` and `Racing.Rung<r>.Aborted` (aborted or skipped episodes), and the total `Racing.Steps` per generation.
+"""
+@define_op "SuccessiveHalvingSelector" "AbstractSelector"
+SuccessiveHalvingSelector(k::Int, ids::Vector{String}=String[]; eta::Int=2, min_episodes::Int=1, rungs=nothing,
+                          early_abort::Bool=false, max_step_reward::Real=Inf, env_creator=nothing, kwargs...) =
+    create_op("SuccessiveHalvingSelector",
+              retriever=PopulationRetriever(ids),
+              updater=map((s,p)->successive_halving!(s, p, k; eta, min_episodes, rungs, early_abort,
+                                                     max_step_reward=Float64(max_step_reward), env_creator))
+              ;kwargs...)
+
+function halving_rungs(n::Int, k::Int, eta::Int, min_episodes::Int)
+    @assert eta > 1 "eta must be greater than 1"
+    rungs, episodes = Tuple{Int, Int}[], min_episodes
+    while n > k
+        n = max(k, n ÷ eta)
+        push!(rungs, (episodes, n))
+        episodes *= eta
+    end
+    rungs
+end
+
+# Plays one solo episode and stops early once even `max_step_reward` on every remaining
+# step can't lift its return to `threshold`. Returns the interactions, the return,
+# the number of steps and whether the episode was aborted.
+function race_episode(match::AbstractMatch, threshold::Float64, max_step_reward::Float64)
+    lock(Jevo.get_env_lock()) do
+        phenotypes = develop_cached.(match.individuals)
+        ids = [ind.id for ind in match.individuals]
+        env = match.environment_creator()
+        interactions, episode_return, n_steps = [], 0.0, 0
+        while true
+            new_interactions = step!(env, ids, phenotypes)
+            append!(interactions, new_interactions)
+            episode_return += sum(int.score for int in new_interactions; init=0.0)
+            n_steps += 1
+            done(env) && return interactions, episode_return, n_steps, false
+            bound = remaining_steps(env)
+            if !isnothing(bound) && episode_return + max_step_reward * bound < threshold
+                return interactions, episode_return, n_steps, true
+            end
+        end
+    end
+end
+
+# Plays the episodes of one rung, ordered by individual so that the cutoff is known early.
+# `returns` holds the returns of all finished episodes and `n_total` each individual's
+# number of episodes at the end of the rung. Returns the individuals whose episodes were
+# aborted, the number of steps and the number of aborted or skipped episodes.
+function race_rung!(matches::Vector{<:AbstractMatch}, returns::Dict{Int, Vector{Float64}}, n_total::Dict{Int, Int},
+                    keep::Int, early_abort::Bool, max_step_reward::Float64, max_episode_reward::Float64)
+    pending = Dict(id => n_total[id] - length(returns[id]) for id in keys(n_total))
+    eliminated, finished = Set{Int}(), Float64[]
+    cutoff, n_steps, n_aborted = -Inf, 0, 0
+    queue = collect(eachindex(matches))
+    @sync for wid in workers()
+        # tasks only switch at remotecall_fetch, so the race state is not raced on
+        @async while !isempty(queue)
+            match = matches[popfirst!(queue)]
+            id = match.individuals[1].id
+            if id ∈ eliminated
+                n_aborted += 1
+                pending[id] -= 1
+                continue
+            end
+            threshold = -Inf
+            if early_abort && cutoff > -Inf
+                # the individual's other unfinished episodes return at most max_episode_reward
+                n_other = pending[id] - 1
+                threshold = cutoff * n_total[id] - sum(returns[id]) - (n_other > 0 ? n_other * max_episode_reward : 0.0)
+            end
+            interactions, episode_return, steps, aborted = remotecall_fetch(race_episode, wid, match, threshold, max_step_reward)
+            add_interactions!(match, interactions)
+            n_steps += steps
+            pending[id] -= 1
+            if aborted
+                push!(eliminated, id)
+                n_aborted += 1
+            elseif id ∉ eliminated
+                push!(returns[id], episode_return)
+                if pending[id] == 0
+                    push!(finished, mean(returns[id]))
+                    length(finished) >= keep && (cutoff = partialsort(finished, keep, rev=true))
+                end
+            end
+        end
+    end
+    eliminated, n_steps, n_aborted
+end
+
+function successive_halving!(state::AbstractState, pops::Vector{Population}, k::Int;
+        eta::Int, min_episodes::Int, rungs, early_abort::Bool, max_step_reward::Float64, env_creator)
+    @assert k > 0                           "k must be greater than 0"
+    @assert length(pops) == 1               "Successive halving can only be applied to a single Population"
+    @assert !early_abort || isfinite(max_step_reward) "early_abort needs a finite max_step_reward, got $max_step_reward"
+    pop = pops[1]
+    @assert length(pop.individuals) > k "Population must have more individuals than k= $k to race, $(pop.id) has $(length(pop.individuals)) individuals."
+    if isnothing(env_creator)
+        env_creators = get_creators(AbstractEnvironment, state)
+        @assert length(env_creators) == 1 "There should be exactly one environment creator for the time being, found $(length(env_creators))."
+        env_creator = env_creators[1]
+    end
+    rungs = isnothing(rungs) ? halving_rungs(length(pop.individuals), k, eta, min_episodes) : rungs
+    @assert !isempty(rungs) && last(rungs[end]) == k "The last rung must keep k=$k individuals"
+    horizon = early_abort ? remaining_steps(env_creator()) : nothing
+    early_abort && isnothing(horizon) && @warn "remaining_steps is not defined for $(typeof(env_creator())), episodes will not be aborted"
+    max_episode_reward = isnothing(horizon) ? Inf : max_step_reward * horizon
+
+    gen = generation(state)
+    match_counter = get_counter(AbstractMatch, state)
+    returns = Dict(ind.id => Float64[] for ind in pop.individuals)
+    racers, total_steps = pop.individuals, 0
+    for (r, (episodes, keep)) in enumerate(rungs)
+        @assert 0 < keep <= length(racers) "Rung $r keeps $keep of $(length(racers)) individuals"
+        n_total = Dict(ind.id => length(returns[ind.id]) + episodes for ind in racers)
+        matches = [Match(inc!(match_counter), [ind], env_creator) for ind in racers for _ in 1:episodes]
+        eliminated, n_steps, n_aborted = race_rung!(matches, returns, n_total, keep,
+                                                    !isnothing(horizon), max_step_reward, max_episode_reward)
+        scores = [ind.id ∈ eliminated ? -Inf : mean(returns[ind.id]) for ind in racers]
+        racers = racers[sortperm(scores, rev=true)[1:keep]]
+        @assert all(ind -> ind.id ∉ eliminated, racers) "An aborted individual was kept, is max_step_reward an upper bound?"
+        total_steps += n_steps
+        h5_logging() || continue
+        m_score = StatisticalMeasurement("Racing.Rung$r.Score", filter(isfinite, scores), gen)
+        m_cutoff = Measurement("Racing.Rung$r.Cutoff", mean(returns[racers[end].id]), gen)
+        m_steps = Measurement("Racing.Rung$r.Steps", n_steps, gen)
+        m_aborted = Measurement("Racing.Rung$r.Aborted", n_aborted, gen)
+        @h5 m_score
+        @h5 m_cutoff
+        @h5 m_steps
+        @h5 m_aborted
+    end
+    if h5_logging()
+        m_total = Measurement("Racing.Steps", total_steps, gen)
+        @h5 m_total
+    end
+    for ind in racers
+        empty!(ind.records)
+        push!(ind.records, Record(ind.id, mean(returns[ind.id])))
+    end
+    pop.individuals = racers
+    total_steps
+end
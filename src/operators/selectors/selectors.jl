@@ -1,3 +1,4 @@
 include("./truncation.jl")
 include("./lexicase.jl")
 include("./nsgaii.jl")
+include("./racing.jl")
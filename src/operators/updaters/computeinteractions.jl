@@ -1,21 +1,170 @@
+# individual id => worker that last played it. That worker's genotype and weight
+# caches hold the individual's genome and tensors, which its children mostly reuse.
+const match_affinity = Dict{Int, Int}()
+
+play_chunk(matches::Vector{<:AbstractMatch}) = map(play, matches)
+
+function preferred_worker(match::AbstractMatch)
+    for ind in match.individuals
+        haskey(match_affinity, ind.id) && return match_affinity[ind.id]
+    end
+    for ind in match.individuals, pid in ind.parents
+        haskey(match_affinity, pid) && return match_affinity[pid]
+    end
+    nothing
+end
+
+# Splits the matches into per-worker queues of chunks. A match goes to the worker
+# that played its individuals or their parents, unless that worker already has
+# its share of matches, in which case it goes to the least loaded worker.
+function schedule_matches(matches::Vector{<:AbstractMatch}, wids::Vector{Int}, chunk_size::Int)
+    assigned = Dict(wid => Int[] for wid in wids)
+    cap = cld(length(matches), length(wids))
+    n_hits = 0
+    for (i, match) in enumerate(matches)
+        wid = preferred_worker(match)
+        if !isnothing(wid) && wid ∈ wids && length(assigned[wid]) < cap
+            n_hits += 1
+        else
+            wid = argmin(w -> length(assigned[w]), wids)
+        end
+        push!(assigned[wid], i)
+    end
+    queues = Dict(wid => [idxs[j:min(j + chunk_size - 1, end)] for j in 1:chunk_size:length(idxs)]
+                  for (wid, idxs) in assigned)
+    queues, n_hits
+end
+
 ############################
 # PERFORMANCE CRITICAL START (measured)
-function compute_interactions!(matches::Vector{<:AbstractMatch})
-    interactions_vec_vec = pmap(play, matches)  # each match returns multiple interactions
-    for (match, interactions_vec) in zip(matches, interactions_vec_vec), 
-        ind in unique(match.individuals),
-            int in interactions_vec
-                ind.id == int.individual_id && push!(ind.interactions, int)
+function play_matches(matches::Vector{<:AbstractMatch}; chunk_size::Int=1)
+    wids = workers()
+    queues, n_hits = schedule_matches(matches, wids, chunk_size)
+    interactions_vec_vec = Vector{Any}(undef, length(matches))  # each match returns multiple interactions
+    busy = Dict(wid => 0.0 for wid in wids)
+    n_stolen = 0
+    played_on = Dict{Int, Int}()
+    start = time()
+    @sync for wid in wids
+        @async while true
+            # tasks only switch at remotecall_fetch, so queues are not raced on
+            if !isempty(queues[wid])
+                chunk = popfirst!(queues[wid])
+            else
+                victim = argmax(w -> length(queues[w]), wids)
+                isempty(queues[victim]) && break
+                chunk = pop!(queues[victim])
+                n_stolen += 1
+            end
+            t = time()
+            interactions_vec_vec[chunk] = remotecall_fetch(play_chunk, wid, matches[chunk])
+            busy[wid] += time() - t
+            for i in chunk, ind in matches[i].individuals
+                played_on[ind.id] = wid
+            end
+        end
+    end
+    wall = time() - start
+    # only the last round predicts where the next generation's caches are warm
+    empty!(match_affinity)
+    merge!(match_affinity, played_on)
+    utilization = [busy[wid] / max(wall, eps()) for wid in wids]
+    interactions_vec_vec, utilization, n_stolen, n_hits
+end
+
+function add_interactions!(match::AbstractMatch, interactions_vec)
+    inds = Dict(ind.id => ind for ind in match.individuals)
+    for int in interactions_vec
+        ind = get(inds, int.individual_id, nothing)
+        !isnothing(ind) && push!(ind.interactions, int)
+    end
+end
+
+function compute_interactions!(matches::Vector{<:AbstractMatch}; chunk_size::Int=1)
+    interactions_vec_vec, utilization, n_stolen, n_hits = play_matches(matches; chunk_size)
+    for (match, interactions_vec) in zip(matches, interactions_vec_vec)
+        add_interactions!(match, interactions_vec)
     end
+    utilization, n_stolen, n_hits
 end
 # PERFORMANCE CRITICAL END (measured)
 ############################
+
+# Individuals keep their id only while their genotype is unchanged, so a match of
+# the same ids in the same environment replays the same interactions
+memo_key(match::AbstractMatch) = (objectid(match.environment_creator), [ind.id for ind in match.individuals])
+
 """
+    ComputeInteractions!(; chunk_size::Int=1, memoize::Bool=false, memo_size::Int=10_000)
+
+Plays every match and adds the resulting interactions to the individuals in the match.
+
+Matches are sent to workers in chunks of `chunk_size`, preferring the worker that last played the individual or one of its parents, since its caches already hold most of the individual's genome. Idle workers steal chunks from the back of the longest queue, so long episodes do not leave workers waiting. Per-worker utilization (busy time over wall time), the number of stolen chunks and the fraction of matches sent to their preferred worker are logged as `Performer.WorkerUtilization`, `Performer.StolenChunks` and `Performer.AffinityHits`, and phenotype cache hits and per-worker develop time (see [`get_phenotype_cache`](@ref)) as `Performer.PhenotypeCacheHits` and `Performer.DevelopTime` (`Performer<k>.` for the `k`-th call within a generation).
+
+With `memoize`, the interactions of matches in deterministic environments (see [`is_deterministic`](@ref)) are kept in an LRU of `memo_size` matches, keyed by the ids of the individuals and the environment creator. Matches of unchanged individuals, such as elites kept across generations, reuse them instead of being played again. Hits and misses are logged as `Performer.MemoHits` and `Performer.MemoMisses`.
 """
-struct ComputeInteractions! <: AbstractUpdater end
-function (updater::ComputeInteractions!)(::AbstractState, matches::Vector{M}) where M <: AbstractMatch
-    n_matches = length(matches)
-    compute_interactions!(matches)
+mutable struct ComputeInteractions! <: AbstractUpdater
+    chunk_size::Int
+    memo::Union{Nothing, LRU{Tuple{UInt, Vector{Int}}, Vector}}
+    generation::Int
+    n_calls::Int
+end
+function ComputeInteractions!(; chunk_size::Int=1, memoize::Bool=false, memo_size::Int=10_000)
+    @assert chunk_size > 0 "chunk_size must be positive"
+    memo = memoize ? LRU{Tuple{UInt, Vector{Int}}, Vector}(maxsize=memo_size) : nothing
+    ComputeInteractions!(chunk_size, memo, 0, 0)
+end
+
+function (updater::ComputeInteractions!)(state::AbstractState, matches::Vector{M}) where M <: AbstractMatch
+    n_matches = n_played = length(matches)
+    gen = generation(state)
+    updater.n_calls = updater.generation == gen ? updater.n_calls + 1 : 1
+    updater.generation = gen
+    prefix = updater.n_calls == 1 ? "Performer" : "Performer$(updater.n_calls)"
+    memo = updater.memo
+    if isnothing(memo)
+        utilization, n_stolen, n_hits = compute_interactions!(matches, chunk_size=updater.chunk_size)
+    else
+        to_play = M[]
+        memo_hits = 0
+        for match in matches
+            cached = is_deterministic(match.environment_creator) ? get(memo, memo_key(match), nothing) : nothing
+            if isnothing(cached)
+                push!(to_play, match)
+            else
+                add_interactions!(match, cached)
+                memo_hits += 1
+            end
+        end
+        interactions_vec_vec, utilization, n_stolen, n_hits = play_matches(to_play, chunk_size=updater.chunk_size)
+        memo_misses = 0
+        for (match, interactions_vec) in zip(to_play, interactions_vec_vec)
+            add_interactions!(match, interactions_vec)
+            is_deterministic(match.environment_creator) || continue
+            memo[memo_key(match)] = interactions_vec
+            memo_misses += 1
+        end
+        n_played = length(to_play)
+        if h5_logging()
+            m_memo_hits = Measurement("$prefix.MemoHits", memo_hits, gen)
+            m_memo_misses = Measurement("$prefix.MemoMisses", memo_misses, gen)
+            @h5 m_memo_hits
+            @h5 m_memo_misses
+        end
+    end
+    if h5_logging()
+        m_util = StatisticalMeasurement("$prefix.WorkerUtilization", utilization, gen)
+        m_stolen = Measurement("$prefix.StolenChunks", n_stolen, gen)
+        m_hits = Measurement("$prefix.AffinityHits", n_hits / max(n_played, 1), gen)
+        @h5 m_util
+        @h5 m_stolen
+        @h5 m_hits
+        develop_stats = [remotecall_fetch(phenotype_cache_stats, wid; reset=true) for wid in workers()]
+        m_pheno_hits = Measurement("$prefix.PhenotypeCacheHits", sum(st.n_hits for st in develop_stats), gen)
+        m_develop = StatisticalMeasurement("$prefix.DevelopTime", [st.develop_time for st in develop_stats], gen)
+        @h5 m_pheno_hits
+        @h5 m_develop
+    end
     empty!(matches)
     sizehint!(matches, n_matches)
     nothing
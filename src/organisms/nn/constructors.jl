@@ -101,7 +101,7 @@ end
 """
     add_delta_to_genome(genome::AbstractLayer delta::Delta; n_back=20) -> Layer
 
-Adds delta to genome, keeping track of the last `n_back` mutations from the full genome. Does not look at mutations before the last `n_back` mutations to save memory and time. Only valid for applying a child delta to a parent genome, behavior is undefined otherwise.
+Adds delta to genome, keeping track of the last `n_back` mutations from the full genome, or a few more so that the kept genes start on the snapshot grid of [`get_snapshot_interval`](@ref). Does not look at mutations before the last `n_back` mutations to save memory and time. Only valid for applying a child delta to a parent genome, behavior is undefined otherwise.
 
 Where `Base.:+(a::AbstractLayer, b::Delta)` adds a delta to the full genome on master, this function only adds the delta to a compact genome on workers for evaluation. This isn't great; we'd rather use Base.:+ for both purposes, but this is essential for performance.
 
@@ -130,7 +130,9 @@ function add_delta_to_genome(full_genome::AbstractLayer, delta::Delta; n_back=20
         wc.dims != wd.dims && @assert false "Different dimensions in compact network and delta"
         @assert isempty(wc.muts) || wc.muts[1].id < 0 "wc with dims $(wc.dims) not empty for type $(typeof(compact_genome)) and is not a fresh weight"
         @assert !isempty(wf.muts) "Full genome has weight with no mutations: $(visualize(full_genome))"
+        # start on the snapshot grid, so tail positions are absolute positions mod the interval
         start_idx = max(1, length(wf.muts)-n_back)
+        start_idx -= (start_idx - 1) % get_snapshot_interval()
         append!(wc.muts, wf.muts[start_idx:end]) # add last n_back muts from full genome
         append!(wc.muts, wd.muts)                # then add delta muts
         full_idx += 1
@@ -1,19 +1,76 @@
+"""
+    TensorCacheStats
+
+Per-process counters updated by `tensor` on [`Weights`](@ref). `n_hits` counts tensors restored from a cached ancestor, `n_cold` those that had to be replayed from zero despite a weight cache, `n_replayed` and `max_replay` the genes replayed, and `n_snapshots` the tensors written to the snapshot store. Updates take `lock`, since tensors are developed from several threads. See [`tensor_cache_stats`](@ref).
+"""
+mutable struct TensorCacheStats
+    n_tensors::Int
+    n_hits::Int
+    n_cold::Int
+    n_replayed::Int
+    max_replay::Int
+    n_snapshots::Int
+    lock::ReentrantLock
+end
+const _tensor_cache_stats = TensorCacheStats(0, 0, 0, 0, 0, 0, ReentrantLock())
+
+"""
+    tensor_cache_stats() -> NamedTuple
+
+Counters of [`TensorCacheStats`](@ref) for this process, plus `hit_rate` (over tensors developed with a weight cache) and `mean_replay` (genes replayed per tensor).
+"""
+function tensor_cache_stats()
+    s = _tensor_cache_stats
+    lock(s.lock) do
+        n_lookups = s.n_hits + s.n_cold
+        (n_tensors=s.n_tensors, n_hits=s.n_hits, n_cold=s.n_cold, n_replayed=s.n_replayed,
+         max_replay=s.max_replay, n_snapshots=s.n_snapshots,
+         hit_rate=n_lookups == 0 ? NaN : s.n_hits / n_lookups,
+         mean_replay=s.n_tensors == 0 ? NaN : s.n_replayed / s.n_tensors)
+    end
+end
+
+function reset_tensor_cache_stats!()
+    s = _tensor_cache_stats
+    lock(s.lock) do
+        s.n_tensors = s.n_hits = s.n_cold = s.n_replayed = s.max_replay = s.n_snapshots = 0
+    end
+    nothing
+end
+
+function record_replay!(n_replayed::Int, hit::Bool, cached::Bool, n_snapshots::Int)
+    s = _tensor_cache_stats
+    lock(s.lock) do
+        s.n_tensors += 1
+        s.n_replayed += n_replayed
+        s.max_replay = max(s.max_replay, n_replayed)
+        s.n_snapshots += n_snapshots
+        cached && (hit ? (s.n_hits += 1) : (s.n_cold += 1))
+    end
+    nothing
+end
+
 ############################
 # PERFORMANCE CRITICAL START  (suspected)
-function get_earliest_cached_weight(dims::NTuple{N, Int}, genes::Vector{NetworkGene}, weight_cache::_WeightCache) where {N}
-    """Return the earliest cached weight in the gene list. If none are cached, return a zero tensor of the given dimensions. Allocates memory. Also returns the idx of the earliest cached gene."""
+# A cached tensor that `tensor` can develop in place: LRU entries are copied, shared
+# entries are read from disk into a fresh array anyway.
+cached_copy(cache::LRU, id::Int) = (weights = get(cache, id, nothing); isnothing(weights) ? nothing : copy(weights))
+cached_copy(cache::SharedWeightCache, id::Int) = get(cache, id, nothing)
+
+function get_earliest_cached_weight(dims::NTuple{N, Int}, genes::Vector{NetworkGene}, weight_cache::_WeightCache,
+                                    snapshot_cache::_WeightCache=weight_cache, interval::Int=1) where {N}
+    """Return the earliest cached weight in the gene list, looking up snapshot positions in `snapshot_cache` too. If none are cached, return a zero tensor of the given dimensions. Allocates memory. Also returns the idx of the earliest cached gene."""
     isnothing(weight_cache) && return zeros(Float32, dims), 0
     @inbounds for i in length(genes):-1:1
-        weights = get(weight_cache, genes[i].id, nothing)
+        weights = cached_copy(weight_cache, genes[i].id)
+        if isnothing(weights) && snapshot_cache !== weight_cache && i % interval == 0
+            weights = cached_copy(snapshot_cache, genes[i].id)
+        end
         if !isnothing(weights)
             @assert size(weights) == dims "Cached weight for $(genes[i].id) has different dimensions than requested"
-            return (copy(weights), i)
+            return (weights, i)
         end
     end
-    if weight_cache.currentsize > weight_cache.maxsize / 2
-        error("Failed to find cache entry, but cache is more than half full. This is likely an error; consider increasing cache size.")
-
-    end
     zeros(Float32, dims), 0
 end
 """
@@ -23,26 +80,36 @@ end
     tensor(w::WeightsCollection; weight_cache::_WeightCache=nothing)::Array{Float32}
 
 Create a tensor from a Weights object. If `weight_cache` is provided, it will used cached weights during development, and update the cache accordingly. If the cache is not provided, it will not be used.
+
+For `Weights`, development starts from the latest gene whose tensor is cached (or from zero) and replays the genes after it. The tensor after every `k`-th gene of the weight, where `k` is [`get_snapshot_interval`](@ref), is written as a snapshot to [`get_snapshot_cache`](@ref), so all descendants of a lineage share the same snapshots and replay at most `k` genes plus the genes added since. With `k > 1`, the tensor before the last gene (usually the parent's) also goes to `weight_cache` for siblings to start from. Replay lengths and cache hits are counted in [`tensor_cache_stats`](@ref).
 """
 function tensor(w::Weights; weight_cache::_WeightCache=nothing)
     # ADD MUTS that have have not been cached
     dims, genes = w.dims, w.muts
     n_genes = length(genes)
+    interval = get_snapshot_interval()
+    snapshot_cache = get_snapshot_cache(weight_cache)
     # get earliest cached weight or zero tensor if none found
-    arr, ancestor_idx = @inline get_earliest_cached_weight(dims, genes, weight_cache)
+    arr, ancestor_idx = @inline get_earliest_cached_weight(dims, genes, weight_cache, snapshot_cache, interval)
     yes_weight_cache = !isnothing(weight_cache)
+    n_snapshots = 0
     # iteratively apply remaining mutations
     @inbounds for i in ancestor_idx+1:n_genes
         gene = genes[i]
         gid = gene.id
         rng = StableRNG(gene.seed)
         @fastmath gene.init!(rng, Float32, arr, gene.mr)
-        # update cache if we are using one
-        if yes_weight_cache && i != n_genes && gid ∉ keys(weight_cache)
-            gene_id = genes[i].id
-            weight_cache[gene_id] = arr |> deepcopy
+        (!yes_weight_cache || i == n_genes) && continue
+        # snapshot at every `interval`-th gene if we are using a cache
+        if i % interval == 0
+            haskey(snapshot_cache, gid) && continue
+            snapshot_cache[gid] = arr |> deepcopy
+            n_snapshots += 1
+        elseif i == n_genes - 1 && !haskey(weight_cache, gid)
+            weight_cache[gid] = arr |> deepcopy
         end
     end
+    record_replay!(n_genes - ancestor_idx, ancestor_idx > 0, yes_weight_cache, n_snapshots)
     #CUDA.synchronize()
     #gpu(arr)
     arr
@@ -70,7 +137,11 @@ end
 
 
 function tensor(cw::CompositeWeight; weight_cache::_WeightCache=nothing)
-    reduce(+, [tensor(w, weight_cache=weight_cache) for w in cw.weights])
+    arr = tensor(cw.weights[1], weight_cache=weight_cache)
+    for i in 2:length(cw.weights)
+        arr .+= tensor(cw.weights[i], weight_cache=weight_cache)
+    end
+    arr
 end
 function tensor(wc::WeightsCollection; weight_cache::_WeightCache=nothing)
     @assert ndims(wc.weights) <= 2 "WeightsCollection only supports 2 or fewer dimensions, got $(ndims(wc.weights))"
@@ -91,6 +162,65 @@ function tensor(wc::WeightsCollection; weight_cache::_WeightCache=nothing)
 end
 # PERFORMANCE CRITICAL END
 ############################
+
+"""
+    LowRankDense(factors, dense, bias, σ)
+
+Phenotype of a [`Dense`](@ref) layer whose weights contain [`FactorWeight`](@ref)s. Computes `σ.(Σ A*(B*x) + W*x .+ bias)` for each factor pair `(A, B)` in `factors` and the materialized remainder `W` (or `nothing`), without forming `A*B`. Inputs with more than two dimensions are flattened to `(size(x, 1), :)` like `Transformers.Dense`.
+"""
+struct LowRankDense{F, D, B, S}
+    factors::F
+    dense::D
+    bias::B
+    σ::S
+end
+Flux.@functor LowRankDense (factors, dense, bias)
+
+function (l::LowRankDense)(x::AbstractArray)
+    x2 = reshape(x, size(x, 1), :)
+    A, B = l.factors[1]
+    y = A * (B * x2)
+    for i in 2:length(l.factors)
+        A, B = l.factors[i]
+        y .+= A * (B * x2)
+    end
+    isnothing(l.dense) || (y .+= l.dense * x2)
+    y = l.σ.(y .+ l.bias)
+    reshape(y, size(y, 1), size(x)[2:end]...)
+end
+
+is_factorized(::FactorWeight) = true
+is_factorized(cw::CompositeWeight) = any(w -> w isa FactorWeight, cw.weights)
+is_factorized(::AbstractWeights) = false
+
+# multiply-adds per input column when applying factors separately
+lowrank_cost(fw::FactorWeight) = fw.A.dims[2] * (fw.A.dims[1] + fw.B.dims[2])
+lowrank_cost(cw::CompositeWeight) = sum(lowrank_cost, cw.weights)
+lowrank_cost(w::AbstractWeights) = prod(w.dims)
+# multiply-adds per input column of the materialized (rows, cols) matrix
+dense_cost(fw::FactorWeight) = fw.A.dims[1] * fw.B.dims[2]
+dense_cost(cw::CompositeWeight) = dense_cost(cw.weights[findfirst(w -> w isa FactorWeight, cw.weights)])
+
+"""
+    use_factorized(w::AbstractWeights) -> Bool
+
+Whether `create_layer` should keep the factors of `w` separate instead of materializing `A*B`, according to [`get_factorized_layers`](@ref). In `:auto` mode, only when that takes fewer multiply-adds per input.
+"""
+function use_factorized(w::AbstractWeights)
+    mode = get_factorized_layers()
+    (mode == :never || !is_factorized(w)) && return false
+    mode == :always || lowrank_cost(w) < dense_cost(w)
+end
+
+lowrank_terms(fw::FactorWeight; weight_cache::_WeightCache) =
+    [(tensor(fw.A, weight_cache=weight_cache), tensor(fw.B, weight_cache=weight_cache))], nothing
+function lowrank_terms(cw::CompositeWeight; weight_cache::_WeightCache)
+    factors = [(tensor(w.A, weight_cache=weight_cache), tensor(w.B, weight_cache=weight_cache))
+               for w in cw.weights if w isa FactorWeight]
+    rest = [w for w in cw.weights if !(w isa FactorWeight)]
+    dense = isempty(rest) ? nothing : tensor(CompositeWeight(cw.dims, rest), weight_cache=weight_cache)
+    factors, dense
+end
 function create_layer(layer::Jevo.RNN; weight_cache::_WeightCache)
     wi = @inline tensor(layer.input, weight_cache=weight_cache)
     wh = @inline tensor(layer.hidden, weight_cache=weight_cache)
@@ -153,6 +283,18 @@ create_layer(layer::Jevo.Transformer; weight_cache::_WeightCache) = create_layer
 create_layer(layer::JevoChain; weight_cache::_WeightCache) = create_layer(layer.layers, weight_cache=weight_cache)
 
 function create_layer(layer::Jevo.Conv; weight_cache::_WeightCache)
+    if layer.weights isa FactorWeight && use_factorized(layer.weights)
+        # conv with A as r filters, then a 1x1 conv mixing them with B
+        A = tensor(layer.weights.A, weight_cache=weight_cache)
+        B = tensor(layer.weights.B, weight_cache=weight_cache)
+        rank, out_ch = size(B)
+        n_in_channels = Int(size(A, 1) / (layer.kernel[1] * layer.kernel[2]))
+        A = reshape(A, (layer.kernel[1], layer.kernel[2], n_in_channels, rank)) ./ 2
+        B = reshape(B, (1, 1, rank, out_ch))
+        bias = @inline tensor(layer.bias, weight_cache=weight_cache)
+        return Flux.Chain(Flux.Conv(identity, A, false, layer.stride, layer.padding, layer.dilation, 1),
+                          Flux.Conv(layer.σ, B, bias, (1, 1), (0, 0, 0, 0), (1, 1), 1))
+    end
     weights = @inline tensor(layer.weights, weight_cache=weight_cache)
     if ndims(weights) == 2
         n_in_channels = Int(size(weights, 1)  / (layer.kernel[1] * layer.kernel[2]))
@@ -163,6 +305,11 @@ function create_layer(layer::Jevo.Conv; weight_cache::_WeightCache)
 end
 
 function create_layer(layer::Jevo.Dense; weight_cache::_WeightCache)
+    if use_factorized(layer.weights)
+        factors, dense = lowrank_terms(layer.weights, weight_cache=weight_cache)
+        bias = @inline tensor(layer.bias, weight_cache=weight_cache)
+        return LowRankDense(factors, dense, bias, layer.σ)
+    end
     weights = @inline tensor(layer.weights, weight_cache=weight_cache)
     bias = @inline tensor(layer.bias, weight_cache=weight_cache)
     Transformers.Dense(weights, bias, layer.σ)
@@ -1,22 +1,46 @@
 export UpdateParentsAcrossAllWorkers
 GPID_PID_PD = Tuple{Int, Int, Union{Delta, Nothing}}
 MISSING_PARENTS_PER_WORKER = Dict{Int, Vector{Int}}  # worker_id: [pids]
+# (pid, anchor id, deltas): a parent rebuilt on a worker by applying `deltas` to the
+# genome of an ancestor the worker already holds. Genesis chains use anchor=-1 and
+# start with the genesis delta, whose change is the full genome.
+PARENT_CHAIN = Tuple{Int, Int, Vector{Delta}}
 @define_op "UpdateParentsAcrossAllWorkers"
 
+"""
+    UpdateParentsAcrossAllWorkers(ids::Vector{String}=String[]; kwargs...)
+
+Makes sure every process holds the genomes of the current parents in its genotype cache. Parent deltas are broadcast to all processes; a process missing a parent is sent only the chain of deltas from the nearest ancestor it still caches. Processes needing the same chains share one serialized payload. Bytes sent and wall-clock time are logged to `UpdateParentsAcrossAllWorkers.BytesSent` and `UpdateParentsAcrossAllWorkers.SyncTime`.
+"""
 UpdateParentsAcrossAllWorkers(ids::Vector{String}=String[];kwargs...) = create_op("UpdateParentsAcrossAllWorkers",
     retriever=PopulationRetriever(ids),
     updater=(s, ps)->update_parents_across_all_workers!(s, ps); kwargs...)
 
 function update_parents_across_all_workers!(s::State, pops::Vector{Vector{Population}})
     # all these functions run on master, and make calls to workers
+    start = time()
     # check which workers are missing parents of the current generation
-    workers_missing_parents = master_send_pids_and_gpids(pops)
-    # construct all missing parents on master 
-    worker_pid_genomes = master_construct_parents_genomes(pops, workers_missing_parents)
-    # TODO for any worker that's missing a genome, we also want to re-transmit the weight cache
-    # send to workers and cache
-    master_cache_parents!(worker_pid_genomes)
+    workers_missing_parents, bytes_sent = master_send_pids_and_gpids(pops)
+    if any(!isempty, values(workers_missing_parents))
+        # find the shortest delta chain from an ancestor each worker holds
+        worker_chains = master_construct_parent_chains(pops, workers_missing_parents)
+        # send to workers and cache
+        bytes_sent += master_send_parent_chains!(worker_chains)
+    end
+    h5_logging() || return
+    gen = generation(s)
+    m_bytes = Measurement("UpdateParentsAcrossAllWorkers.BytesSent", bytes_sent, gen)
+    m_time = Measurement("UpdateParentsAcrossAllWorkers.SyncTime", time() - start, gen)
+    @h5 m_bytes
+    @h5 m_time
+end
+
+function serialize_payload(x)
+    io = IOBuffer()
+    serialize(io, x)
+    take!(io)
 end
+deserialize_payload(payload::Vector{UInt8}) = deserialize(IOBuffer(payload))
 
 
 function master_get_gpid_pid_pds(ind::Individual, tree::PhylogeneticTree, dc::DeltaCache)
@@ -47,15 +71,19 @@ function master_send_pids_and_gpids(pops::Vector{Vector{Population}})
         end
     end
     gpid_pid_pds = unique(gpid_pid_pds)
-    # Send to workers
-    tasks = [@spawnat wid worker_mk_parents_from_deltas_and_ret_missing!(gpid_pid_pds)
+    # Serialize once, send the same bytes to every worker
+    payload = serialize_payload(gpid_pid_pds)
+    tasks = [@spawnat wid worker_mk_parents_from_deltas_and_ret_missing!(payload)
              for wid in procs()]
     # Receive missing parents from workers 
     workers_missing_parents = Dict(task.where => fetch(task) for task in tasks)
     any(!isempty, values(workers_missing_parents)) && @info workers_missing_parents
-    return workers_missing_parents
+    return workers_missing_parents, length(payload) * length(tasks)
 end
 
+worker_mk_parents_from_deltas_and_ret_missing!(payload::Vector{UInt8}) =
+    worker_mk_parents_from_deltas_and_ret_missing!(deserialize_payload(payload)::Vector{GPID_PID_PD})
+
 function worker_mk_parents_from_deltas_and_ret_missing!(gpid_pid_pds::Vector{GPID_PID_PD})
     miss, geno_cache = Int[], get_genotype_cache()
     for (gpid, pid, pd) in gpid_pid_pds
@@ -115,48 +143,69 @@ function worker_construct_child_genome(ind::Individual{G, D, I}) where {G <: Del
     genotype
 end
 
-function master_construct_parents_genomes(pops::Vector{Vector{Population}}, workers_missing_parents::MISSING_PARENTS_PER_WORKER)
-    pids = reduce(union!, values(workers_missing_parents), init=Set{Int}())
-    gc = get_genotype_cache()
-    parent_genomes = Dict(pid=>gc[pid] for pid in pids if pid in keys(gc))
-    missing_pids = setdiff(pids, keys(parent_genomes))
-    for comp_pop in pops, subpop in comp_pop
-        tree, dc = get_tree(subpop), get_delta_cache(subpop)
-        for id in missing_pids
-            if id ∈ keys(tree.tree)
-                @assert id ∈ keys(dc) "id $(id) found in tree but not found in delta cache"
-                gc[id] = parent_genomes[id] = master_construct_genome(id, tree, dc, gc)
-                pop!(missing_pids, id)
-            end
-        end
-        #= for ind in subpop.individuals =#
-        #=     # send parents if they currently exist in the population =#
-        #=     if ind.id in pids && !(ind.id in keys(parent_genomes)) =#
-        #=         gc[ind.id] = parent_genomes[ind.id] = master_construct_genome(ind, tree, dc, gc) =#
-        #=     end =#
-        #= end =#
+function master_parent_chain(pid::Int, tree::PhylogeneticTree, dc::DeltaCache, held::Set{Int})
+    # walk up from pid to the nearest ancestor in `held`, collecting deltas
+    deltas, node = Delta[], tree.tree[pid]
+    while true
+        @assert node.id ∈ keys(dc) "id $(node.id) found in tree but not found in delta cache"
+        push!(deltas, dc[node.id])
+        parent = node.parent
+        isnothing(parent) && return (pid, -1, reverse!(deltas))
+        parent.id ∈ held && return (pid, parent.id, reverse!(deltas))
+        node = parent
+    end
+end
 
+function master_construct_parent_chains(pops::Vector{Vector{Population}}, workers_missing_parents::MISSING_PARENTS_PER_WORKER)
+    wids = [wid for (wid, pids) in workers_missing_parents if !isempty(pids)]
+    tasks = [@spawnat wid collect(keys(get_genotype_cache())) for wid in wids]
+    subpops = [(get_tree(subpop), get_delta_cache(subpop)) for comp_pop in pops for subpop in comp_pop]
+    worker_chains = Dict{Int, Vector{PARENT_CHAIN}}()
+    for (wid, task) in zip(wids, tasks)
+        held = Set{Int}(fetch(task))
+        chains = PARENT_CHAIN[]
+        # ancestors have smaller ids, so earlier chains can anchor later ones
+        for pid in sort(workers_missing_parents[wid])
+            idx = findfirst(td -> pid ∈ keys(first(td).tree), subpops)
+            @assert !isnothing(idx) "missing $pid when constructing parent chains"
+            push!(chains, master_parent_chain(pid, subpops[idx]..., held))
+            push!(held, pid)
+        end
+        worker_chains[wid] = chains
     end
-    @assert isempty(missing_pids) "missing $(missing_pids) when constructing parent genomes"
-    @assert pids ⊆ keys(parent_genomes) "missing $(setdiff(pids, keys(parent_genomes))) for child pids $pids given parent pids $(keys(parent_genomes)). Is your genotype cache too small?"
-    worker_parent_genomes = Dict(wid =>[(pid, parent_genomes[pid]) for pid in pids]
-                                 for (wid, pids) in workers_missing_parents)
-    return worker_parent_genomes
+    worker_chains
 end
 
-function worker_cache_parents!(pids_genomes)
+function worker_cache_parent_chains!(chains::Vector{PARENT_CHAIN})
     gc = get_genotype_cache()
-    for (pid, genome) in pids_genomes
+    for (pid, anchor, deltas) in chains
+        if anchor == -1
+            genome, first_delta = first(deltas).change, 2
+        else
+            @assert anchor ∈ keys(gc) "ancestor $anchor of $pid not found on process $(myid())"
+            genome, first_delta = gc[anchor], 1
+        end
+        for i in first_delta:length(deltas)
+            genome = genome + deltas[i]
+        end
         gc[pid] = genome
     end
 end
+worker_cache_parent_chains!(payload::Vector{UInt8}) =
+    worker_cache_parent_chains!(deserialize_payload(payload)::Vector{PARENT_CHAIN})
 
-function master_cache_parents!(worker_parent_genomes::Dict{Int, <:Any})
-    # add tasks
-    tasks = [@spawnat wid worker_cache_parents!(ids_genomes)
-             for (wid, ids_genomes) in worker_parent_genomes]
-    # wait for tasks
-    Threads.@threads for i in eachindex(tasks)
-        fetch(tasks[i])
+function master_send_parent_chains!(worker_chains::Dict{Int, Vector{PARENT_CHAIN}})
+    # workers needing the same (pid, anchor) chains receive the same payload
+    groups = Dict{Vector{Tuple{Int, Int}}, Vector{Int}}()
+    for (wid, chains) in worker_chains
+        push!(get!(groups, [(pid, anchor) for (pid, anchor, _) in chains], Int[]), wid)
+    end
+    bytes_sent, tasks = 0, Future[]
+    for wids in values(groups)
+        payload = serialize_payload(worker_chains[first(wids)])
+        bytes_sent += length(payload) * length(wids)
+        append!(tasks, [@spawnat wid worker_cache_parent_chains!(payload) for wid in wids])
     end
+    foreach(fetch, tasks)
+    bytes_sent
 end
@@ -136,13 +136,13 @@ end
 """
 Uses the Mutation API to clear all weights of the current generation's individuals.
 
-Designed to be used with [Deltas](@ref Delta) which have been cloned.
+Designed to be used with [Deltas](@ref Delta) which have been cloned. Empties the phenotype caches, since the individuals keep their ids.
 """
 ClearCurrentGenWeights(ids::Vector{String}=String[]; condition::Function=always, time::Bool=false, kwargs...) = 
     create_op("ClearCurrentGenWeights", 
               condition=condition,
               retriever=PopulationRetriever(ids),
-              updater=map(map((s,p)->mutate!(s, p; fn=clear_weights, kwargs...))),
+              updater=(s,ps)->(map(map((s,p)->mutate!(s, p; fn=clear_weights, kwargs...)))(s, ps); clear_phenotype_caches!()),
               time=time;)
 clear_weights(::AbstractRNG, ::State, ::Population, genotype) = copyarchitecture(genotype)
 
@@ -173,7 +173,7 @@ CrossoverParents(ids::Vector{String}=String[]; condition::Function=always, time:
     create_op("ClearCurrentGenWeights", 
               condition=condition,
               retriever=PopulationRetriever(ids),
-              updater=map(map((s,pop)->mutate!(s, pop; fn=crossover_parents, parents=get_parents(s, pop),kwargs...))),
+              updater=(s,ps)->(map(map((s,pop)->mutate!(s, pop; fn=crossover_parents, parents=get_parents(s, pop),kwargs...)))(s, ps); clear_phenotype_caches!()),
               time=time;)
 
 
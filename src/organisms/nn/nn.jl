@@ -4,6 +4,7 @@ abstract type AbstractWeights end
 abstract type AbstractLayer <: AbstractGenotype end
 abstract type AbstractMutation end
 
+include("./sharedcache.jl")
 include("./structs.jl")
 include("./traverse.jl")
 include("./utils.jl")
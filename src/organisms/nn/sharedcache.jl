@@ -0,0 +1,119 @@
+export SharedWeightCache
+using Mmap
+
+"""
+    SharedWeightCache(dir::String; maxsize::Int)
+
+A weight cache shared by every process on a node. Each developed tensor is stored as one file in `dir`, which should be on node-local shared memory (e.g. `/dev/shm/jevo-\$SLURM_JOB_ID`), and is read straight into a fresh array on lookup, so each process holds only the tensors it is developing. Entries are written to a temporary file and renamed into place, so readers never see partial tensors.
+
+`maxsize` bounds the total bytes of all entries on the node. The running total is kept in a memory-mapped counter; when an insert exceeds `maxsize`, the inserting process takes a pidlock and deletes the least recently used entries (by modification time, which lookups refresh) until the cache is back under 3/4 of `maxsize`. Deleted files stay valid for processes that are reading them.
+
+Used by [`get_weight_cache`](@ref) when `JEVO_SHARED_WEIGHT_CACHE` is set, in a directory of its own for each run (see [`shared_weight_cache_dir`](@ref)). Supports the `get`, `haskey`, `setindex!`, `length` and `empty!` calls that `tensor` makes on an `LRU` weight cache.
+"""
+struct SharedWeightCache
+    dir::String
+    maxsize::Int
+    function SharedWeightCache(dir::String; maxsize::Int)
+        mkpath(dir)
+        new(dir, maxsize)
+    end
+end
+
+# The counter is mapped once per process and directory. It is not a field so
+# that a SharedWeightCache can be serialized (e.g. by the checkpointer).
+const shared_cache_counters = Dict{String, Vector{Int}}()
+
+function shared_cache_counter(c::SharedWeightCache)
+    get!(shared_cache_counters, c.dir) do
+        io = open(joinpath(c.dir, "currentsize"), read=true, write=true, create=true)
+        counter = Mmap.mmap(io, Vector{Int}, 1)
+        close(io)
+        counter
+    end
+end
+
+entry_path(c::SharedWeightCache, id::Int) = joinpath(c.dir, "$id.f32")
+is_entry(fname::String) = endswith(fname, ".f32")
+
+Base.getproperty(c::SharedWeightCache, s::Symbol) =
+    s == :currentsize ? shared_cache_counter(c)[1] : getfield(c, s)
+Base.haskey(c::SharedWeightCache, id::Int) = isfile(entry_path(c, id))
+Base.length(c::SharedWeightCache) = count(is_entry, readdir(c.dir))
+
+# Refresh the modification time that eviction goes by. Unlike `touch`, this doesn't
+# recreate an entry that another process evicted in the meantime.
+mark_used(path::String) = ccall(:utimes, Cint, (Cstring, Ptr{Cvoid}), path, C_NULL)
+
+function Base.get(c::SharedWeightCache, id::Int, default)
+    path = entry_path(c, id)
+    isfile(path) || return default
+    io = try
+        open(path, "r")
+    catch e
+        e isa SystemError && return default  # evicted by another process since isfile
+        rethrow()
+    end
+    try
+        n = Base.read(io, Int)
+        dims = Tuple(Base.read(io, Int) for _ in 1:n)
+        # entries are renamed into place whole, anything else is not a cached tensor
+        filesize(io) == position(io) + sizeof(Float32) * prod(dims) || return default
+        arr = read!(io, Array{Float32, n}(undef, dims))
+        mark_used(path)
+        arr
+    catch e
+        e isa EOFError && return default
+        rethrow()
+    finally
+        close(io)
+    end
+end
+
+function Base.setindex!(c::SharedWeightCache, arr::Array{Float32}, id::Int)
+    path = entry_path(c, id)
+    isfile(path) && return arr
+    tmp = "$path.$(getpid()).tmp"
+    open(tmp, "w") do io
+        Base.write(io, ndims(arr))
+        foreach(d -> Base.write(io, d), size(arr))
+        Base.write(io, arr)
+    end
+    monitor = FileWatching.Pidfile.mkpidlock(joinpath(c.dir, "lock.pid"), wait=true)
+    try
+        if isfile(path)  # another process cached it first
+            rm(tmp)
+        else
+            counter = shared_cache_counter(c)
+            counter[1] += filesize(tmp)
+            mv(tmp, path)
+            counter[1] > c.maxsize && evict!(c, 3 * c.maxsize ÷ 4)
+        end
+    finally
+        close(monitor)
+    end
+    arr
+end
+
+# Must hold the cache lock
+function evict!(c::SharedWeightCache, target::Int)
+    entries = [joinpath(c.dir, f) for f in readdir(c.dir) if is_entry(f)]
+    stats = [(mtime(p), filesize(p), p) for p in entries]
+    sort!(stats)
+    total = sum(s[2] for s in stats; init=0)
+    for (_, size, path) in stats
+        total <= target && break
+        rm(path, force=true)
+        total -= size
+    end
+    shared_cache_counter(c)[1] = total
+end
+
+function Base.empty!(c::SharedWeightCache)
+    monitor = FileWatching.Pidfile.mkpidlock(joinpath(c.dir, "lock.pid"), wait=true)
+    try
+        evict!(c, 0)
+    finally
+        close(monitor)
+    end
+    c
+end
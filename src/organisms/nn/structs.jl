@@ -209,11 +209,11 @@ struct TextNetwork{N} <: AbstractLayer where {N <: AbstractLayer}
 end
 
 """
-    _WeightCache::LRU{Int, <:Array{Float32}}
+    _WeightCache::Union{LRU{Int, <:Array{Float32}}, SharedWeightCache}
 
 Stores developed tensors of weights for genes. Keys are tensor dimensions and the last gene id used. For a weight of dimensions `(a, b)` containing gene ids `1, 2, 3`, `_WeightCache[3, (a,b)]` would map to a tensor equivalent to `tensor(gene_1) + tensor(gene_2) + tensor(gene_3)`.
 """
-_WeightCache = Union{LRU{Int, <:Array{Float32}}, Nothing}
+_WeightCache = Union{LRU{Int, <:Array{Float32}}, SharedWeightCache, Nothing}
 # Should be LRU{Int, <:AbstractLayer}, but abstract types slow down the code
 _GenotypeCache = Union{LRU, Nothing}
 
@@ -1,4 +1,4 @@
-export visualize, get_weights
+export visualize, get_weights, tensor_cache_stats, reset_tensor_cache_stats!
 
 
 function cuda_randn(rng::AbstractRNG, dims::Integer...; std::Real=1.0f0)
@@ -57,18 +57,97 @@ apply_constant!(::AbstractRNG, ::Type, arr::Array{Float32}, v::Float32) = (arr .
 
 global weight_cache = nothing
 global genotype_cache = nothing
+global snapshot_interval = nothing
+global factorized_layers = nothing
 
 
+"""
+    get_weight_cache()
+
+Returns this process's weight cache, creating it if needed. By default each process gets its own `WeightCache` of 2^29 bytes. If the environment variable `JEVO_SHARED_WEIGHT_CACHE` names a directory, all processes of the run on the node share a [`SharedWeightCache`](@ref) in a subdirectory of it instead (see [`shared_weight_cache_dir`](@ref)), of `JEVO_SHARED_WEIGHT_CACHE_SIZE` bytes (default 2^33).
+"""
 function get_weight_cache()
     # get global variable Jevo.weight_cache for weight cache
     # check if weight_cache is defined
     if !isdefined(Jevo, :weight_cache) || isnothing(Jevo.weight_cache)
-        @warn "No weight cache found. Creating weight cache on proc $(myid())"
-        Jevo.weight_cache = WeightCache(maxsize=Int(2^29), by=sizeof)
+        if isempty(get(ENV, "JEVO_SHARED_WEIGHT_CACHE", ""))
+            @warn "No weight cache found. Creating weight cache on proc $(myid())"
+            Jevo.weight_cache = WeightCache(maxsize=Int(2^29), by=sizeof)
+        else
+            shared_dir = shared_weight_cache_dir()
+            maxsize = parse(Int, get(ENV, "JEVO_SHARED_WEIGHT_CACHE_SIZE", string(2^33)))
+            @info "Using shared weight cache $shared_dir on proc $(myid())"
+            Jevo.weight_cache = SharedWeightCache(shared_dir, maxsize=maxsize)
+        end
     end
     Jevo.weight_cache
 end
 
+"""
+    shared_weight_cache_dir() -> String
+
+Directory of this run's [`SharedWeightCache`](@ref), the subdirectory `JEVO_SHARED_WEIGHT_CACHE_RUN` of `JEVO_SHARED_WEIGHT_CACHE`. Entries are keyed by gene id, which restarts in every run, so runs must never share a directory. The first call on the master picks a run id unique to its host, pid and start time, empties the directory and removes it at exit. [`CreateMissingWorkers`](@ref) forwards the id, so workers use the master's directory.
+"""
+function shared_weight_cache_dir()
+    root = ENV["JEVO_SHARED_WEIGHT_CACHE"]
+    if !haskey(ENV, "JEVO_SHARED_WEIGHT_CACHE_RUN")
+        @assert myid() == 1 "JEVO_SHARED_WEIGHT_CACHE_RUN is not set on proc $(myid()), create workers with CreateMissingWorkers"
+        run = "run-$(gethostname())-$(getpid())-$(time_ns())"
+        ENV["JEVO_SHARED_WEIGHT_CACHE_RUN"] = run
+        dir = joinpath(root, run)
+        empty!(SharedWeightCache(dir, maxsize=0))
+        atexit(() -> rm(dir, recursive=true, force=true))
+    end
+    joinpath(root, ENV["JEVO_SHARED_WEIGHT_CACHE_RUN"])
+end
+
+"""
+    get_snapshot_interval()
+
+Number of genes between snapshots of a weight's tensor in `tensor`, counted from the weight's first gene. Read once per process from the environment variable `JEVO_SNAPSHOT_INTERVAL`, defaulting to 1 (cache every intermediate tensor). Larger values use less cache memory per lineage and bound replay to that many genes.
+"""
+function get_snapshot_interval()
+    if !isdefined(Jevo, :snapshot_interval) || isnothing(Jevo.snapshot_interval)
+        Jevo.snapshot_interval = parse(Int, get(ENV, "JEVO_SNAPSHOT_INTERVAL", "1"))
+        @assert Jevo.snapshot_interval >= 1 "JEVO_SNAPSHOT_INTERVAL must be at least 1"
+    end
+    Jevo.snapshot_interval::Int
+end
+
+const snapshot_caches = IdDict{Any, Any}()
+const snapshot_caches_lock = ReentrantLock()
+
+"""
+    get_snapshot_cache(weight_cache)
+
+Returns the store of `tensor` snapshots that goes with `weight_cache`. Snapshots are kept apart from the weight cache, so that caching other tensors never evicts them: an `LRU` weight cache gets a `WeightCache` of `JEVO_SNAPSHOT_CACHE_SIZE` bytes (default 2^28) in this process, and a [`SharedWeightCache`](@ref) a shared one of that size in its `snapshots` subdirectory. With a snapshot interval of 1 every intermediate tensor is a snapshot, and the weight cache is returned.
+"""
+get_snapshot_cache(::Nothing) = nothing
+function get_snapshot_cache(weight_cache)
+    get_snapshot_interval() == 1 && return weight_cache
+    lock(snapshot_caches_lock) do
+        get!(snapshot_caches, weight_cache) do
+            maxsize = parse(Int, get(ENV, "JEVO_SNAPSHOT_CACHE_SIZE", string(2^28)))
+            weight_cache isa SharedWeightCache ?
+                SharedWeightCache(joinpath(weight_cache.dir, "snapshots"), maxsize=maxsize) :
+                WeightCache(maxsize=maxsize, by=sizeof)
+        end
+    end
+end
+
+"""
+    get_factorized_layers() -> Symbol
+
+How `create_layer` develops `Dense` and `Conv` layers whose weights contain [`FactorWeight`](@ref)s. `:never` materializes `A*B`. `:always` keeps the factors and applies them one after the other (see [`LowRankDense`](@ref)). `:auto` does so only when it needs fewer multiply-adds. Read once per process from the environment variable `JEVO_FACTORIZED_LAYERS`, defaulting to `never`.
+"""
+function get_factorized_layers()
+    if !isdefined(Jevo, :factorized_layers) || isnothing(Jevo.factorized_layers)
+        Jevo.factorized_layers = Symbol(get(ENV, "JEVO_FACTORIZED_LAYERS", "never"))
+        @assert Jevo.factorized_layers ∈ (:never, :auto, :always) "JEVO_FACTORIZED_LAYERS must be never, auto or always"
+    end
+    Jevo.factorized_layers::Symbol
+end
+
 function get_genotype_cache()
     # get global variable Jevo.weight_cache for weight cache
     # check if weight_cache is defined
@@ -29,27 +29,40 @@ function develop(creator::Creator, ind::Individual{G, D, I}) where {G <: Delta,
 end
 
 get_tree(pop::Population) = getonly(p -> p isa PhylogeneticTree, pop.data)
+
+"""
+    get_phylogenetic_index(pop::Population)
+
+Returns the [`PhylogeneticIndex`](@ref) of `pop`, building it from the tree if the population does not have one yet (e.g. when restored from an older checkpoint).
+"""
+function get_phylogenetic_index(pop::Population)
+    idx = findfirst(p -> p isa PhylogeneticIndex, pop.data)
+    !isnothing(idx) && return pop.data[idx]
+    index = PhylogeneticIndex(get_tree(pop))
+    push!(pop.data, index)
+    index
+end
 get_delta_cache(pop::Population) = getonly(p -> p isa DeltaCache, pop.data)
 
-function initialize_phylogeny!(::AbstractState, pop::Population)
+function initialize_phylogeny!(state::AbstractState, pop::Population)
     @assert isnothing(findfirst(p -> p isa PhylogeneticTree, pop.data)) "Phylogenetic tree already initialized for population $(pop.id)"
     ind_ids = [ind.id for ind in pop.individuals]
     tree = PhylogeneticTree(ind_ids)
     push!(pop.data, tree)
-    # add tracking data
-    io = open(phylo_fname(pop), "w")
-    println(io, "id,ancestor_list")
-    for ind in tree.genesis
-        @assert isnothing(ind.parent)
-        println(io, "$(ind.id),[none]")
+    push!(pop.data, PhylogeneticIndex(tree))
+    # only track records for a LogPhylogeny to write, genesis records are written by its first call
+    any(op -> op isa LogPhylogeny, state.operators) || return
+    tracker = PhyloTracker(open(phylo_fname(pop), "w"), Int[])
+    for ind in pop.individuals
+        record!(tracker, ind.id, -1, ind.generation)
     end
-    push!(pop.data, PhyloTracker(io, maximum(ind_ids)))
+    push!(pop.data, tracker)
 end
 
 """
     InitializePhylogeny(ids::Vector{String}=String[];kwargs...)
 
-Initializes a phylogenetic tree for populations with ids in `ids`. The tree is initialized with the current generation's individuals as the genesis individuals. The tree is initialized only once, and will throw an error if called multiple times on the same population.
+Initializes a phylogenetic tree for populations with ids in `ids`. The tree is initialized with the current generation's individuals as the genesis individuals, along with a [`PhylogeneticIndex`](@ref). The tree is initialized only once, and will throw an error if called multiple times on the same population. If the state has a [LogPhylogeny](@ref) operator, a [`PhyloTracker`](@ref) is added to buffer the records it writes.
 
 See also [LogPhylogeny](@ref), [UpdatePhylogeny](@ref), [PurgePhylogeny](@ref)
 """
@@ -63,12 +76,16 @@ InitializePhylogeny(ids::Vector{String}=String[];kwargs...) = create_op("Initial
 function update_phylogeny!(state::AbstractState, pop::Population)
     tree = get_tree(pop)
     isnothing(tree) && error("No phylogenetic tree found for population $(pop.id)")
+    index = get_phylogenetic_index(pop)
+    tracker_idx = findfirst(p -> p isa PhyloTracker, pop.data)
     gen = generation(state)
     for ind in pop.individuals
         if ind.generation == gen
             @assert length(ind.parents) == 1 "Phylo Individuals must have exactly one parent"
             pid = ind.parents[1]
             add_child!(tree, pid, ind.id)
+            add_node!(index, pid, ind.id)
+            isnothing(tracker_idx) || record!(pop.data[tracker_idx], ind.id, pid, gen)
         end
     end
     nothing
@@ -78,7 +95,7 @@ end
 
     UpdatePhylogeny(ids::Vector{String}=String[];kwargs...)
 
-Updates the phylogenetic tree for populations with ids in `ids`. The tree is updated with the current generation's individuals as children of their parents. If an individual has no parent or more than one parent, an error is thrown.
+Updates the phylogenetic tree for populations with ids in `ids`. The tree and its [`PhylogeneticIndex`](@ref) are updated with the current generation's individuals as children of their parents. If an individual has no parent or more than one parent, an error is thrown.
 
 See also [LogPhylogeny](@ref), [InitializePhylogeny](@ref), [PurgePhylogeny](@ref)
 """
@@ -91,7 +108,12 @@ UpdatePhylogeny(ids::Vector{String}=String[];kwargs...) = create_op("UpdatePhylo
 function purge_phylogeny!(::AbstractState, pop::Population)
     pop_ids = Set(ind.id for ind in pop.individuals)
     # remove unreachable individuals
-    purge_unreachable_nodes!(get_tree(pop), pop_ids)
+    tree = get_tree(pop)
+    purge_unreachable_nodes!(tree, pop_ids)
+    # purged nodes have no living descendants, so no remaining node points to them
+    index = get_phylogenetic_index(pop)
+    filter!(kv -> haskey(tree.tree, kv.first), index.depth)
+    filter!(kv -> haskey(tree.tree, kv.first), index.parent)
     nothing
 end
 
@@ -186,33 +208,37 @@ UpdateGenePool(ids::Vector{String}=String[]; after_gen::Int, n_latest::Int, time
               updater=map(map((_,p)->update_genepool!(p; n_latest=n_latest, kwargs...))),
               time=time;)
 
-phylo_fname(pop::Population) = "$(pop.id)-phylo.csv"
+phylo_fname(pop::Population) = "$(pop.id)-phylo.bin"
+
+"""
+    PhyloTracker(io::IO, pending::Vector{Int})
 
-mutable struct PhyloTracker <: AbstractData
+Buffers the `(id, parent, generation)` records of individuals added to a population's phylogeny until [`LogPhylogeny`](@ref) appends them to `io`. Roots have parent `-1`. Only created by [`InitializePhylogeny`](@ref) when the state has a `LogPhylogeny` operator, so runs that don't log don't buffer.
+"""
+struct PhyloTracker <: AbstractData
     io::IO
-    last_serialized::Int
+    pending::Vector{Int}
 end
+
+record!(pt::PhyloTracker, id::Int, parent::Int, gen::Int) = push!(pt.pending, id, parent, gen)
+
 function log_phylogeny!(pop::Population)
     pt = try 
         getonly(p -> p isa PhyloTracker, pop.data)
     catch
-        @assert false "PhyloTracker not found in population $(pop.id). Make sure to call InitializePhylogeny first."
-    end
-    tree = get_tree(pop)
-    # find and serialize inds greater than last_serialized
-    for (id, node) in tree.tree
-        if id > pt.last_serialized
-            println(pt.io, "$id,[$(node.parent.id)]")
-        end
+        @assert false "PhyloTracker not found in population $(pop.id). Make sure to call InitializePhylogeny first, in a state with a LogPhylogeny operator."
     end
+    Base.write(pt.io, htol.(pt.pending))
     flush(pt.io)
-    pt.last_serialized = maximum(keys(tree.tree))
+    empty!(pt.pending)
 end
 
 """
     LogPhylogeny(ids::Vector{String}=String[]; kwargs...)
 
-Adds recent individuals to a phylogeny file called `\$(pop.id)-phylo.csv` in the current directory. The file is formatted as a CSV with columns `id` and `ancestor_list`, according to the [ALIFE Data Standard](https://alife-data-standards.github.io/alife-data-standards/phylogeny.html)
+Appends the individuals added to the phylogeny since the last call to a file called `\$(pop.id)-phylo.bin` in the current directory. The file is a flat sequence of little-endian `Int64` triples `(id, parent, generation)`, with parent `-1` for the genesis individuals. Records are buffered by [`UpdatePhylogeny`](@ref), so individuals purged by [`PurgePhylogeny`](@ref) before this operator runs are still written.
+
+`experiments/jevo_analysis/phylo.py` memory-maps the file for lineage queries and converts it to the [ALIFE Data Standard](https://alife-data-standards.github.io/alife-data-standards/phylogeny.html) CSV format.
 """
 @define_op "LogPhylogeny"
 LogPhylogeny(ids::Vector{String}=String[]; kwargs...) = 
@@ -69,6 +69,8 @@ end
         populations::Vector{<:AbstractPopulation}=AbstractPopulation[],
         matches::Vector{<:AbstractMatch}=AbstractMatch[],
         data::Vector=[],
+        checkpoint_interval::Int=-1,
+        checkpoint_kwargs::NamedTuple=(;),
     )
 
 States are created from a random number generator, a list of creators, and a list of operators, and usually a list of counters.
@@ -77,12 +79,12 @@ States are created from a random number generator, a list of creators, and a lis
 `operators` should contain an operator for each step of the evolutionary process.
 `counters` should contain a generation counter, individual id counter, gene counter, and match counter. All creators/operators should refer to the counter objects in state.
 
-Use [`generation(state)`](@ref) to get the current generation number, initialized to one. The [`GenerationIncrementer`](@ref) operator is automatically appended to the operator list to advance the state to the next generation. Individuals created without any parents are of generation 0.
+Use [`generation(state)`](@ref) to get the current generation number, initialized to one. The [`GenerationIncrementer`](@ref) operator is automatically appended to the operator list to advance the state to the next generation. Individuals created without any parents are of generation 0. If `checkpoint_interval > 0`, a [`Checkpoint`](@ref) operator with that interval and `checkpoint_kwargs` is appended after it.
 """
-function State(id::String, rng::AbstractRNG, creators::Vector{<:AbstractCreator}, operators::Vector{<:AbstractOperator}; counters::Vector{<:AbstractCounter}, populations::Vector{<:AbstractPopulation}=AbstractPopulation[], matches::Vector{<:AbstractMatch}=AbstractMatch[], data::Vector=[], checkpoint_interval::Int=-1)
+function State(id::String, rng::AbstractRNG, creators::Vector{<:AbstractCreator}, operators::Vector{<:AbstractOperator}; counters::Vector{<:AbstractCounter}, populations::Vector{<:AbstractPopulation}=AbstractPopulation[], matches::Vector{<:AbstractMatch}=AbstractMatch[], data::Vector=[], checkpoint_interval::Int=-1, checkpoint_kwargs::NamedTuple=(;))
     operators = AbstractOperator[operators..., GenerationIncrementer()]
     if checkpoint_interval > 0
-        push!(operators,  Checkpoint(interval=checkpoint_interval))
+        push!(operators,  Checkpoint(;interval=checkpoint_interval, checkpoint_kwargs...))
     end
     State(id, rng, creators, operators, populations, counters, matches, data)
 end
@@ -94,6 +96,8 @@ end
 
 
 function operate!(state::AbstractState) 
+    gen = generation(state)
+    seconds = zeros(Float64, length(state.operators))
     for i in 1:length(state.operators)
         try
             if i > 1 && state.operators[i] isa LoadCheckpoint
@@ -102,8 +106,11 @@ function operate!(state::AbstractState)
                 operate!(state, state.operators[i]) # load checkpoint
                 return -1
             end
+            start = time()
             operate!(state, state.operators[i])
+            seconds[i] = time() - start
         catch e
+            flush_h5_loggers()
             println("Error in operator ", i, " ", state.operators[i], " at generation ", generation(state))
             if get(ENV, "NO_SERIALIZE_ON_ERROR", "0") ∈ ["0", "false"]
                 println("Serializing state...")
@@ -117,6 +124,8 @@ function operate!(state::AbstractState)
         end
         i += 1
     end
+    h5_logging() && @h5 TimingMeasurement([string(nameof(typeof(op))) for op in state.operators], seconds, gen)
+    flush_h5_loggers()
 end
 
 
@@ -26,6 +26,21 @@ using Jevo: Interaction, OutcomeMatrix
         @test count(x->x==2, idxs) > n_samples * 0.22
         @test count(x->x==3, idxs) > n_samples * 0.22
     end
+    @testset "batched" begin
+        outcomes = zeros(pop_size, pop_size)
+        ϵ = fill(0.5, pop_size)
+        outcomes[1,1:2] .= 1.0
+        outcomes[2,2:3] .= 1.0
+        outcomes[3,2:3] .= 0.99
+        idxs = Jevo.lexicase_sample(StableRNG(2), outcomes, ϵ, n_samples)
+        @test length(idxs) == n_samples
+        @test count(x->x==1, idxs) > n_samples * 0.40
+        @test count(x->x==4, idxs) == 0
+        # reproducible, with or without threads
+        @test idxs == Jevo.lexicase_sample(StableRNG(2), outcomes, ϵ, n_samples)
+        @test idxs == Jevo.lexicase_sample(StableRNG(2), outcomes, ϵ, n_samples; threaded=true)
+        @test isempty(Jevo.lexicase_sample(StableRNG(2), outcomes, ϵ, 0))
+    end
 
 end
 
@@ -51,3 +51,54 @@ PrintInteractions(;kwargs...) = create_op("Reporter";
   run!(state, 10)
   run!(state, 10)
 end
+
+@testset "incremental checkpoint" begin
+for compress in (nothing, "gzip")
+  foreach(f -> rm(f, force=true), filter(f -> startswith(f, "check"), readdir()))
+  empty!(Jevo.checkpoint_chains)
+  ext = Jevo.compression_ext(compress)
+  n_inds = 4
+  counters = default_counters()
+  gene_counter = find(:type, AbstractGene, counters)
+  gc = Creator(Delta, Creator(JevoChain, (rng, gene_counter, [
+        (Jevo.Dense, (dims=(4, 1), σ=identity))
+    ])))
+  pop_creator = Creator(Population, ("p", n_inds, PassThrough(gc), PassThrough(Creator(Model)), counters))
+  operators() = [InitializeAllPopulations(),
+                 InitializePhylogeny(),
+                 InitializeDeltaCache(),
+                 SoloMatchMaker(),
+                 Performer(),
+                 ScalarFitnessEvaluator(),
+                 TruncationSelector(2),
+                 CloneUniformReproducer(n_inds),
+                 UpdatePhylogeny(),
+                 UpdateParentsAcrossAllWorkers(),
+                 ClearCurrentGenWeights(),
+                 NBackMutator(n_back=1000, mrs=(0.1f0, 0.01f0)),
+                 UpdateDeltaCache(),
+                 ClearInteractionsAndRecords()]
+  state = State("", rng, [pop_creator, Creator(MaxLogits, (;n=4))], operators(), counters=counters,
+                checkpoint_interval=2,
+                checkpoint_kwargs=(async=true, incremental=true, base_interval=3, compress=compress))
+  run!(state, 6)
+  Jevo.wait_for_checkpoints()
+  # a base at generation 2, then two increments
+  @test isfile("check-00002.jls" * ext)
+  @test isfile("check-00004-inc.jls" * ext)
+  @test readlink("check.jls") == "check-00006-inc.jls" * ext
+  # restore through the operator, as a restarted run does
+  restored = State("", rng, [pop_creator, Creator(MaxLogits, (;n=4))], [LoadCheckpoint()], counters=default_counters())
+  @test Jevo.operate!(restored) == -1
+  @test generation(restored) == generation(state)
+  @test [ind.id for ind in restored.populations[1].individuals] == [ind.id for ind in state.populations[1].individuals]
+  dc, restored_dc = Jevo.get_delta_cache(state.populations[1]), Jevo.get_delta_cache(restored.populations[1])
+  @test collect(keys(restored_dc)) == collect(keys(dc))
+  @test all(restored_dc[id].change == dc[id].change for id in keys(dc))
+  # the phylogenetic index is not stored, but rebuilt from the restored tree
+  @test !any(d -> d isa PhylogeneticIndex, restored.populations[1].data)
+  @test Jevo.get_phylogenetic_index(restored.populations[1]).depth ==
+        Jevo.get_phylogenetic_index(state.populations[1]).depth
+  foreach(f -> rm(f, force=true), filter(f -> startswith(f, "check"), readdir()))
+end
+end
@@ -1,3 +1,14 @@
+# Solo environment with a known horizon, each step scores the first number of the phenotype
+mutable struct FirstNumberEnv <: Jevo.AbstractEnvironment
+    n_steps::Int
+    step::Int
+end
+FirstNumberEnv(n_steps::Int) = FirstNumberEnv(n_steps, 0)
+Jevo.step!(env::FirstNumberEnv, ids::Vector{Int}, phenotypes::Vector) =
+    (env.step += 1; [Jevo.Interaction(ids[1], Int[], Float64(phenotypes[1].numbers[1]))])
+Jevo.done(env::FirstNumberEnv) = env.step >= env.n_steps
+Jevo.remaining_steps(env::FirstNumberEnv) = env.n_steps - env.step
+
 @testset "numbers game unit and integration" begin
   # creators
   n_dims = 2
@@ -191,6 +202,59 @@
       expected_n_interactions = n_species * n_inds
       @test all(length(ind.interactions) == expected_n_interactions 
                 for ind in Jevo.get_individuals(state.populations))
+      # chunked scheduling plays the same matches
+      state = State("", rng,[comp_comp_pop_creator, env_creator],
+                    [pop_initializer, ava, Performer(chunk_size=3)], counters=default_counters())
+      run!(state, 1)
+      @test all(length(ind.interactions) == expected_n_interactions 
+                for ind in Jevo.get_individuals(state.populations))
+      @test all(wid -> wid ∈ workers(), values(Jevo.match_affinity))
+      # unchanged individuals replay their interactions from the memo
+      memo_performer = Performer(memoize=true)
+      state = State("", rng,[comp_comp_pop_creator, env_creator],
+                    [pop_initializer, ind_resetter, ava, memo_performer], counters=default_counters())
+      run!(state, 1)
+      n_memoized = length(memo_performer.updater.memo)
+      @test n_memoized > 0
+      run!(state, 2)
+      @test length(memo_performer.updater.memo) == n_memoized
+      @test all(length(ind.interactions) == expected_n_interactions 
+                for ind in Jevo.get_individuals(state.populations))
+      # individuals are developed once until the phenotype cache is cleared
+      ind = first(Jevo.get_individuals(state.populations))
+      Jevo.clear_phenotype_caches!()
+      Jevo.phenotype_cache_stats(reset=true)
+      Jevo.develop_cached(ind)
+      Jevo.develop_cached(ind)
+      stats = Jevo.phenotype_cache_stats()
+      @test stats.n_developed == 1
+      @test stats.n_hits == 1
+      Jevo.operate!(state, ind_resetter)
+      @test isempty(Jevo.get_phenotype_cache())
+  end
+  @testset "SuccessiveHalvingSelector" begin
+      racing_env_creator = Creator(FirstNumberEnv, (10,))
+      numbers = [1.0, 0.9, 0.8, 0.7, 0.1, 0.0]
+      state = State("", rng, [racing_env_creator], Jevo.AbstractOperator[], counters=default_counters())
+      racers() = Population("racers", [Individual(i, 0, Int[], VectorGenotype([x, 0f0]), ng_developer)
+                                       for (i, x) in enumerate(numbers)])
+      @test Jevo.halving_rungs(6, 1, 2, 1) == [(1, 3), (2, 1)]
+      steps = Int[]
+      for early_abort in (false, true)
+          pop = racers()
+          push!(steps, Jevo.successive_halving!(state, [pop], 2; eta=2, min_episodes=1, rungs=[(1, 4), (2, 2)],
+                                                early_abort, max_step_reward=1.0, env_creator=nothing))
+          @test [ind.id for ind in pop.individuals] == [1, 2]
+          @test [ind.records[1].fitness for ind in pop.individuals] ≈ [10.0, 9.0]
+          @test all(length(ind.interactions) == 30 for ind in pop.individuals)
+      end
+      # 6 episodes, then 4 more of 4 individuals
+      @test steps[1] == 10 * (6 + 2 * 4)
+      # individuals 5 and 6 (then 3 and 4) can't reach the cutoff of 1 and 2
+      @test steps[2] < steps[1]
+      # without a bound on the step reward, no episode could ever be aborted
+      @test_throws AssertionError Jevo.successive_halving!(state, [racers()], 2; eta=2, min_episodes=1, rungs=nothing,
+                                                           early_abort=true, max_step_reward=Inf, env_creator=nothing)
   end
   @testset "ScalarFitnessEvaluator" begin
       state = State("", rng,[comp_comp_pop_creator, env_creator],
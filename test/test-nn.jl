@@ -116,6 +116,64 @@ nul_pop = Population("", Individual[])
                 @test all(cache_construction.weight .< -900)
             end
         end
+        @testset "snapshot interval" begin
+            Jevo.snapshot_interval = 4
+            snapshot_cache = WeightCache(maxsize=1_000_000)
+            w = Weights((10, 10), [NetworkGene(i, i, 0.1f0, Jevo.apply_kaiming_normal_noise!) for i in 1:10])
+            reset_tensor_cache_stats!()
+            @test Jevo.tensor(w, weight_cache=snapshot_cache) == Jevo.tensor(w)
+            # snapshots of the 4th and 8th gene go to a separate store, the parent tensor to the cache
+            snapshots = Jevo.get_snapshot_cache(snapshot_cache)
+            @test snapshots !== snapshot_cache
+            @test sort(collect(keys(snapshots))) == [4, 8]
+            @test collect(keys(snapshot_cache)) == [9]
+            push!(w.muts, NetworkGene(11, 11, 0.1f0, Jevo.apply_kaiming_normal_noise!))
+            @test Jevo.tensor(w, weight_cache=snapshot_cache) == Jevo.tensor(w)
+            stats = tensor_cache_stats()
+            @test stats.n_cold == 1 && stats.n_hits == 1
+            @test stats.hit_rate == 0.5
+            @test stats.max_replay == 11  # uncached develops replay everything
+            @test stats.n_snapshots == 2
+            # once the cache is evicted, development restarts from the latest snapshot
+            empty!(snapshot_cache)
+            reset_tensor_cache_stats!()
+            @test Jevo.tensor(w, weight_cache=snapshot_cache) == Jevo.tensor(w)
+            @test tensor_cache_stats().n_hits == 1
+            @test tensor_cache_stats().n_replayed == 3 + 11
+            Jevo.snapshot_interval = nothing
+        end
+        @testset "shared weight cache" begin
+            shared_cache = SharedWeightCache(mktempdir(), maxsize=4 * 784 * 10 * 4)
+            w = Weights((784, 10), [NetworkGene(i, i, 0.1f0, Jevo.apply_kaiming_normal_noise!) for i in 1:3])
+            nocache = Jevo.tensor(w)
+            @test Jevo.tensor(w, weight_cache=shared_cache) == nocache
+            @test length(shared_cache) == 2
+            @test haskey(shared_cache, 2) && !haskey(shared_cache, 3)
+            # a second handle on the same directory sees the entries
+            other = SharedWeightCache(shared_cache.dir, maxsize=shared_cache.maxsize)
+            @test Jevo.tensor(w, weight_cache=other) == nocache
+            @test get(other, 1, nothing) == get(shared_cache, 1, nothing)
+            # exceeding maxsize evicts the least recently used entries
+            for i in 4:6
+                shared_cache[i] = zeros(Float32, 784, 10)
+            end
+            @test length(shared_cache) <= 3
+            @test shared_cache.currentsize <= shared_cache.maxsize
+            empty!(shared_cache)
+            @test length(shared_cache) == 0
+            # lookups of evicted or truncated entries are misses and create no files
+            @test isnothing(get(shared_cache, 4, nothing))
+            @test !haskey(shared_cache, 4)
+            shared_cache[7] = ones(Float32, 784, 10)
+            truncate(Jevo.entry_path(shared_cache, 7), 100)
+            @test isnothing(get(shared_cache, 7, nothing))
+            # every run gets its own directory, reused by later calls and workers
+            withenv("JEVO_SHARED_WEIGHT_CACHE" => mktempdir(), "JEVO_SHARED_WEIGHT_CACHE_RUN" => nothing) do
+                dir = Jevo.shared_weight_cache_dir()
+                @test isdir(dir) && startswith(basename(dir), "run-")
+                @test Jevo.shared_weight_cache_dir() == dir
+            end
+        end
     end
     # Test phenotype creation & forward pass
     @testset "develop & forward pass full rank" begin
@@ -193,7 +251,30 @@ nul_pop = Population("", Individual[])
         @test r_std ≈ f_std atol=0.01
         @test lora_m ≈ f_m atol=0.01
         @test lora_std ≈ f_std atol=0.01
-    
+
+    end
+    @testset "factorized low rank layers" begin
+        state = State()
+        gene_counter = Jevo.get_counter(AbstractGene, state)
+        creator = Creator(Flux.Chain)
+        net = JevoChain(rng, gene_counter, [
+            (Jevo.Conv, (kernel=(4,4), channels=3=>8, stride=(2,2), σ=relu, rank=2)),
+            Flux.flatten,
+            (Jevo.Dense, (dims=(8*7*7,32), σ=relu, rank=2)),
+        ])
+        x = rand(Float32, 16, 16, 3, 5)
+        Jevo.factorized_layers = :never
+        materialized = develop(creator, net)
+        Jevo.factorized_layers = :always
+        factorized = develop(creator, net)
+        @test factorized.layers[3] isa Jevo.LowRankDense
+        @test factorized(x) ≈ materialized(x)
+        # rank 100 of a 784x100 matrix is cheaper to materialize
+        Jevo.factorized_layers = :auto
+        full_rank = JevoChain(rng, gene_counter, [(Jevo.Dense, (dims=(784,100), σ=relu, rank=100))])
+        @test !(develop(creator, full_rank).layers[1] isa Jevo.LowRankDense)
+        @test develop(creator, net).layers[3] isa Jevo.LowRankDense
+        Jevo.factorized_layers = nothing
     end
     @testset "RNN" begin
         state = State()
@@ -50,6 +50,21 @@
         selected = Jevo.nsga2(outcomes, 3)
         @test 1 in selected && 5 in selected
     end
+
+    @testset "bitset dominance" begin
+        rng = StableRNG(3)
+        # binary per-test outcomes, with duplicate rows
+        outcomes = Float64.(rand(rng, Bool, 100, 70))
+        outcomes[10, :] = outcomes[20, :]
+        bits = Jevo.weak_dominance_bits(outcomes)
+        @test all(Jevo.weakly_dominates(bits, i, j) == all(outcomes[i, :] .>= outcomes[j, :])
+                  for i in 1:100, j in 1:100)
+        selected = Jevo.nsga2(outcomes, 100)
+        @test sort(selected) == 1:100
+        # nobody is ranked after an individual it dominates
+        @test !any(Jevo.dominates(outcomes[selected[l], :], outcomes[selected[k], :])
+                   for k in 1:100 for l in k+1:100)
+    end
 end
 
 
@@ -50,10 +50,36 @@ k, n_inds, n_gens = 2, 10, 10
             for node in values(tree.tree)
                 @test !isnothing(node.id) || node.id ∈ genesis_ids
             end
+            index = Jevo.get_phylogenetic_index(subpop)
+            @test Set(keys(index.depth)) == Set(keys(tree.tree))
+            @test index.depth == Jevo.PhylogeneticIndex(tree).depth
         end
     end
 end
 
+@testset "LogPhylogeny" begin
+    # without a LogPhylogeny operator nothing is tracked
+    pop = Population("logphylo", [Individual(i, 1, Int[], ng_gc(), ng_developer) for i in 1:3])
+    Jevo.initialize_phylogeny!(State(), pop)
+    @test !any(p -> p isa Jevo.PhyloTracker, pop.data)
+    s = State([LogPhylogeny()])
+    inds = [Individual(i, 1, Int[], ng_gc(), ng_developer) for i in 1:3]
+    pop = Population("logphylo", inds)
+    Jevo.initialize_phylogeny!(s, pop)
+    Jevo.log_phylogeny!(pop)
+    pop.individuals = [Individual(i, 1, [i-3], ng_gc(), ng_developer) for i in 4:6]
+    Jevo.update_phylogeny!(s, pop)
+    Jevo.log_phylogeny!(pop)
+    Jevo.log_phylogeny!(pop)  # nothing new to write
+    tracker = getonly(p -> p isa Jevo.PhyloTracker, pop.data)
+    @test isempty(tracker.pending)
+    close(tracker.io)
+    records = ltoh.(reinterpret(Int, Base.read(Jevo.phylo_fname(pop))))
+    @test records == [1, -1, 1, 2, -1, 1, 3, -1, 1,
+                      4, 1, 1, 5, 2, 1, 6, 3, 1]
+    rm(Jevo.phylo_fname(pop))
+end
+
 @testset "Estimate" begin
 
     @testset "WeightedAverage" begin
@@ -127,6 +153,33 @@ end
             @test [n.dist for n in nearest] == expected_dists_from_6_14[1:k]
         end
     
+        end
+        @testset "PhylogeneticIndex" begin
+        tree = PhylogeneticTree([1, 20])
+        for (pid, id) in [(1, 2), (2, 3), (2, 4), (3, 5), (4, 6), (6, 7), (7, 8), (8, 9)]
+            add_child!(tree, pid, id)
+        end
+        index = Jevo.PhylogeneticIndex(tree)
+        @test index.depth[9] == 6
+        @test index.parent[9] == 8 && index.parent[1] == -1
+        @test Jevo.tree_distance(index, 5, 9) == 7
+        @test Jevo.tree_distance(index, 9, 1) == 6
+        @test Jevo.tree_distance(index, 6, 6) == 0
+        @test Jevo.tree_distance(index, 9, 20) == typemax(Int)
+        # incremental updates match a rebuilt index
+        add_child!(tree, 9, 10)
+        Jevo.add_node!(index, 9, 10)
+        @test index.parent == Jevo.PhylogeneticIndex(tree).parent
+        @test Jevo.tree_distance(index, 10, 5) == 8
+        # neighbourhoods from the ancestor buckets match the pairwise distances
+        evaluated = [1, 3, 5, 6, 8, 10, 20]
+        buckets = Jevo.evaluated_by_ancestor(index, evaluated, 4)
+        for id in keys(index.depth)
+            near = Jevo.nearby_evaluated(index, id, buckets, 4)
+            @test Dict(near) == Dict(e => Jevo.tree_distance(index, id, e) for e in evaluated
+                                     if Jevo.tree_distance(index, id, e) <= 4)
+            @test issorted(last.(near))
+        end
         end
         @testset "Disconnected" begin
         # Test that we don't find any interactions that are not reachable
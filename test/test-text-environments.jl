@@ -75,3 +75,17 @@ end
 
     end
 end
+
+@testset "tokenized tinystories" begin
+    vocab = [unksym, startsym, endsym, "a", "b", "c"]
+    textenc = TransformerTextEncoder(split, vocab; startsym, endsym, unksym, padsym=unksym)
+    text, corpus = tempname(), tempname()
+    write(text, "a b c\nc\nb a a b c\n")
+    Jevo.tokenize_tinystories(textenc; text, corpus, chunk_size=2)
+    env = TinyStoriesDataSet(n_tokens=3, n_sequences=3, max_seq_len=-1, batch_size=2, corpus=corpus)
+    tokenized = Jevo.encode_tinystories(env, textenc)
+    encoded = encode(textenc, batched([(l,) for l in readlines(text)])[1])
+    @test tokenized.attention_mask.len == encoded.attention_mask.len
+    @test Flux.onecold(tokenized.token) == Flux.onecold(encoded.token)
+    rm(text); rm(corpus)
+end
@@ -153,6 +153,33 @@ view_radius = 30
         end
     end
 
+    @testset "observations and movement" begin
+        n = 40
+        env = TradeGridWorld(n, 2, 10, 8, 10, POOL_RADIUS, "")
+        env.players[1].position = (10.3, 12.6)
+        env.players[2].position = (17.5, 13.0)
+        env.grid_apples[11, 14] = 3.0
+        env.grid_bananas[14, 13] = 1.0
+        phenotypes = [DummyPhenotype(zeros(4)) for _ in 1:2]
+        observations = Jevo.make_observations(env, [1, 2], phenotypes)
+        for (i, player) in enumerate(env.players)
+            world = render(env, i)
+            px, py = round.(Int, player.position)
+            expected = fill(0.2f0, 17, 17, 3)
+            for x in 1:17, y in 1:17
+                wx, wy = x + px - 9, y + py - 9
+                1 <= wx <= n && 1 <= wy <= n && (expected[x, y, :] = world[wx, wy, :])
+            end
+            @test observations[i][:, :, :, 1] == expected
+        end
+        # moving towards the other player stops on the 0.1 grid before touching it
+        players, pos = env.players, env.players[1].position
+        t = Jevo.free_distance(players, 1, pos, 1.0, 0.0, 2.5)
+        @test !Jevo.too_close_to_others((pos[1] + t, pos[2]), 1, players)
+        @test Jevo.too_close_to_others((pos[1] + t + 0.1, pos[2]), 1, players)
+        @test Jevo.free_distance(players, 1, pos, -1.0, 0.0, 2.5) == 2.5
+    end
+
     @testset "pool reward" begin
         n = 20
         p = 2
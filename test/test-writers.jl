@@ -16,6 +16,38 @@
   end
   rm("statistics.h5", force=true)
 end
+@testset "TimingMeasurement" begin
+  rm("statistics.h5", force=true)
+  with_logger(Jevo.HDF5Logger("statistics.h5")) do
+      Jevo.operate!(State([create_op("Reporter"), create_op("Reporter")]))
+  end
+  h5open("statistics.h5", "r") do io
+      @test haskey(io, "iter/1/OperatorTime/001-Reporter")
+      @test haskey(io, "iter/1/OperatorTime/002-Reporter")
+      @test haskey(io, "iter/1/OperatorTime/003-GenerationIncrementer")
+  end
+  rm("statistics.h5", force=true)
+  # only emitted when something writes statistics.h5
+  @test !Jevo.h5_logging()
+  @test with_logger(Jevo.h5_logging, Jevo.JevoLogger())
+  rm("statistics.h5", force=true)
+end
+@testset "Buffered HDF5Logger" begin
+  rm("statistics.h5", force=true)
+  logger = Jevo.HDF5Logger("statistics.h5", buffered=true)
+  with_logger(logger) do
+      @h5 Measurement(GenotypeSum, 1, 1)
+      @h5 StatisticalMeasurement(GenotypeSum, [1,2,3], 2)
+  end
+  @test length(logger.buffer) == 2
+  flush_h5_loggers()
+  @test isempty(logger.buffer)
+  h5open("statistics.h5", "r") do io
+      @test haskey(io, "iter/1/GenotypeSum")
+      @test haskey(io, "iter/2/GenotypeSum/max")
+  end
+  rm("statistics.h5", force=true)
+end
 @testset "JevoLogger" begin
   rm("statistics.h5", force=true)
   with_logger(Jevo.JevoLogger()) do